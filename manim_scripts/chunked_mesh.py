@@ -0,0 +1,358 @@
+# chunked_mesh.py
+"""
+大网格的分块流式绘制（内存受限）
+–––––––––––––––––––––––
+每个三角形 / 边都是一个 Polygon / Line3D 时，每个 mobject 都带着自己的 points、颜色数组和家族列表，
+Transform 还要再复制一份，细分到 10⁶ 个三角形时内存随面数线性膨胀。
+
+ChunkedMesh 把整张网格放在一块后备数组里：
+    positions (N, 3) float64、faces (F, 3) int32、edges (E, 2) int32
+    面 / 边 / 顶点颜色各一块 (·, 4) uint8
+自身只有 8 个包围盒角点作为 points（供 3D 相机排序和定位），拷贝时共享后备数组；
+shift / scale / rotate / apply_function 等变换直接作用在 positions 上。
+
+ChunkedMeshCamera 在绘制一帧时：
+    1. 分块算出全部面的深度（每面一个 float32），整体从远到近排序
+    2. 按排序结果每次取 tile_faces 个面，投影后按颜色分桶，每桶拼成一条 cairo 路径一次填充，然后丢弃该块
+渲染期间的临时数据只与块大小有关，块大小由 memory_budget_mb 推出；
+memory_stats 记录后备数组大小、块大小与进程峰值 RSS。
+
+命令行（不依赖场景，直接用 pycairo 画一帧并报告峰值内存）：
+    python manim_scripts/chunked_mesh.py --u-segments 1000 --v-segments 500 --budget-mb 64
+"""
+import argparse
+import copy
+import resource
+import sys
+import time
+
+import numpy as np
+from manim import ORIGIN, Mobject, ThreeDCamera, color_to_rgb
+from manim.utils.paths import straight_path
+
+# 每个面在一块中的临时开销（坐标收集、投影、tolist 后的 Python 浮点数）的保守估计
+BYTES_PER_TILE_FACE = 1024
+MIN_TILE_FACES = 256
+
+
+def peak_rss_bytes():
+    """进程的峰值常驻内存（Linux 下 ru_maxrss 以 KiB 计，macOS 以字节计）"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def tile_faces_for_budget(budget_mb):
+    return max(MIN_TILE_FACES, int(budget_mb * 1024 ** 2) // BYTES_PER_TILE_FACE)
+
+
+def palette_rgba(palette, index, opacity=1.0):
+    """调色板 + 每个元素的下标 → (M, 4) uint8，不为每个元素创建颜色对象"""
+    table = np.array([[*color_to_rgb(c), opacity] for c in palette])
+    return np.round(table[np.asarray(index)] * 255).astype(np.uint8)
+
+
+def uniform_rgba(color, count, opacity=1.0):
+    return palette_rgba([color], np.zeros(count, dtype=np.int64), opacity)
+
+
+class ChunkedMesh(Mobject):
+    """
+    整张网格作为一个 mobject；颜色为 uint8 RGBA 数组，缺省的部分不绘制
+    face_width / edge_width 为描边宽度（与 VMobject 的 stroke_width 同单位），point_radius 为顶点圆点半径
+    """
+
+    def __init__(self, mesh, face_rgba=None, face_stroke_rgba=None, face_width=1.0,
+                 edge_rgba=None, edge_width=2.0, point_rgba=None, point_radius=0.05, **kwargs):
+        self.positions = np.array(mesh.positions, dtype=np.float64)
+        self.faces = mesh.faces
+        self.edges = mesh.edges
+        self.face_rgba = face_rgba
+        self.face_stroke_rgba = face_rgba if face_stroke_rgba is None and face_rgba is not None else face_stroke_rgba
+        self.face_width = face_width
+        self.edge_rgba = edge_rgba
+        self.edge_width = edge_width
+        self.point_rgba = point_rgba
+        self.point_radius = point_radius
+        self.opacity = 1.0
+        for name, rgba, count in (("face_rgba", face_rgba, len(self.faces)),
+                                  ("edge_rgba", edge_rgba, len(self.edges)),
+                                  ("point_rgba", point_rgba, len(self.positions))):
+            if rgba is not None and rgba.shape != (count, 4):
+                raise ValueError(f"{name} 形状应为 ({count}, 4)，实际为 {rgba.shape}")
+        super().__init__(**kwargs)
+
+    def generate_points(self):
+        self.update_bounds()
+
+    def update_bounds(self):
+        lo, hi = self.positions.min(axis=0), self.positions.max(axis=0)
+        corners = np.array([[x, y, z] for x in (lo[0], hi[0]) for y in (lo[1], hi[1]) for z in (lo[2], hi[2])])
+        self.points = corners
+        return self
+
+    def set_positions(self, positions):
+        np.copyto(self.positions, positions)
+        return self.update_bounds()
+
+    @property
+    def nbytes(self):
+        arrays = (self.positions, self.faces, self.edges, self.face_rgba, self.face_stroke_rgba,
+                  self.edge_rgba, self.point_rgba)
+        seen, total = set(), 0
+        for a in arrays:
+            if a is not None and id(a) not in seen:
+                seen.add(id(a))
+                total += a.nbytes
+        return total
+
+    # ----------------------------------------------------------
+    # 与 manim 动画的配合：拷贝共享后备数组，淡入淡出只改整体透明度
+    # ----------------------------------------------------------
+    def __deepcopy__(self, memo):
+        clone = copy.copy(self)
+        clone.points = self.points.copy()
+        clone.submobjects = []
+        clone.updaters = []
+        return clone
+
+    def set_opacity(self, opacity, family=True):
+        self.opacity = opacity
+        return self
+
+    def fade(self, darkness=0.5, family=True):
+        self.opacity *= 1 - darkness
+        return self
+
+    def interpolate_color(self, mobject1, mobject2, alpha):
+        self.opacity = mobject1.opacity + alpha * (mobject2.opacity - mobject1.opacity)
+
+    # ----------------------------------------------------------
+    # 几何变换作用在后备数组上（points 只是包围盒，单独变换不会移动网格）；
+    # 拷贝之间共享 positions，这里总是换成新数组而不是原地修改
+    # ----------------------------------------------------------
+    def shift(self, *vectors):
+        self.positions = self.positions + np.sum(vectors, axis=0)
+        return self.update_bounds()
+
+    def apply_points_function_about_point(self, func, about_point=None, about_edge=None):
+        if about_point is None:
+            about_point = self.get_critical_point(ORIGIN if about_edge is None else about_edge)
+        self.positions = np.asarray(func(self.positions - about_point), dtype=np.float64) + about_point
+        return self.update_bounds()
+
+    def interpolate(self, mobject1, mobject2, alpha, path_func=straight_path()):
+        if mobject1.positions is mobject2.positions:
+            self.positions = mobject1.positions
+        elif mobject1.positions.shape == mobject2.positions.shape == self.positions.shape:
+            self.positions = path_func(mobject1.positions, mobject2.positions, alpha)
+            self.update_bounds()
+        else:
+            self.points = path_func(mobject1.points, mobject2.points, alpha)
+        self.interpolate_color(mobject1, mobject2, alpha)
+        return self
+
+
+class ChunkedBinding:
+    """
+    morph 的绑定接口：关键帧坐标直接写入 ChunkedMesh 的后备数组，
+    set_rgb 写入 element（faces / edges / points）对应的颜色数组
+    """
+
+    def __init__(self, mesh, element="faces"):
+        if element not in ("faces", "edges", "points"):
+            raise ValueError(f"element 应为 faces / edges / points，当前为 {element!r}")
+        self.mobjects = [mesh]
+        self.mesh = mesh
+        self.element = element
+
+    def bind(self, positions):
+        self.mesh.set_positions(positions)
+
+    def update(self, positions):
+        self.mesh.set_positions(positions)
+
+    def set_rgb(self, rgb):
+        rgba = {"faces": self.mesh.face_rgba, "edges": self.mesh.edge_rgba, "points": self.mesh.point_rgba}[self.element]
+        rgba[:, :3] = np.round(np.clip(rgb, 0, 1) * 255)
+        if self.element == "faces" and self.mesh.face_stroke_rgba is not rgba:
+            self.mesh.face_stroke_rgba[:, :3] = rgba[:, :3]
+
+
+class TileRenderer:
+    """
+    把 ChunkedMesh 按块画到 cairo context 上
+    project(points) → 画面坐标 (M, 3)，depth(points) → 深度 (M,)，越小越远
+    """
+
+    def __init__(self, tile_faces):
+        self.tile_faces = tile_faces
+        self.peak_tile_bytes = 0
+
+    def _order(self, keys, points_of, depth):
+        """分块计算每个元素的中心深度，返回从远到近的下标"""
+        z = np.empty(len(keys), dtype=np.float32)
+        for start in range(0, len(keys), self.tile_faces):
+            stop = min(start + self.tile_faces, len(keys))
+            z[start:stop] = depth(points_of(keys[start:stop]).mean(axis=1))
+        return np.argsort(z, kind="stable")
+
+    def draw(self, ctx, mesh, project, depth, line_scale):
+        x = mesh.positions
+        if mesh.face_rgba is not None and len(mesh.faces):
+            order = self._order(mesh.faces, lambda f: x[f], depth)
+            for start in range(0, len(order), self.tile_faces):
+                idx = order[start:start + self.tile_faces]
+                self._draw_faces(ctx, project(x[mesh.faces[idx]].reshape(-1, 3)).reshape(-1, 3, 3),
+                                 mesh.face_rgba[idx], mesh.face_stroke_rgba[idx], mesh.face_width * line_scale,
+                                 mesh.opacity)
+        if mesh.edge_rgba is not None and len(mesh.edges):
+            for start in range(0, len(mesh.edges), self.tile_faces):
+                idx = slice(start, start + self.tile_faces)
+                pts = project(x[mesh.edges[idx]].reshape(-1, 3)).reshape(-1, 2, 3)
+                self._draw_edges(ctx, pts, mesh.edge_rgba[idx], mesh.edge_width * line_scale, mesh.opacity)
+        if mesh.point_rgba is not None and len(x):
+            for start in range(0, len(x), self.tile_faces):
+                idx = slice(start, start + self.tile_faces)
+                self._draw_points(ctx, project(x[idx]), mesh.point_rgba[idx], mesh.point_radius, mesh.opacity)
+
+    def _track(self, *arrays):
+        self.peak_tile_bytes = max(self.peak_tile_bytes, sum(a.nbytes for a in arrays))
+
+    def _draw_faces(self, ctx, tri, fill, stroke, width, opacity):
+        """
+        一块内按 (填充, 描边) 颜色分桶，每桶的三角形拼成一条多子路径，只 fill / stroke 一次；
+        子路径统一成逆时针，非零环绕规则下同桶内重叠的三角形取并集而不会相互抵消
+        """
+        self._track(tri, fill, stroke)
+        xy = np.array(tri[:, :, :2])
+        d1, d2 = xy[:, 1] - xy[:, 0], xy[:, 2] - xy[:, 0]
+        flipped = d1[:, 0] * d2[:, 1] - d1[:, 1] * d2[:, 0] < 0
+        xy[flipped] = xy[flipped][:, ::-1]
+        ctx.set_line_width(width)
+        for idx in _color_buckets(fill, stroke):
+            ctx.new_path()
+            for ax, ay, bx, by, cx, cy in xy[idx].reshape(-1, 6).tolist():
+                ctx.move_to(ax, ay)
+                ctx.line_to(bx, by)
+                ctx.line_to(cx, cy)
+                ctx.close_path()
+            ctx.set_source_rgba(*_cairo_rgba(fill[idx[0]], opacity))
+            if width > 0:
+                ctx.fill_preserve()
+                ctx.set_source_rgba(*_cairo_rgba(stroke[idx[0]], opacity))
+                ctx.stroke()
+            else:
+                ctx.fill()
+
+    def _draw_edges(self, ctx, seg, rgba, width, opacity):
+        self._track(seg, rgba)
+        ctx.set_line_width(width)
+        for idx in _color_buckets(rgba):
+            ctx.new_path()
+            for ax, ay, bx, by in seg[idx, :, :2].reshape(-1, 4).tolist():
+                ctx.move_to(ax, ay)
+                ctx.line_to(bx, by)
+            ctx.set_source_rgba(*_cairo_rgba(rgba[idx[0]], opacity))
+            ctx.stroke()
+
+    def _draw_points(self, ctx, pts, rgba, radius, opacity):
+        self._track(pts, rgba)
+        for idx in _color_buckets(rgba):
+            ctx.new_path()
+            for px, py in pts[idx, :2].tolist():
+                ctx.new_sub_path()
+                ctx.arc(px, py, radius, 0, 2 * np.pi)
+            ctx.set_source_rgba(*_cairo_rgba(rgba[idx[0]], opacity))
+            ctx.fill()
+
+
+def _color_buckets(*rgba):
+    """按颜色（uint8 RGBA，可多列拼接）分桶，返回每桶的下标；桶按首次出现的先后排列，桶内保持原顺序"""
+    key = np.ascontiguousarray(np.concatenate(rgba, axis=1))
+    key = key.view(np.dtype((np.void, key.shape[1]))).ravel()
+    _, first, inverse = np.unique(key, return_index=True, return_inverse=True)
+    order = np.argsort(inverse.ravel(), kind="stable")
+    buckets = np.split(order, np.cumsum(np.bincount(inverse.ravel()))[:-1])
+    return [buckets[b] for b in np.argsort(first)]
+
+
+def _cairo_rgba(rgba, opacity):
+    r, g, b, a = (rgba / 255.0).tolist()
+    return r, g, b, a * opacity
+
+
+class ChunkedMeshCamera(ThreeDCamera):
+    """ThreeDCamera 的基础上，ChunkedMesh 按块流式绘制；其他 mobject 照常"""
+
+    memory_budget_mb = 256
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.memory_stats = {"backing_bytes": 0, "tile_faces": 0, "peak_tile_bytes": 0, "peak_rss_bytes": 0}
+
+    def type_or_raise(self, mobject):
+        group_type = super().type_or_raise(mobject)
+        self.display_funcs[ChunkedMesh] = self.display_chunked_meshes
+        return ChunkedMesh if isinstance(mobject, ChunkedMesh) else group_type
+
+    def display_chunked_meshes(self, meshes, pixel_array):
+        renderer = TileRenderer(tile_faces_for_budget(self.memory_budget_mb))
+        ctx = self.get_cairo_context(pixel_array)
+        rot = self.get_rotation_matrix()
+        for mesh in meshes:
+            renderer.draw(
+                ctx, mesh,
+                project=lambda points, m=mesh: self.transform_points_pre_display(m, points),
+                depth=lambda points: points @ rot[2],
+                line_scale=self.cairo_line_width_multiple,
+            )
+            self.memory_stats["backing_bytes"] = max(self.memory_stats["backing_bytes"], mesh.nbytes)
+        stats = self.memory_stats
+        stats["tile_faces"] = renderer.tile_faces
+        stats["peak_tile_bytes"] = max(stats["peak_tile_bytes"], renderer.peak_tile_bytes)
+        stats["peak_rss_bytes"] = peak_rss_bytes()
+
+    def memory_report(self):
+        s = self.memory_stats
+        return (f"分块绘制：后备数组 {s['backing_bytes'] / 1024 ** 2:.1f} MiB，每块 {s['tile_faces']} 个面"
+                f"（峰值 {s['peak_tile_bytes'] / 1024 ** 2:.1f} MiB），进程峰值 RSS {s['peak_rss_bytes'] / 1024 ** 2:.0f} MiB")
+
+
+def _benchmark(u_segments, v_segments, budget_mb, width, height):
+    import cairo
+
+    from triangle_mesh_3d import SPHERE_PALETTE, sphere_color_index, sphere_mesh
+
+    start = time.perf_counter()
+    sphere = sphere_mesh(u_segments, v_segments, 1.2, with_colors=False)
+    mesh = ChunkedMesh(sphere, palette_rgba(SPHERE_PALETTE, sphere_color_index(u_segments, v_segments), 0.4),
+                       face_width=0.0)
+    built = time.perf_counter() - start
+
+    surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width, height)
+    ctx = cairo.Context(surface)
+    scale = height / 4.0
+    ctx.translate(width / 2, height / 2)
+    ctx.scale(scale, -scale)
+    renderer = TileRenderer(tile_faces_for_budget(budget_mb))
+    start = time.perf_counter()
+    renderer.draw(ctx, mesh, project=lambda p: p, depth=lambda p: p[:, 2], line_scale=1.0 / scale)
+    drawn = time.perf_counter() - start
+    print(f"{sphere.num_faces} 个三角形，后备数组 {mesh.nbytes / 1024 ** 2:.1f} MiB，构建 {built:.2f}s")
+    print(f"每块 {renderer.tile_faces} 个面（峰值 {renderer.peak_tile_bytes / 1024 ** 2:.1f} MiB），"
+          f"绘制 {drawn:.2f}s，进程峰值 RSS {peak_rss_bytes() / 1024 ** 2:.0f} MiB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="分块绘制大网格的内存基准")
+    parser.add_argument("--u-segments", type=int, default=1000)
+    parser.add_argument("--v-segments", type=int, default=500)
+    parser.add_argument("--budget-mb", type=float, default=64)
+    parser.add_argument("--width", type=int, default=854)
+    parser.add_argument("--height", type=int, default=480)
+    args = parser.parse_args(argv)
+    _benchmark(args.u_segments, args.v_segments, args.budget_mb, args.width, args.height)
+
+
+if __name__ == "__main__":
+    main()
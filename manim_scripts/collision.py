@@ -0,0 +1,269 @@
+# collision.py
+"""
+软体晶格的碰撞检测
+–––––––––––––––––––––––
+- 地面：z < height 的顶点投影回地面
+- 刚体盒：inside=True 时把顶点限制在盒内（挤压墙），否则沿最浅方向推出盒外
+- 自碰撞：不同物体之间的 顶点–表面三角形；给出上一步坐标时按扫掠判断，
+  本步从表面外侧穿进去的顶点无论多深都会被推回
+
+宽相用均匀网格空间哈希：三角形按包围盒登记到覆盖的格子，
+(格子键, 三角形) 排序后，顶点所在格子用 searchsorted 一次查出候选区间，
+只有同格的顶点–三角形才进入窄相，候选对数量与实际接近的元素成正比，而不是 N×F。
+窄相对所有候选对批量计算到平面的距离和重心坐标。
+
+命令行（基准）：
+    python manim_scripts/collision.py --bodies 36 --cells 3
+"""
+import argparse
+import time
+
+import numpy as np
+
+from geometry import cube_lattice
+
+# 重心坐标的容差：顶点正好落在相邻三角形的公共边 / 顶点上时也算在面内
+BARY_EPS = 0.05
+
+
+class SpatialHash:
+    """均匀网格空间哈希：登记轴对齐包围盒，按点查询候选"""
+
+    def __init__(self, cell_size):
+        if cell_size <= 0:
+            raise ValueError(f"cell_size 必须为正数，当前为 {cell_size}")
+        self.cell_size = float(cell_size)
+        self.keys = np.zeros(0, dtype=np.int64)
+        self.items = np.zeros(0, dtype=np.int64)
+
+    def _cells(self, points):
+        return np.floor(np.asarray(points) / self.cell_size).astype(np.int64)
+
+    def _key(self, cells):
+        # 以登记范围的最小格为原点线性化，保证键唯一（不依赖哈希函数）
+        c = cells - self.origin
+        return c[..., 0] + self.dims[0] * (c[..., 1] + self.dims[1] * c[..., 2])
+
+    def build(self, lo, hi):
+        """lo, hi: (M, 3) 每个物体的包围盒"""
+        lo_cells, hi_cells = self._cells(lo), self._cells(hi)
+        if len(lo_cells) == 0:
+            self.origin = np.zeros(3, dtype=np.int64)
+            self.dims = np.ones(3, dtype=np.int64)
+            self.keys = np.zeros(0, dtype=np.int64)
+            self.items = np.zeros(0, dtype=np.int64)
+            return self
+        self.origin = lo_cells.min(axis=0)
+        self.dims = hi_cells.max(axis=0) - self.origin + 1
+
+        # 每个包围盒覆盖 ex*ey*ez 个格子，一次性展开成 (格子, 物体) 列表
+        extent = hi_cells - lo_cells + 1
+        counts = extent.prod(axis=1)
+        items = np.repeat(np.arange(len(lo_cells)), counts)
+        local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        ex, ey = extent[items, 0], extent[items, 1]
+        offset = np.column_stack([local % ex, (local // ex) % ey, local // (ex * ey)])
+        keys = self._key(lo_cells[items] + offset)
+
+        order = np.argsort(keys, kind="stable")
+        self.keys, self.items = keys[order], items[order]
+        return self
+
+    def query(self, points):
+        """返回候选对 (点下标, 物体下标)"""
+        cells = self._cells(points)
+        inside = np.all((cells >= self.origin) & (cells < self.origin + self.dims), axis=1)
+        keys = np.where(inside, self._key(cells), -1)
+        left = np.searchsorted(self.keys, keys, side="left")
+        right = np.searchsorted(self.keys, keys, side="right")
+        counts = np.where(inside, right - left, 0)
+        point_ids = np.repeat(np.arange(len(points)), counts)
+        slots = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + np.repeat(left, counts)
+        return point_ids, self.items[slots]
+
+
+class GroundPlane:
+    def __init__(self, height=0.0):
+        self.height = height
+
+    def resolve(self, positions, previous=None):
+        hit = positions[:, 2] < self.height
+        positions[hit, 2] = self.height
+        return hit
+
+
+class Box:
+    """轴对齐刚体盒；inside=True 为容器（挤压墙），False 为障碍物"""
+
+    def __init__(self, lo, hi, inside=True):
+        self.lo = np.asarray(lo, dtype=np.float64)
+        self.hi = np.asarray(hi, dtype=np.float64)
+        self.inside = inside
+
+    def resolve(self, positions, previous=None):
+        if self.inside:
+            clamped = np.clip(positions, self.lo, self.hi)
+            hit = np.any(clamped != positions, axis=1)
+            positions[:] = clamped
+            return hit
+        hit = np.all((positions > self.lo) & (positions < self.hi), axis=1)
+        p = positions[hit]
+        # 沿穿透最浅的面推出
+        push = np.concatenate([self.lo - p, self.hi - p], axis=1)  # (H, 6)
+        face = np.argmin(np.abs(push), axis=1)
+        axis = face % 3
+        p[np.arange(len(p)), axis] += push[np.arange(len(p)), face]
+        positions[hit] = p
+        return hit
+
+
+class CollisionWorld:
+    """
+    若干软体（带表面三角形的 MeshGeometry）与静态碰撞体
+    resolve(positions, previous) 原地修正拼接后的顶点坐标，返回本次的接触信息；
+    与 GroundPlane / Box 接口相同，可直接放进 soft_body.relax 的碰撞体列表
+    """
+
+    def __init__(self, bodies, colliders=(), thickness=0.05, cell_size=None, friction=0.0):
+        self.bodies = list(bodies)
+        self.colliders = list(colliders)
+        self.thickness = thickness
+        self.friction = friction
+        sizes = [len(body) for body in self.bodies]
+        self.offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+        self.vertex_body = np.repeat(np.arange(len(sizes)), sizes)
+        self.faces = np.concatenate(
+            [body.faces.astype(np.int64) + offset for body, offset in zip(self.bodies, self.offsets)]
+        ) if self.bodies else np.zeros((0, 3), dtype=np.int64)
+        self.face_body = np.repeat(np.arange(len(sizes)), [body.num_faces for body in self.bodies])
+        if cell_size is None:
+            edge = np.concatenate([body.edge_lengths() for body in self.bodies]) if self.bodies else np.ones(1)
+            cell_size = 2 * float(np.median(edge)) if len(edge) else 1.0
+        self.hash = SpatialHash(cell_size)
+
+    def positions(self):
+        return np.concatenate([body.positions for body in self.bodies])
+
+    def split(self, positions):
+        """拼接坐标 → 每个物体的 MeshGeometry"""
+        return [body.with_positions(positions[a:b])
+                for body, a, b in zip(self.bodies, self.offsets[:-1], self.offsets[1:])]
+
+    def resolve(self, positions, previous=None):
+        contacts = {}
+        for i, collider in enumerate(self.colliders):
+            contacts[f"{type(collider).__name__.lower()}{i}"] = collider.resolve(positions, previous)
+        if len(self.bodies) > 1:
+            contacts["self"] = self.resolve_self(positions, previous)
+        return contacts
+
+    def candidate_pairs(self, positions, margin=0.0):
+        """margin：三角形包围盒在 thickness 之外再放宽的距离（扫掠时取本步最大位移）"""
+        tri = positions[self.faces]
+        pad = self.thickness + margin
+        self.hash.build(tri.min(axis=1) - pad, tri.max(axis=1) + pad)
+        vertex, face = self.hash.query(positions)
+        other = self.vertex_body[vertex] != self.face_body[face]
+        return vertex[other], face[other]
+
+    def resolve_self(self, positions, previous=None):
+        """
+        顶点–三角形：顶点在其他物体表面内侧时，顶点与三角形沿法线互相推开到相距 thickness
+        previous 缺省时只处理一个格子深度以内的穿透；给出上一步坐标时，
+        包围盒按本步最大位移放宽，上一步还在表面外侧的顶点无论穿进多深都能查到
+        """
+        margin = 0.0
+        if previous is not None:
+            margin = float(np.sqrt(np.max(np.einsum("ij,ij->i", positions - previous, positions - previous),
+                                          initial=0.0)))
+        vertex, face = self.candidate_pairs(positions, margin)
+        hit = np.zeros(len(positions), dtype=bool)
+        if len(vertex) == 0:
+            return hit
+        a, b, c = (positions[self.faces[face, k]] for k in range(3))
+        p = positions[vertex]
+        n = np.cross(b - a, c - a)
+        length = np.linalg.norm(n, axis=1)
+        valid = length > 1e-12
+        n = n / np.where(valid, length, 1)[:, None]
+        d = np.einsum("ij,ij->i", p - a, n)
+
+        # 投影点的重心坐标
+        q = p - d[:, None] * n
+        v0, v1, v2 = b - a, c - a, q - a
+        d00 = np.einsum("ij,ij->i", v0, v0)
+        d01 = np.einsum("ij,ij->i", v0, v1)
+        d11 = np.einsum("ij,ij->i", v1, v1)
+        d20 = np.einsum("ij,ij->i", v2, v0)
+        d21 = np.einsum("ij,ij->i", v2, v1)
+        denom = np.where(valid, d00 * d11 - d01 * d01, 1)
+        v = (d11 * d20 - d01 * d21) / denom
+        w = (d00 * d21 - d01 * d20) / denom
+        inside = valid & (v >= -BARY_EPS) & (w >= -BARY_EPS) & (v + w <= 1 + BARY_EPS)
+        if previous is None:
+            reachable = d > -self.hash.cell_size
+        else:
+            # 上一步在表面外侧（或壳层内）：本步穿过了这个面
+            reachable = np.einsum("ij,ij->i", previous[vertex] - a, n) > -self.thickness
+        contact = inside & (d < self.thickness) & reachable
+        if not contact.any():
+            return hit
+
+        # 每个顶点只沿穿透最浅（离表面最近）的面修正一次；
+        # 位置约束 (p - Σbᵢxᵢ)·n = thickness 按等质量分摊：顶点沿法线外推，三角形的三个顶点按重心坐标反向退让；
+        # 同一顶点参与多个约束时修正量取平均（Jacobi），多个顶点压在同一个三角形上不会把它叠加推穿
+        vertex, face, d, n = vertex[contact], face[contact], d[contact], n[contact]
+        bary = np.clip(np.column_stack([1 - v - w, v, w])[contact], 0, 1)
+        order = np.lexsort((-d, vertex))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = vertex[order][1:] != vertex[order][:-1]
+        sel = order[first]
+        vertex, face, n, bary = vertex[sel], face[sel], n[sel], bary[sel]
+        step = ((self.thickness - d[sel]) / (1 + np.einsum("ij,ij->i", bary, bary)))[:, None] * n
+        targets = np.concatenate([vertex, self.faces[face].T.ravel()])
+        deltas = np.concatenate([step, *(-bary[:, k, None] * step for k in range(3))])
+        counts = np.bincount(targets, minlength=len(positions))
+        touched = np.flatnonzero(counts)
+        delta = np.column_stack([np.bincount(targets, weights=deltas[:, axis], minlength=len(positions))
+                                 for axis in range(3)])
+        positions[touched] += delta[touched] / counts[touched, None]
+        if previous is not None and self.friction > 0:
+            # 摩擦：接触顶点本步的切向位移按 friction 比例撤回
+            moved = positions[vertex] - previous[vertex]
+            tangent = moved - np.einsum("ij,ij->i", moved, n)[:, None] * n
+            positions[vertex] -= self.friction * tangent
+        hit[vertex] = True
+        return hit
+
+
+def _benchmark(bodies, cells, size, spacing):
+    base = cube_lattice(cells, size)
+    side = int(np.ceil(np.sqrt(bodies)))
+    meshes = []
+    for m in range(bodies):
+        offset = np.array([(m % side) * spacing, (m // side) * spacing, 0.1 * (m % 3)])
+        meshes.append(base.with_positions(base.positions + offset))
+    world = CollisionWorld(meshes, [GroundPlane(0.0)])
+    positions = world.positions()
+    start = time.perf_counter()
+    vertex, face = world.candidate_pairs(positions)
+    contacts = world.resolve(positions)
+    elapsed = time.perf_counter() - start
+    brute = len(positions) * len(world.faces)
+    print(f"{bodies} 个晶格，{len(positions)} 顶点，{len(world.faces)} 表面三角形")
+    print(f"候选对 {len(vertex)}（全配对 {brute}），自碰撞修正 {int(contacts['self'].sum())} 个顶点，"
+          f"{elapsed * 1000:.1f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="空间哈希碰撞基准")
+    parser.add_argument("--bodies", type=int, default=36)
+    parser.add_argument("--cells", type=int, default=2)
+    parser.add_argument("--size", type=float, default=3.0)
+    parser.add_argument("--spacing", type=float, default=2.8, help="相邻晶格的间距，小于 size 时互相穿插")
+    args = parser.parse_args(argv)
+    _benchmark(args.bodies, args.cells, args.size, args.spacing)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# dirty_rect_camera.py
+import numpy as np
+from manim import Camera, VMobject
+
+
+class DirtyRectCamera(Camera):
+    """
+    脏矩形 2D 相机：静态背景之上只重绘发生变化的区域
+    –––––––––––––––––––––––
+    - CairoRenderer 每帧先 set_frame_to_background(静态帧)，再 capture_mobjects(移动物体)
+    - 这里推迟整帧拷贝：只恢复「上一帧 ∪ 本帧」移动物体包围盒内的像素，
+      并用 cairo clip 把光栅化限制在该矩形内，其余像素沿用上一帧缓冲
+    - 角落字幕的 Write/FadeIn 只需重绘字幕附近的一小块
+    """
+
+    # 脏区域超过整帧的这个比例时，直接整帧重绘更划算
+    full_redraw_ratio = 0.6
+    # 抗锯齿边缘的额外留白（像素）
+    antialias_padding = 2
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pending_background = None  # 本帧应恢复到的背景（延迟拷贝）
+        self._frame_background = None    # pixel_array 当前所基于的背景
+        self._dirty_box = None           # 上一帧移动物体占据的像素矩形
+        self.redraw_stats = {"full": 0, "partial": 0, "pixels": 0}
+
+    def reset(self):
+        self._forget_frame()
+        return super().reset()
+
+    def set_frame_to_background(self, background):
+        self._pending_background = background
+
+    def capture_mobjects(self, mobjects, **kwargs):
+        background = self._pending_background
+        self._pending_background = None
+        if background is None:
+            # reset() 之后或直接调用：与父类一致整帧绘制，之后无法再增量恢复
+            self._forget_frame()
+            self.redraw_stats["full"] += 1
+            return super().capture_mobjects(mobjects, **kwargs)
+
+        mobjects = self.get_mobjects_to_display(mobjects, **kwargs)
+        box = self._pixel_box(mobjects)
+        region = None
+        if background is self._frame_background and box is not None and self._dirty_box is not None:
+            region = self._union(box, self._dirty_box)
+            area = (region[2] - region[0]) * (region[3] - region[1])
+            if area > self.full_redraw_ratio * self.pixel_width * self.pixel_height:
+                region = None
+
+        if region is None:
+            self.set_pixel_array(background)
+            super().capture_mobjects(mobjects, include_submobjects=False)
+            self.redraw_stats["full"] += 1
+        else:
+            self._redraw_region(background, region, mobjects)
+            self.redraw_stats["partial"] += 1
+            self.redraw_stats["pixels"] += (region[2] - region[0]) * (region[3] - region[1])
+        self._frame_background = background
+        self._dirty_box = box
+
+    # ----------------------------------------------------------
+    # 内部
+    # ----------------------------------------------------------
+    def _forget_frame(self):
+        self._pending_background = None
+        self._frame_background = None
+        self._dirty_box = None
+
+    def _redraw_region(self, background, region, mobjects):
+        x0, y0, x1, y1 = region
+        if x1 <= x0 or y1 <= y0:
+            return
+        self.pixel_array[y0:y1, x0:x1] = background[y0:y1, x0:x1]
+        if not mobjects:
+            return
+        ctx = self.get_cairo_context(self.pixel_array)
+        ctx.save()
+        matrix = ctx.get_matrix()
+        ctx.identity_matrix()
+        ctx.new_path()
+        ctx.rectangle(x0, y0, x1 - x0, y1 - y0)
+        ctx.clip()
+        ctx.set_matrix(matrix)
+        try:
+            super().capture_mobjects(mobjects, include_submobjects=False)
+        finally:
+            ctx.restore()
+
+    def _pixel_box(self, mobjects):
+        """移动物体的像素包围盒 (x0, y0, x1, y1)；无法可靠估计时返回 None"""
+        if not mobjects:
+            return (0, 0, 0, 0)
+        points, max_width = [], 0.0
+        for mob in mobjects:
+            # 非矢量物体（图片、点云）由 NumPy 直接写像素，不受 clip 约束
+            if not isinstance(mob, VMobject) or mob.get_background_image():
+                return None
+            points.append(self.transform_points_pre_display(mob, mob.points))
+            max_width = max(max_width, mob.get_stroke_width(), mob.get_stroke_width(background=True))
+        points = np.concatenate(points)
+        if len(points) == 0:
+            return (0, 0, 0, 0)
+
+        pw, ph = self.pixel_width, self.pixel_height
+        fw, fh = self.frame_width, self.frame_height
+        fc = self.frame_center
+        xs = (points[:, 0] - fc[0]) * (pw / fw) + pw / 2
+        ys = ph / 2 - (points[:, 1] - fc[1]) * (ph / fh)
+        pad = max_width * self.cairo_line_width_multiple * (pw / fw) + self.antialias_padding
+        x0 = int(np.clip(np.floor(xs.min() - pad), 0, pw))
+        x1 = int(np.clip(np.ceil(xs.max() + pad), 0, pw))
+        y0 = int(np.clip(np.floor(ys.min() - pad), 0, ph))
+        y1 = int(np.clip(np.ceil(ys.max() + pad), 0, ph))
+        return (x0, y0, x1, y1)
+
+    @staticmethod
+    def _union(a, b):
+        if a[2] <= a[0] or a[3] <= a[1]:
+            return b
+        if b[2] <= b[0] or b[3] <= b[1]:
+            return a
+        return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
@@ -0,0 +1,222 @@
+# frame_pipeline.py
+import queue
+import subprocess
+import threading
+
+import numpy as np
+from manim import __version__, config, logger
+from manim.constants import RendererType
+from manim.scene.scene_file_writer import SceneFileWriter
+from manim.utils.file_ops import is_png_format, is_webm_format, write_to_movie
+
+# 队列中的控制标记
+_REPEAT = -1  # 重复写出上一帧（wait/静止帧）
+_STOP = None  # 当前片段结束
+# 判断静止帧时先比较的抽样字节数，不同的帧通常在这一步就能排除
+_PROBE = 4096
+
+
+def _same_frame(frame, previous):
+    """两帧内容是否完全相同：先比较均匀抽样的字节，相同再整帧比较"""
+    frame = np.asarray(frame)
+    if frame.shape != previous.shape or frame.dtype != previous.dtype:
+        return False
+    a, b = frame.reshape(-1), previous.reshape(-1)
+    step = max(1, a.size // _PROBE)
+    return np.array_equal(a[::step], b[::step]) and np.array_equal(a, b)
+
+
+class FramePipeline:
+    """
+    帧流水线：渲染线程 → 有界缓冲队列 → 编码线程 → 编码器管道
+    –––––––––––––––––––––––
+    - 预先分配 queue_size 块可复用的帧缓冲，峰值内存固定为 queue_size × 单帧大小
+    - submit() 只做一次内存拷贝；只有所有缓冲都在排队时才会阻塞渲染
+    - 静止帧（wait）：与上一帧内容相同时不再拷贝，只排一个重复标记；
+      按内容而不是数组是否为同一对象判断，复用同一块帧缓冲的渲染器也能正确逐帧写出
+    - 后台线程把帧写入编码进程（ffmpeg）的 stdin，与光栅化重叠执行
+    """
+
+    def __init__(self, frame_shape, queue_size=8, dtype=np.uint8):
+        if queue_size < 2:
+            raise ValueError("queue_size 至少为 2（编码线程会保留上一帧用于重复）")
+        self.frame_shape = tuple(frame_shape)
+        self.queue_size = queue_size
+        self.buffers = [np.empty(self.frame_shape, dtype=dtype) for _ in range(queue_size)]
+        self.process = None
+        self._free = queue.Queue()
+        self._pending = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._error = None
+        self._last = None  # 上一次拷贝进的缓冲下标
+
+    @property
+    def nbytes(self):
+        return sum(buf.nbytes for buf in self.buffers)
+
+    # ----------------------------------------------------------
+    # 生命周期
+    # ----------------------------------------------------------
+    def open(self, command):
+        """启动编码进程与写出线程（每个 play 片段调用一次，缓冲在片段之间复用）"""
+        self._free = queue.Queue()
+        for i in range(self.queue_size):
+            self._free.put(i)
+        self._pending = queue.Queue(maxsize=self.queue_size)
+        self._error = None
+        self._last = None
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE)
+        self._thread = threading.Thread(target=self._write_loop, name="frame-pipeline", daemon=True)
+        self._thread.start()
+
+    def submit(self, frame):
+        """
+        把一帧放入队列；与上一帧内容相同时只排一个重复标记，不再拷贝
+        上一帧的缓冲要等下一个新帧进队后才会被写出线程归还，这里读取它是安全的
+        """
+        self._raise_if_failed()
+        if self._last is not None and _same_frame(frame, self.buffers[self._last]):
+            self._pending.put(_REPEAT)
+            return
+        index = self._free.get()
+        np.copyto(self.buffers[index], frame, casting="no")
+        self._last = index
+        self._pending.put(index)
+
+    def close(self):
+        """排空队列，关闭编码器输入并等待其退出"""
+        if self._thread is None:
+            return
+        self._pending.put(_STOP)
+        self._thread.join()
+        self._thread = None
+        self._last = None
+        try:
+            self.process.stdin.close()
+        except BrokenPipeError:
+            pass
+        self.process.wait()
+        self._raise_if_failed()
+
+    # ----------------------------------------------------------
+    # 写出线程
+    # ----------------------------------------------------------
+    def _write_loop(self):
+        stdin = self.process.stdin
+        held = None  # 上一帧的缓冲，保留到下一帧到来以支持 _REPEAT
+        while True:
+            item = self._pending.get()
+            if item is _STOP:
+                break
+            if self._error is not None:
+                # 编码器已出错：继续回收缓冲，避免渲染线程死锁
+                if item != _REPEAT:
+                    self._free.put(item)
+                continue
+            try:
+                if item == _REPEAT:
+                    stdin.write(self.buffers[held].data)
+                    continue
+                stdin.write(self.buffers[item].data)
+            except (BrokenPipeError, OSError) as exc:
+                self._error = exc
+                if item != _REPEAT:
+                    self._free.put(item)
+                continue
+            if held is not None:
+                self._free.put(held)
+            held = item
+        if held is not None:
+            self._free.put(held)
+
+    def _raise_if_failed(self):
+        if self._error is not None:
+            raise RuntimeError(f"编码进程写入失败：{self._error}") from self._error
+
+
+class PipelinedFileWriter(SceneFileWriter):
+    """
+    以 FramePipeline 代替逐帧阻塞写管道的 SceneFileWriter
+    只接管 Cairo 渲染器的视频输出，其他情况（OpenGL、png 序列）沿用父类
+    """
+
+    queue_size = 8
+
+    def __init__(self, renderer, scene_name, **kwargs):
+        super().__init__(renderer, scene_name, **kwargs)
+        self.pipeline = None
+
+    def open_movie_pipe(self, file_path=None):
+        if config.renderer != RendererType.CAIRO:
+            return super().open_movie_pipe(file_path=file_path)
+        if file_path is None:
+            file_path = self.partial_movie_files[self.renderer.num_plays]
+        self.partial_movie_file_path = file_path
+
+        height = config["pixel_height"]
+        width = config["pixel_width"]
+        frame_shape = (height, width, 4)
+        if self.pipeline is None or self.pipeline.frame_shape != frame_shape:
+            self.pipeline = FramePipeline(frame_shape, queue_size=self.queue_size)
+        self.pipeline.open(self.ffmpeg_command(file_path, width, height))
+        self.writing_process = self.pipeline.process
+
+    def close_movie_pipe(self):
+        if config.renderer != RendererType.CAIRO:
+            return super().close_movie_pipe()
+        self.pipeline.close()
+        logger.info(
+            f"Animation {self.renderer.num_plays} : Partial movie file written in %(path)s",
+            {"path": f"'{self.partial_movie_file_path}'"},
+        )
+
+    def write_frame(self, frame_or_renderer):
+        if config.renderer != RendererType.CAIRO:
+            return super().write_frame(frame_or_renderer)
+        frame = frame_or_renderer
+        if write_to_movie():
+            self.pipeline.submit(frame)
+        if is_png_format() and not config["dry_run"]:
+            self.output_image_from_array(frame)
+
+    @staticmethod
+    def ffmpeg_command(file_path, width, height):
+        # 与 SceneFileWriter.open_movie_pipe 保持一致的编码参数
+        fps = config["frame_rate"]
+        if fps == int(fps):
+            fps = int(fps)
+        command = [
+            config.ffmpeg_executable,
+            "-y",
+            "-f", "rawvideo",
+            "-s", "%dx%d" % (width, height),
+            "-pix_fmt", "rgba",
+            "-r", str(fps),
+            "-i", "-",
+            "-an",
+            "-loglevel", config["ffmpeg_loglevel"].lower(),
+            "-metadata", f"comment=Rendered with Manim Community v{__version__}",
+        ]
+        if is_webm_format():
+            command += ["-vcodec", "libvpx-vp9", "-auto-alt-ref", "0"]
+        elif config["transparent"]:
+            command += ["-vcodec", "qtrle"]
+        else:
+            command += ["-vcodec", "libx264", "-pix_fmt", "yuv420p"]
+        command += [str(file_path)]
+        return command
+
+
+class PipelinedWriterMixin:
+    """
+    场景混入类：Cairo 渲染时改用 PipelinedFileWriter
+    用法：class MyScene(PipelinedWriterMixin, Scene)
+    """
+
+    pipelined_writer = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.pipelined_writer and config.renderer == RendererType.CAIRO:
+            self.renderer._file_writer_class = PipelinedFileWriter
+            self.renderer.init_scene(self)
@@ -0,0 +1,248 @@
+# frame_regression.py
+"""
+抽帧回归检查：感知哈希 + 像素差，对比已保存的基准帧
+–––––––––––––––––––––––
+以低分辨率、低帧率渲染场景，只保留指定时间点的帧，与 goldens/<场景>.npz 中的基准帧比较：
+
+- 感知哈希（pHash）：灰度 → 分块平均缩到 32×32 → 二维 DCT → 取左上 8×8（去掉直流）与中位数比较得 64 位，
+  所有抽样帧一次批量计算；两帧的汉明距离反映结构变化，对抗锯齿、细微色差不敏感
+- 像素差：平均 / 最大绝对差、差值超过 diff_threshold 的像素比例、PSNR
+- 总帧数不同说明动画时长变了，直接判为失败
+
+每次改动几何或渲染路径后运行一次，数秒内确认画面没有意外变化：
+
+    python manim_scripts/frame_regression.py --update                  # 生成 / 刷新基准
+    python manim_scripts/frame_regression.py                           # 检查全部场景
+    python manim_scripts/frame_regression.py TriangleMesh3D --times 2,8,20 --preset preview
+
+基准与渲染参数（分辨率、帧率、预设、抽样时间）一起保存，检查时沿用基准中的参数。
+"""
+import argparse
+import importlib
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from scipy.fft import dctn
+
+DEFAULT_GOLDENS = Path(__file__).resolve().parent / "goldens"
+# 场景类名 → 所在模块
+SCENE_MODULES = {
+    "TriangleDecomposition": "triangle_scenes",
+    "TriangleMesh3D": "triangle_mesh_3d",
+    "TetrahedronPhysics": "tetrahedron_physics",
+}
+DEFAULT_TIMES = (1.0, 5.0, 10.0, 20.0, 30.0)
+HASH_SIZE = 8
+HASH_SOURCE = 32
+
+
+# ----------------------------------------------------------
+# 感知哈希与像素差（批量）
+# ----------------------------------------------------------
+def to_gray(frames):
+    """(K, H, W, 3|4) uint8 → (K, H, W) float32，按 BT.601 加权"""
+    frames = np.asarray(frames, dtype=np.float32)
+    return frames[..., 0] * 0.299 + frames[..., 1] * 0.587 + frames[..., 2] * 0.114
+
+
+def block_resize(images, size):
+    """(K, H, W) → (K, size, size)：每个输出像素取对应块的平均值"""
+    k, h, w = images.shape
+    rows = np.arange(size) * h // size
+    cols = np.arange(size) * w // size
+    sums = np.add.reduceat(np.add.reduceat(images, rows, axis=1), cols, axis=2)
+    counts = np.diff(np.append(rows, h))[:, None] * np.diff(np.append(cols, w))[None, :]
+    return sums / counts
+
+
+def phash(frames):
+    """(K, H, W, C) → (K, 8) uint8，每帧 64 位 DCT 感知哈希"""
+    small = block_resize(to_gray(frames), HASH_SOURCE)
+    coeffs = dctn(small, type=2, axes=(1, 2), norm="ortho")[:, :HASH_SIZE, :HASH_SIZE].reshape(len(small), -1)
+    ac = coeffs[:, 1:]  # 去掉直流分量
+    bits = np.concatenate([np.zeros((len(small), 1), dtype=bool), ac > np.median(ac, axis=1, keepdims=True)], axis=1)
+    return np.packbits(bits, axis=1)
+
+
+def hamming(a, b):
+    return np.unpackbits(np.bitwise_xor(a, b), axis=1).sum(axis=1)
+
+
+def pixel_stats(frames, golden, diff_threshold=16):
+    """逐帧的平均 / 最大绝对差、超过阈值的像素比例、PSNR"""
+    diff = np.abs(frames[..., :3].astype(np.int16) - golden[..., :3].astype(np.int16))
+    axes = (1, 2, 3)
+    mse = (diff.astype(np.float64) ** 2).mean(axis=axes)
+    with np.errstate(divide="ignore"):
+        psnr = np.where(mse > 0, 10 * np.log10(255.0 ** 2 / mse), np.inf)
+    return {
+        "mean": diff.mean(axis=axes),
+        "max": diff.max(axis=axes),
+        "changed": (diff.max(axis=3) > diff_threshold).mean(axis=(1, 2)),
+        "psnr": psnr,
+    }
+
+
+# ----------------------------------------------------------
+# 抽帧渲染
+# ----------------------------------------------------------
+def sample_indices(times, fps):
+    return [int(round(t * fps)) for t in times]
+
+
+def render_samples(scene_name, times, width, height, fps, preset=None, overrides=""):
+    """用 manim（Cairo）渲染场景，返回 (抽样帧 (K, H, W, 4) uint8, 总帧数)"""
+    from manim import config, tempconfig
+    from manim.scene.scene_file_writer import SceneFileWriter
+
+    indices = sample_indices(times, fps)
+    wanted = set(indices)
+    captured = {}
+    counter = {"frames": 0}
+
+    class SamplingFileWriter(SceneFileWriter):
+        """不写视频，只在抽样帧处保留一份拷贝"""
+
+        def write_frame(self, frame_or_renderer):
+            index = counter["frames"]
+            if index in wanted:
+                captured[index] = np.array(frame_or_renderer, dtype=np.uint8, copy=True)
+            counter["frames"] += 1
+
+    module = importlib.import_module(SCENE_MODULES[scene_name])
+    base = getattr(module, scene_name)
+
+    def __init__(self, *args, **kwargs):
+        base.__init__(self, *args, **kwargs)
+        self.renderer._file_writer_class = SamplingFileWriter
+        self.renderer.init_scene(self)
+
+    scene_cls = type(scene_name, (base,), {"__init__": __init__, "pipelined_writer": False})
+
+    # 基准只由这里给出的预设与覆盖决定，开发机上的 LESSON_CONFIG 不参与
+    env = {"LESSON_CONFIG": "", "LESSON_PRESET": preset or "", "LESSON_SET": overrides}
+    saved = {key: os.environ.get(key) for key in env}
+    os.environ.update(env)
+    try:
+        with tempfile.TemporaryDirectory() as media, tempconfig({
+            "pixel_width": width, "pixel_height": height, "frame_rate": fps,
+            "media_dir": media, "write_to_movie": False, "save_last_frame": False,
+            "disable_caching": True, "preview": False, "progress_bar": "none", "verbosity": "WARNING",
+        }):
+            config.frame_width = config.frame_height * width / height
+            scene_cls().render()
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+    missing = [t for t, i in zip(times, indices) if i not in captured]
+    if missing:
+        raise ValueError(f"{scene_name} 只有 {counter['frames']} 帧，以下时间点超出场景时长：{missing}")
+    return np.stack([captured[i] for i in indices]), counter["frames"]
+
+
+# ----------------------------------------------------------
+# 基准的读写与比较
+# ----------------------------------------------------------
+def golden_path(root, scene_name):
+    return Path(root) / f"{scene_name}.npz"
+
+
+def save_golden(path, frames, frame_count, params):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    meta = dict(params, frame_count=frame_count)
+    np.savez_compressed(path, frames=frames[..., :3], hashes=phash(frames), meta=json.dumps(meta))
+
+
+def load_golden(path):
+    with np.load(path) as data:
+        return data["frames"], data["hashes"], json.loads(str(data["meta"]))
+
+
+def compare(frames, frame_count, golden_frames, golden_hashes, meta, max_hamming=6, max_mean_diff=2.0,
+            diff_threshold=16):
+    """返回 (是否通过, 每个抽样时间点的结果列表)"""
+    distances = hamming(phash(frames), golden_hashes)
+    stats = pixel_stats(frames, golden_frames, diff_threshold)
+    rows = []
+    passed = frame_count == meta["frame_count"]
+    for k, t in enumerate(meta["times"]):
+        ok = bool(distances[k] <= max_hamming and stats["mean"][k] <= max_mean_diff)
+        passed &= ok
+        rows.append({
+            "time": t, "hamming": int(distances[k]), "mean": float(stats["mean"][k]),
+            "max": int(stats["max"][k]), "changed": float(stats["changed"][k]),
+            "psnr": float(stats["psnr"][k]), "ok": ok,
+        })
+    return passed, rows
+
+
+def _report(scene_name, passed, rows, frame_count, meta, elapsed):
+    status = "通过" if passed else "失败"
+    print(f"{scene_name}: {status}（{elapsed:.1f}s，{frame_count} 帧，基准 {meta['frame_count']} 帧）")
+    for r in rows:
+        mark = " " if r["ok"] else "✗"
+        print(f"  {mark} t={r['time']:6.2f}s  汉明 {r['hamming']:2d}  平均差 {r['mean']:6.2f}  最大差 {r['max']:3d}  "
+              f"变化像素 {r['changed'] * 100:5.1f}%  PSNR {r['psnr']:6.1f} dB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="抽帧感知哈希回归检查")
+    parser.add_argument("scenes", nargs="*", metavar="scene", help=f"默认全部：{', '.join(SCENE_MODULES)}")
+    parser.add_argument("--goldens", type=Path, default=DEFAULT_GOLDENS)
+    parser.add_argument("--update", action="store_true", help="重新渲染并覆盖基准")
+    parser.add_argument("--times", help="抽样时间点（秒），逗号分隔；仅在 --update 时使用")
+    parser.add_argument("--width", type=int, default=192)
+    parser.add_argument("--height", type=int, default=108)
+    parser.add_argument("--fps", type=int, default=10)
+    parser.add_argument("--preset", help="场景配置预设（见 scene_config.py）")
+    parser.add_argument("--set", default="", help="场景配置覆盖，格式同 LESSON_SET")
+    parser.add_argument("--max-hamming", type=int, default=6)
+    parser.add_argument("--max-mean-diff", type=float, default=2.0)
+    parser.add_argument("--diff-threshold", type=int, default=16)
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.scenes if name not in SCENE_MODULES]
+    if unknown:
+        parser.error(f"未知场景：{', '.join(unknown)}")
+
+    failed = []
+    for scene_name in args.scenes or list(SCENE_MODULES):
+        path = golden_path(args.goldens, scene_name)
+        if args.update or not path.exists():
+            if not args.update:
+                print(f"{scene_name}: 没有基准 {path}，请先运行 --update")
+                failed.append(scene_name)
+                continue
+            times = [float(t) for t in args.times.split(",")] if args.times else list(DEFAULT_TIMES)
+            params = {"times": times, "width": args.width, "height": args.height, "fps": args.fps,
+                      "preset": args.preset, "set": args.set}
+            start = time.perf_counter()
+            frames, frame_count = render_samples(scene_name, times, args.width, args.height, args.fps,
+                                                 args.preset, args.set)
+            save_golden(path, frames, frame_count, params)
+            print(f"{scene_name}: 已写入 {path}（{len(times)} 帧，共 {frame_count} 帧，"
+                  f"{time.perf_counter() - start:.1f}s）")
+            continue
+
+        golden_frames, golden_hashes, meta = load_golden(path)
+        start = time.perf_counter()
+        frames, frame_count = render_samples(scene_name, meta["times"], meta["width"], meta["height"],
+                                             meta["fps"], meta["preset"], meta["set"])
+        passed, rows = compare(frames, frame_count, golden_frames, golden_hashes, meta,
+                               args.max_hamming, args.max_mean_diff, args.diff_threshold)
+        _report(scene_name, passed, rows, frame_count, meta, time.perf_counter() - start)
+        if not passed:
+            failed.append(scene_name)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
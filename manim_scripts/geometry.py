@@ -0,0 +1,278 @@
+# geometry.py
+"""
+场景几何的紧凑表示
+–––––––––––––––––––––––
+顶点坐标、边、面各存一块连续数组（结构数组），名称 / 标签 / 颜色放在旁表里：
+
+    positions   (N, 3) float64   顶点坐标
+    edges       (E, 2) int32     边的顶点下标（弹簧、线框）
+    faces       (F, 3) int32     三角形面的顶点下标
+    names       N 个顶点名（"V1"、"P3" …），可为 None
+    labels      N 个顶点标签文字（坐标等），可为 None
+    face_colors F 个面的颜色，可为 None
+
+变形、模拟、渲染、导出都直接对整块数组做向量化运算；
+with_positions() 只替换坐标、共享拓扑和旁表，不复制。
+cube_lattice() / lattice_tetrahedra() / scene_lattice() 生成多四面体演示的立方体晶格及其四面体剖分
+（纯 numpy，场景、模拟、预览与测试共用）。
+"""
+import numpy as np
+
+
+def _as_positions(points):
+    points = np.asarray(points, dtype=np.float64)
+    if points.ndim == 1:
+        points = points.reshape(-1, 3) if points.size else np.zeros((0, 3))
+    if points.shape[1] == 2:  # 平面点补 z = 0
+        points = np.column_stack([points, np.zeros(len(points))])
+    return np.ascontiguousarray(points)
+
+
+def _as_indices(indices, width):
+    if indices is None:
+        return np.zeros((0, width), dtype=np.int32)
+    return np.ascontiguousarray(np.asarray(indices, dtype=np.int32).reshape(-1, width))
+
+
+class MeshGeometry:
+    __slots__ = ("positions", "edges", "faces", "names", "labels", "face_colors")
+
+    def __init__(self, positions, edges=None, faces=None, names=None, labels=None, face_colors=None):
+        self.positions = _as_positions(positions)
+        self.edges = _as_indices(edges, 2)
+        self.faces = _as_indices(faces, 3)
+        n, f = len(self.positions), len(self.faces)
+        for name, table, size in (("names", names, n), ("labels", labels, n), ("face_colors", face_colors, f)):
+            if table is not None and len(table) != size:
+                raise ValueError(f"{name} 长度应为 {size}，实际为 {len(table)}")
+        for name, index in (("edges", self.edges), ("faces", self.faces)):
+            if index.size and not (0 <= index.min() and index.max() < n):
+                raise ValueError(f"{name} 中的顶点下标越界（共 {n} 个顶点）")
+        self.names = None if names is None else tuple(names)
+        self.labels = None if labels is None else tuple(labels)
+        self.face_colors = None if face_colors is None else tuple(face_colors)
+
+    # ----------------------------------------------------------
+    # 构造
+    # ----------------------------------------------------------
+    @classmethod
+    def from_faces(cls, positions, faces, **kwargs):
+        """由三角形面推出不重复的边（按首次出现的顺序）"""
+        faces = _as_indices(faces, 3)
+        kwargs.setdefault("edges", face_edges(faces))
+        return cls(positions, faces=faces, **kwargs)
+
+    @classmethod
+    def fan(cls, center, ring, **kwargs):
+        """扇形三角化：顶点 0 为中心，1..n 为闭合轮廓，第 i 个面为 (0, i+1, i+2)"""
+        ring = _as_positions(ring)
+        n = len(ring)
+        i = np.arange(n)
+        faces = np.column_stack([np.zeros(n, dtype=np.int32), 1 + i, 1 + (i + 1) % n])
+        return cls.from_faces(np.vstack([_as_positions(center), ring]), faces, **kwargs)
+
+    @classmethod
+    def concatenate(cls, meshes, names=None):
+        """若干网格拼成一个（互不相连），边 / 面的下标按顶点偏移；旁表只在全部网格都有时保留"""
+        meshes = list(meshes)
+        offsets = np.cumsum([0] + [len(mesh) for mesh in meshes[:-1]])
+
+        def table(slot):
+            tables = [getattr(mesh, slot) for mesh in meshes]
+            return None if any(t is None for t in tables) else [x for t in tables for x in t]
+
+        return cls(
+            np.concatenate([mesh.positions for mesh in meshes]),
+            edges=np.concatenate([mesh.edges + offset for mesh, offset in zip(meshes, offsets)]),
+            faces=np.concatenate([mesh.faces + offset for mesh, offset in zip(meshes, offsets)]),
+            names=table("names") if names is None else names,
+            labels=table("labels"),
+            face_colors=table("face_colors"),
+        )
+
+    def with_positions(self, positions):
+        """替换坐标，共享拓扑与旁表"""
+        positions = _as_positions(positions)
+        if positions.shape != self.positions.shape:
+            raise ValueError(f"坐标形状应为 {self.positions.shape}，实际为 {positions.shape}")
+        clone = object.__new__(MeshGeometry)
+        clone.positions = positions
+        for slot in ("edges", "faces", "names", "labels", "face_colors"):
+            setattr(clone, slot, getattr(self, slot))
+        return clone
+
+    def with_labels(self, labels):
+        clone = self.with_positions(self.positions)
+        if labels is not None and len(labels) != len(self.positions):
+            raise ValueError(f"labels 长度应为 {len(self.positions)}，实际为 {len(labels)}")
+        clone.labels = None if labels is None else tuple(labels)
+        return clone
+
+    def transformed(self, matrix, offset=None):
+        """线性变换 p ↦ matrix · p (+ offset)"""
+        positions = self.positions @ np.asarray(matrix, dtype=np.float64).T
+        if offset is not None:
+            positions += np.asarray(offset, dtype=np.float64)
+        return self.with_positions(positions)
+
+    # ----------------------------------------------------------
+    # 访问
+    # ----------------------------------------------------------
+    def __len__(self):
+        return len(self.positions)
+
+    @property
+    def num_edges(self):
+        return len(self.edges)
+
+    @property
+    def num_faces(self):
+        return len(self.faces)
+
+    def vertex(self, i):
+        """第 i 个顶点坐标（视图，修改会写回）"""
+        return self.positions[i]
+
+    def index(self, name):
+        if self.names is None:
+            raise KeyError(name)
+        return self.names.index(name)
+
+    def edge_points(self, i=None):
+        """第 i 条边的两个端点 (2, 3)；i 为 None 时返回全部 (E, 2, 3)"""
+        return self.positions[self.edges if i is None else self.edges[i]]
+
+    def face_points(self, i=None):
+        """第 i 个面的三个顶点 (3, 3)；i 为 None 时返回全部 (F, 3, 3)"""
+        return self.positions[self.faces if i is None else self.faces[i]]
+
+    def edge_lengths(self):
+        d = self.positions[self.edges[:, 1]] - self.positions[self.edges[:, 0]]
+        return np.sqrt(np.einsum("ij,ij->i", d, d))
+
+    def __repr__(self):
+        return f"MeshGeometry({len(self)} vertices, {self.num_edges} edges, {self.num_faces} faces)"
+
+
+def face_edges(faces):
+    """三角形面 → 不重复的无向边 (E, 2)，保持首次出现的顺序"""
+    faces = _as_indices(faces, 3)
+    edges = faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)
+    keys = np.sort(edges, axis=1)
+    _, first = np.unique(keys, axis=0, return_index=True)
+    return edges[np.sort(first)]
+
+
+def cube_lattice(cells=1, size=3.0):
+    """
+    立方体晶格：底面中心在原点，边长 size，每条棱 cells 个单元
+    顶点下标 = i + n*j + n*n*k（n = cells + 1，x 变化最快）
+    连接顺序：逐层的正方形边 → 垂直边 → 每个单元的四面体分解对角线
+    cells=1 时即原始的 8 个顶点、16 条边
+    """
+    n = cells + 1
+    step = size / cells
+    k, j, i = np.indices((n, n, n)).reshape(3, -1)
+    positions = np.column_stack([-size / 2 + i * step, -size / 2 + j * step, k * step])
+
+    def idx(i, j, k):
+        return i + n * j + n * n * k
+
+    conns, seen = [], set()
+
+    def connect(a, b):
+        if frozenset((a, b)) not in seen:
+            seen.add(frozenset((a, b)))
+            conns.append((a, b))
+
+    # 每层的正方形（按单元逐个绕一圈）
+    for k in range(n):
+        for j in range(cells):
+            for i in range(cells):
+                a, b = idx(i, j, k), idx(i + 1, j, k)
+                c, d = idx(i, j + 1, k), idx(i + 1, j + 1, k)
+                for s, e in ((a, b), (b, d), (d, c), (c, a)):
+                    connect(s, e)
+    # 垂直边
+    for k in range(cells):
+        for j in range(n):
+            for i in range(n):
+                connect(idx(i, j, k), idx(i, j, k + 1))
+    # 四面体分解的关键对角线
+    for k in range(cells):
+        for j in range(cells):
+            for i in range(cells):
+                connect(idx(i, j, k), idx(i + 1, j + 1, k))
+                connect(idx(i, j, k), idx(i + 1, j + 1, k + 1))
+                connect(idx(i + 1, j, k), idx(i, j + 1, k + 1))
+                connect(idx(i, j + 1, k), idx(i + 1, j, k + 1))
+    return MeshGeometry(positions, edges=conns, faces=_box_surface(n, idx),
+                        names=[f"P{m + 1}" for m in range(len(positions))])
+
+
+def _box_surface(n, idx):
+    """晶格外表面的三角形（每个边界小正方形两个），法线朝外，供碰撞检测使用"""
+    faces = []
+    for axis in range(3):
+        for side in (0, n - 1):
+            # (u, v, 外法线) 构成右手系：正侧 u×v = +axis，负侧交换 u、v
+            u, v = (axis + 1) % 3, (axis + 2) % 3
+            if side == 0:
+                u, v = v, u
+            for a in range(n - 1):
+                for b in range(n - 1):
+                    def corner(da, db):
+                        ijk = [0, 0, 0]
+                        ijk[axis], ijk[u], ijk[v] = side, a + da, b + db
+                        return idx(*ijk)
+                    p00, p10, p11, p01 = corner(0, 0), corner(1, 0), corner(1, 1), corner(0, 1)
+                    faces.append((p00, p10, p11))
+                    faces.append((p00, p11, p01))
+    return faces
+
+
+def lattice_tetrahedra(cells=1, count=1):
+    """
+    立方体晶格的四面体剖分：每个单元沿主对角线 (i,j,k)–(i+1,j+1,k+1) 分成 6 个四面体
+    顶点下标与 cube_lattice() 一致，返回 (6·cells³, 4) int32；
+    count > 1 时对应 scene_lattice() 拼接的 count 个晶格，下标逐个偏移 (cells+1)³
+    """
+    n = cells + 1
+    k, j, i = np.indices((cells, cells, cells)).reshape(3, -1)
+    base = i + n * j + n * n * k
+    dx, dy, dz = 1, n, n * n
+    # 从 v000 到 v111 的 6 条单调路径，每条路径对应一个四面体
+    paths = [(dx, dy), (dx, dz), (dy, dx), (dy, dz), (dz, dx), (dz, dy)]
+    tets = [
+        np.column_stack([base, base + a, base + a + b, base + dx + dy + dz])
+        for a, b in paths
+    ]
+    tets = np.stack(tets, axis=1).reshape(-1, 4)
+    return np.concatenate([tets + body * n ** 3 for body in range(count)]).astype(np.int32)
+
+
+def lattice_bodies(cfg):
+    """
+    lattice_count 个晶格沿 x（挤压方向）排成一排，间隔 1/4 个单元，整排以原点为中心；
+    奇数个缩小到 3/4，侧面顶点落在相邻晶格侧面三角形的内部，挤压时靠顶点–三角形碰撞互相顶住
+    """
+    base = cube_lattice(cfg.lattice_cells, cfg.lattice_size)
+    if cfg.lattice_count == 1:
+        return [base]
+    gap = cfg.lattice_size / cfg.lattice_cells / 4
+    scales = [1.0 if k % 2 == 0 else 0.75 for k in range(cfg.lattice_count)]
+    widths = cfg.lattice_size * np.array(scales)
+    left = -(widths.sum() + gap * (cfg.lattice_count - 1)) / 2
+    bodies = []
+    for k, (scale, width) in enumerate(zip(scales, widths)):
+        body = base.transformed(scale * np.eye(3), [left + width / 2, 0.0, 0.0])
+        bodies.append(MeshGeometry(body.positions, edges=body.edges, faces=body.faces,
+                                   names=[f"{name}.{k + 1}" for name in base.names]))
+        left += width + gap
+    return bodies
+
+
+def scene_lattice(cfg):
+    """多四面体演示用的晶格：lattice_count 个晶格拼成一个 MeshGeometry（顶点按晶格依次排列）"""
+    bodies = lattice_bodies(cfg)
+    return bodies[0] if len(bodies) == 1 else MeshGeometry.concatenate(bodies)
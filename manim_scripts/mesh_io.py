@@ -0,0 +1,556 @@
+# mesh_io.py
+"""
+三角形网格的导入 / 导出与简化（OBJ / PLY / STL）
+–––––––––––––––––––––––
+- 二进制 PLY / STL 用 np.memmap 按记录的结构化 dtype 直接映射文件，顶点 / 面整块取出，不逐行解析
+- ASCII OBJ（以及 ASCII PLY / STL）把同类行拼起来一次转换成数组；多边形面按扇形批量三角化
+- STL 没有共享顶点：按坐标的字节值去重焊接成带下标的网格
+- decimate() 用二次误差度量（QEM）批量折叠边：每轮对所有边一次算出折叠代价和最优位置，
+  取代价最低、互不相邻的一批同时折叠（拒绝会翻转法线的折叠），直到面数不超过目标
+- level_of_detail() 从细到粗逐级简化，得到若干个面数预算下的网格
+
+结果都是 geometry.MeshGeometry（只有 positions / faces，边按需用 face_edges 推出）：
+
+    mesh = fit_to_radius(load_mesh("scan.ply"), 1.2)
+    lods = level_of_detail(mesh, (500, 5000, 50000))
+    save_mesh("scan_5k.obj", lods[1])
+
+命令行：
+    python manim_scripts/mesh_io.py info scan.ply
+    python manim_scripts/mesh_io.py convert scan.ply scan_10k.stl --faces 10000
+"""
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from geometry import MeshGeometry
+
+PLY_TYPES = {
+    "char": "i1", "int8": "i1", "uchar": "u1", "uint8": "u1",
+    "short": "i2", "int16": "i2", "ushort": "u2", "uint16": "u2",
+    "int": "i4", "int32": "i4", "uint": "u4", "uint32": "u4",
+    "float": "f4", "float32": "f4", "double": "f8", "float64": "f8",
+}
+STL_RECORD = np.dtype([("normal", "<f4", 3), ("vertices", "<f4", (3, 3)), ("attribute", "<u2")])
+# 边界边的约束平面权重（相对面的平面），防止开放边界向内收缩
+BOUNDARY_WEIGHT = 100.0
+
+
+# ----------------------------------------------------------
+# 公共工具
+# ----------------------------------------------------------
+def fan_triangulate(indices, arity):
+    """
+    扁平的多边形顶点下标 + 每个多边形的顶点数 → (F, 3) 三角形
+    每个 k 边形拆成 k-2 个共用首顶点的三角形，保持多边形的先后顺序
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+    arity = np.asarray(arity, dtype=np.int64)
+    if np.any(arity < 3):
+        raise ValueError("多边形面至少需要 3 个顶点")
+    starts = np.concatenate([[0], np.cumsum(arity)[:-1]])
+    count = arity - 2
+    polygon = np.repeat(np.arange(len(arity)), count)
+    local = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count) + 1
+    first = starts[polygon]
+    return np.column_stack([indices[first], indices[first + local], indices[first + local + 1]])
+
+
+def _mesh(positions, faces):
+    """去掉退化（有重复顶点）的面，组装成 MeshGeometry"""
+    positions = np.asarray(positions, dtype=np.float64)
+    faces = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+    keep = (faces[:, 0] != faces[:, 1]) & (faces[:, 1] != faces[:, 2]) & (faces[:, 2] != faces[:, 0])
+    return MeshGeometry(positions, faces=faces[keep])
+
+
+def weld(corners):
+    """(M, 3) 角点坐标 → (不重复的顶点, 每个角点的顶点下标)；按坐标的字节值判等"""
+    corners = np.ascontiguousarray(corners)
+    keys = corners.view(np.dtype((np.void, corners.dtype.itemsize * 3))).ravel()
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    return corners[first], inverse.ravel()
+
+
+def fit_to_radius(mesh, radius=1.2):
+    """包围盒中心移到原点，整体缩放到离中心最远的顶点距离为 radius"""
+    p = mesh.positions
+    center = (p.min(axis=0) + p.max(axis=0)) / 2
+    extent = np.linalg.norm(p - center, axis=1).max()
+    return mesh.with_positions((p - center) * (radius / extent if extent > 0 else 1.0))
+
+
+# ----------------------------------------------------------
+# 读取
+# ----------------------------------------------------------
+def load_mesh(path):
+    """按扩展名读取 .obj / .ply / .stl"""
+    path = Path(path)
+    loaders = {".obj": load_obj, ".ply": load_ply, ".stl": load_stl}
+    suffix = path.suffix.lower()
+    if suffix not in loaders:
+        raise ValueError(f"不支持的网格格式 {suffix!r}（支持 {' / '.join(loaders)}）")
+    return loaders[suffix](path)
+
+
+_OBJ_SLASH = re.compile(r"/\S*")
+
+
+def load_obj(path):
+    """
+    ASCII OBJ：只读取 v 与 f 行；f 中的 v/vt/vn 只保留顶点下标，负下标相对顶点总数
+    （OBJ 规定相对当前已定义的顶点数，顶点都在面之前时二者一致）
+    """
+    vertex_lines, face_lines = [], []
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            if "#" in line:
+                # 行尾注释：# 之后的内容不参与解析
+                line = line[:line.index("#")] + "\n"
+            if line.startswith("v "):
+                vertex_lines.append(line[2:])
+            elif line.startswith("f "):
+                face_lines.append(line[2:])
+
+    values = np.array(" ".join(vertex_lines).split(), dtype=np.float64)
+    if len(vertex_lines) and len(values) % len(vertex_lines) == 0:
+        positions = values.reshape(len(vertex_lines), -1)[:, :3]  # 每行分量数相同（可带 w 或颜色）
+    else:
+        positions = np.array([line.split()[:3] for line in vertex_lines], dtype=np.float64).reshape(-1, 3)
+
+    rows = _OBJ_SLASH.sub("", "".join(face_lines)).splitlines()
+    arity = np.array([len(row.split()) for row in rows], dtype=np.int64)
+    indices = np.array(" ".join(rows).split(), dtype=np.int64)
+    indices = np.where(indices < 0, len(positions) + indices, indices - 1)
+    faces = indices.reshape(-1, 3) if np.all(arity == 3) else fan_triangulate(indices, arity)
+    return _mesh(positions, faces)
+
+
+def _ply_header(f):
+    """返回 (格式, [(元素名, 数量, [属性])], 数据起始偏移)；列表属性记为 (名, 计数类型, 元素类型)"""
+    if f.readline().strip() != b"ply":
+        raise ValueError("不是 PLY 文件")
+    fmt, elements = None, []
+    while True:
+        line = f.readline()
+        if not line:
+            raise ValueError("PLY 文件头缺少 end_header")
+        words = line.decode("ascii", errors="replace").split()
+        if not words or words[0] in ("comment", "obj_info"):
+            continue
+        if words[0] == "end_header":
+            return fmt, elements, f.tell()
+        if words[0] == "format":
+            fmt = words[1]
+        elif words[0] == "element":
+            elements.append((words[1], int(words[2]), []))
+        elif words[0] == "property":
+            if words[1] == "list":
+                elements[-1][2].append((words[4], PLY_TYPES[words[2]], PLY_TYPES[words[3]]))
+            else:
+                elements[-1][2].append((words[2], PLY_TYPES[words[1]]))
+
+
+def load_ply(path):
+    """PLY：binary_little_endian / binary_big_endian 用 memmap，ascii 整块解析；只读取 vertex 与 face"""
+    with open(path, "rb") as f:
+        fmt, elements, offset = _ply_header(f)
+    if fmt == "ascii":
+        return _load_ply_ascii(path, elements, offset)
+    if fmt not in ("binary_little_endian", "binary_big_endian"):
+        raise ValueError(f"未知的 PLY 格式 {fmt!r}")
+    endian = "<" if fmt == "binary_little_endian" else ">"
+
+    positions = faces = None
+    for name, count, props in elements:
+        if name == "face":
+            faces, offset = _ply_binary_faces(path, props, count, offset, endian)
+            continue
+        if any(len(p) == 3 for p in props):
+            if positions is not None and faces is not None:
+                break
+            raise ValueError(f"PLY 元素 {name!r} 含变长列表，无法定位其后的数据")
+        dtype = np.dtype([(p[0], endian + p[1]) for p in props])
+        if name == "vertex":
+            data = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(count,))
+            positions = np.column_stack([data["x"], data["y"], data["z"]]).astype(np.float64)
+        offset += dtype.itemsize * count
+    if positions is None or faces is None:
+        raise ValueError("PLY 文件缺少 vertex 或 face 元素")
+    return _mesh(positions, faces)
+
+
+def _ply_face_dtype(props, index_name, endian, n):
+    """边数为 n 的面记录对应的定长结构"""
+    fields = []
+    for p in props:
+        if p[0] == index_name:
+            fields += [("n", endian + p[1]), ("v", endian + p[2], n)]
+        else:
+            fields.append((p[0], endian + p[1]))
+    return np.dtype(fields)
+
+
+def _ply_binary_faces(path, props, count, offset, endian):
+    """
+    面记录按边数分段：从当前记录读出边数 n，假定后面的记录同为 n 边形，
+    按定长结构的步长取一段计数列，第一个边数不同的位置就是这一段的终点，整段一次取出；
+    段长不够时窗口逐次放大，全是三角形的文件只需对数次迭代，最后批量扇形三角化
+    """
+    index_name = next((p[0] for p in props if p[0] in ("vertex_indices", "vertex_index")), None)
+    if index_name is None or any(len(p) == 3 and p[0] != index_name for p in props):
+        raise ValueError("PLY face 元素应只有一个 vertex_indices 列表属性")
+    spec = next(p for p in props if p[0] == index_name)
+    count_type = np.dtype(endian + spec[1])
+    before = sum(np.dtype(p[1]).itemsize for p in props[:props.index(spec)])
+    if count == 0:
+        return np.zeros((0, 3), dtype=np.int64), offset
+
+    raw = np.memmap(path, dtype=np.uint8, mode="r", offset=offset)
+    dtypes, indices, arity = {}, [], []
+    pos = done = 0
+    window = 64
+    while done < count:
+        if pos + before + count_type.itemsize > len(raw):
+            raise ValueError("PLY 面数据不完整")
+        n = int(np.ndarray((), count_type, raw, pos + before))
+        dtype = dtypes.get(n)
+        if dtype is None:
+            dtype = dtypes[n] = _ply_face_dtype(props, index_name, endian, n)
+        available = min(count - done, (len(raw) - pos) // dtype.itemsize)
+        if available == 0:
+            raise ValueError("PLY 面数据不完整")
+        run = np.ndarray((min(window, available),), dtype, raw, pos)
+        changed = np.flatnonzero(run["n"] != n)
+        m = int(changed[0]) if len(changed) else len(run)
+        window = 4 * window if m == len(run) else max(64, 2 * m)
+        indices.append(run["v"][:m].reshape(-1))
+        arity.append(np.full(m, n, dtype=np.int64))
+        pos += m * dtype.itemsize
+        done += m
+
+    indices = np.concatenate(indices).astype(np.int64) if indices else np.zeros(0, dtype=np.int64)
+    arity = np.concatenate(arity) if arity else np.zeros(0, dtype=np.int64)
+    faces = indices.reshape(-1, 3) if np.all(arity == 3) else fan_triangulate(indices, arity)
+    return faces, offset + pos
+
+
+def _load_ply_ascii(path, elements, offset):
+    with open(path, "rb") as f:
+        f.seek(offset)
+        lines = f.read().decode("ascii", errors="replace").splitlines()
+    positions = faces = None
+    start = 0
+    for name, count, props in elements:
+        block = lines[start:start + count]
+        start += count
+        if name == "vertex":
+            names = [p[0] for p in props]
+            values = np.array(" ".join(block).split(), dtype=np.float64).reshape(count, len(props))
+            positions = values[:, [names.index(axis) for axis in "xyz"]]
+        elif name == "face":
+            # 假定 vertex_indices 是第一个属性
+            rows = [line.split() for line in block]
+            arity = np.array([int(row[0]) for row in rows], dtype=np.int64)
+            indices = np.array([v for row, n in zip(rows, arity) for v in row[1:1 + n]], dtype=np.int64)
+            faces = fan_triangulate(indices, arity)
+    if positions is None or faces is None:
+        raise ValueError("PLY 文件缺少 vertex 或 face 元素")
+    return _mesh(positions, faces)
+
+
+def load_stl(path):
+    """STL：文件大小等于 84 + 50·面数时按二进制 memmap 读取，否则按 ASCII 解析；随后焊接重复顶点"""
+    path = Path(path)
+    size = path.stat().st_size
+    count = None
+    if size >= 84:
+        with open(path, "rb") as f:
+            f.seek(80)
+            count = int(np.frombuffer(f.read(4), dtype="<u4")[0])
+    if count is not None and size == 84 + STL_RECORD.itemsize * count:
+        records = np.memmap(path, dtype=STL_RECORD, mode="r", offset=84, shape=(count,))
+        corners = np.array(records["vertices"], dtype=np.float32).reshape(-1, 3)
+    else:
+        text = path.read_text(encoding="ascii", errors="replace")
+        values = re.findall(r"^\s*vertex\s+(\S+)\s+(\S+)\s+(\S+)", text, flags=re.MULTILINE)
+        corners = np.array(values, dtype=np.float32).reshape(-1, 3)
+    positions, inverse = weld(corners)
+    return _mesh(positions, inverse.reshape(-1, 3))
+
+
+# ----------------------------------------------------------
+# 写出
+# ----------------------------------------------------------
+def save_mesh(path, mesh):
+    """按扩展名写出：.ply / .stl 为二进制（float32 坐标），.obj 为 ASCII"""
+    path = Path(path)
+    writers = {".obj": save_obj, ".ply": save_ply, ".stl": save_stl}
+    suffix = path.suffix.lower()
+    if suffix not in writers:
+        raise ValueError(f"不支持的网格格式 {suffix!r}（支持 {' / '.join(writers)}）")
+    writers[suffix](path, mesh)
+
+
+def save_ply(path, mesh):
+    header = (
+        "ply\nformat binary_little_endian 1.0\n"
+        f"element vertex {len(mesh)}\nproperty float x\nproperty float y\nproperty float z\n"
+        f"element face {mesh.num_faces}\nproperty list uchar int vertex_indices\nend_header\n"
+    )
+    vertices = np.empty(len(mesh), dtype=[("p", "<f4", 3)])
+    vertices["p"] = mesh.positions
+    faces = np.empty(mesh.num_faces, dtype=[("n", "u1"), ("v", "<i4", 3)])
+    faces["n"] = 3
+    faces["v"] = mesh.faces
+    with open(path, "wb") as f:
+        f.write(header.encode("ascii"))
+        vertices.tofile(f)
+        faces.tofile(f)
+
+
+def save_stl(path, mesh):
+    tri = mesh.face_points().astype(np.float32)
+    normal = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+    length = np.linalg.norm(normal, axis=1, keepdims=True)
+    records = np.zeros(mesh.num_faces, dtype=STL_RECORD)
+    records["normal"] = normal / np.where(length > 0, length, 1)
+    records["vertices"] = tri
+    with open(path, "wb") as f:
+        f.write(b"binary STL written by mesh_io.py".ljust(80, b" "))
+        f.write(np.uint32(mesh.num_faces).astype("<u4").tobytes())
+        records.tofile(f)
+
+
+def save_obj(path, mesh):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"# {len(mesh)} vertices, {mesh.num_faces} faces\n")
+        np.savetxt(f, mesh.positions, fmt="v %.9g %.9g %.9g")
+        np.savetxt(f, mesh.faces + 1, fmt="f %d %d %d")
+
+
+# ----------------------------------------------------------
+# QEM 简化
+# ----------------------------------------------------------
+def _scatter(index, values, n):
+    """values[k] 累加到第 index[k] 行：(M,) + (M, C) → (n, C)"""
+    return np.stack([np.bincount(index, weights=values[:, c], minlength=n) for c in range(values.shape[1])], axis=1)
+
+
+def vertex_quadrics(positions, faces):
+    """
+    每个顶点的误差二次型 Q (N, 4, 4)：相邻各面平面 pᵀp 的面积加权和，
+    开放边界再加一张过该边、垂直于所在面的约束平面
+    """
+    n = len(positions)
+    tri = positions[faces]
+    normal = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+    area2 = np.linalg.norm(normal, axis=1)
+    unit = normal / np.where(area2 > 0, area2, 1)[:, None]
+    plane = np.column_stack([unit, -np.einsum("ij,ij->i", unit, tri[:, 0])])
+    quad = (0.5 * area2)[:, None] * np.einsum("fi,fj->fij", plane, plane).reshape(-1, 16)
+    Q = _scatter(faces.ravel(), np.repeat(quad, 3, axis=0), n)
+
+    directed = faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)
+    keys = np.sort(directed, axis=1) @ np.array([n, 1], dtype=np.int64)
+    _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    boundary = counts[inverse.ravel()] == 1
+    if boundary.any():
+        a, b = positions[directed[boundary, 0]], positions[directed[boundary, 1]]
+        side = np.cross(b - a, unit[np.flatnonzero(boundary) // 3])
+        length = np.linalg.norm(side, axis=1)
+        side /= np.where(length > 0, length, 1)[:, None]
+        plane = np.column_stack([side, -np.einsum("ij,ij->i", side, a)])
+        quad = (BOUNDARY_WEIGHT * length ** 2)[:, None] * np.einsum("fi,fj->fij", plane, plane).reshape(-1, 16)
+        Q += _scatter(directed[boundary].ravel(), np.repeat(quad, 2, axis=0), n)
+    return Q.reshape(n, 4, 4)
+
+
+def _quadric_cost(Qe, p):
+    """齐次坐标下的 [p, 1]ᵀ·Q·[p, 1]（逐边）"""
+    Ap = np.einsum("eij,ej->ei", Qe[:, :3, :3], p)
+    return np.einsum("ei,ei->e", p, Ap + 2 * Qe[:, :3, 3]) + Qe[:, 3, 3]
+
+
+def _collapse_targets(Q, positions, edges):
+    """
+    每条边折叠后的位置与代价：3×3 系统可逆时取误差最小的最优点（余子式直接求逆），
+    否则在两端点与中点中取误差最小者
+    """
+    a, b = edges[:, 0], edges[:, 1]
+    Qe = Q[a] + Q[b]
+    A = Qe[:, :3, :3]
+    cof = np.cross(A[:, [1, 2, 0]], A[:, [2, 0, 1]])  # 第 i 行 = 第 i+1 行 × 第 i+2 行
+    det = np.einsum("ei,ei->e", A[:, 0], cof[:, 0])
+    scale = np.abs(A).max(axis=(1, 2)) ** 3
+    solvable = np.abs(det) > 1e-12 * np.maximum(scale, 1e-300)
+    best = (positions[a] + positions[b]) / 2
+    # A 对称：A⁻¹ = cofᵀ / det，最优点 A·p = −b
+    rhs = -Qe[solvable, :3, 3]
+    best[solvable] = np.einsum("eji,ej->ei", cof[solvable], rhs) / det[solvable, None]
+    cost = _quadric_cost(Qe, best)
+
+    fallback = np.flatnonzero(~solvable)
+    if len(fallback):
+        Qf = Qe[fallback]
+        for p in (positions[a[fallback]], positions[b[fallback]]):
+            c = _quadric_cost(Qf, p)
+            better = c < cost[fallback]
+            best[fallback[better]], cost[fallback[better]] = p[better], c[better]
+    return best, np.maximum(cost, 0.0)
+
+
+def _independent_collapses(candidates, faces, n, priority, rounds=4):
+    """
+    从候选边中选出互不影响的一批：任意一个面上至多出现一次折叠的顶点
+    每一轮取优先级的局部最小（与周围面上的所有候选比较），再把选中边周围面上的顶点排除，
+    剩下的候选进入下一轮；返回选中候选的下标（升序）
+    """
+    limit = np.iinfo(np.int64).max  # 没有候选时的占位优先级
+    active = np.ones(len(candidates), dtype=bool)
+    chosen = np.zeros(len(candidates), dtype=bool)
+    blocked = np.zeros(n, dtype=bool)
+    for _ in range(rounds):
+        rank = np.full(n, limit, dtype=np.int64)  # 每个顶点上优先级最高（数值最小）的候选
+        np.minimum.at(rank, candidates[active].ravel(), np.repeat(priority[active], 2))
+        # 面上三个顶点中的最高优先级 → 每个顶点周围所有面中的最高优先级
+        face_rank = rank[faces].min(axis=1)
+        around = np.full(n, limit, dtype=np.int64)
+        np.minimum.at(around, faces.ravel(), np.repeat(face_rank, 3))
+        chosen |= active & (around[candidates[:, 0]] == priority) & (around[candidates[:, 1]] == priority)
+
+        marked = np.zeros(n, dtype=bool)
+        marked[candidates[chosen].ravel()] = True
+        blocked[faces[marked[faces].any(axis=1)].ravel()] = True
+        active &= ~(blocked[candidates[:, 0]] | blocked[candidates[:, 1]])
+        if not active.any():
+            break
+    return np.flatnonzero(chosen)
+
+
+def _apply_collapses(positions, faces, Q, pairs, new_pos):
+    """
+    把每条边 (a, b) 的 b 并入 a、a 移到 new_pos，原地更新 positions 与 Q，返回 (新的面, 每次折叠是否执行)
+    会让周围某个保留下来的面法线翻转的折叠不执行；pairs 之间须互不影响（见 _independent_collapses）
+    """
+    n = len(positions)
+    owner = np.full(n, -1, dtype=np.int64)
+    owner[pairs[:, 0]] = owner[pairs[:, 1]] = np.arange(len(pairs))
+    face_owner = owner[faces].max(axis=1)
+    touched = np.flatnonzero(face_owner >= 0)
+    tri = positions[faces[touched]]
+    moved = tri.copy()
+    mask = owner[faces[touched]] >= 0
+    moved[mask] = np.broadcast_to(new_pos[face_owner[touched]][:, None], tri.shape)[mask]
+    old_n = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+    new_n = np.cross(moved[:, 1] - moved[:, 0], moved[:, 2] - moved[:, 0])
+    survives = mask.sum(axis=1) < 2  # 含整条折叠边的面会被删除，不参与检查
+    flipped = survives & (np.einsum("ij,ij->i", old_n, new_n) <= 0)
+    ok = np.ones(len(pairs), dtype=bool)
+    ok[face_owner[touched[flipped]]] = False
+    if not ok.any():
+        return faces, ok
+
+    a, b = pairs[ok, 0], pairs[ok, 1]
+    positions[a] = new_pos[ok]
+    Q[a] += Q[b]
+    remap = np.arange(n)
+    remap[b] = a
+    faces = remap[faces]
+    keep = (faces[:, 0] != faces[:, 1]) & (faces[:, 1] != faces[:, 2]) & (faces[:, 2] != faces[:, 0])
+    return faces[keep], ok
+
+
+def decimate(mesh, target_faces, batch_fraction=0.25, seed=0):
+    """
+    QEM 批量边折叠，把面数降到不超过 target_faces
+    每轮：所有边一次算出代价 → 取最便宜的 batch_fraction 作为候选，各自一个随机优先级 → 反复
+    「选出互不影响的一批 → 拒绝会让相邻面法线翻转的折叠 → 整块重映射面下标 → 去掉端点已变化的候选」，
+    候选用完后再重新计算代价
+    代价在空间上通常是平滑的，直接按代价排名取局部最小每次只能选出极少的边，所以用随机优先级（固定种子）；
+    同一批里按代价从低到高截取达到目标所需的数量
+    """
+    positions = mesh.positions.copy()
+    faces = mesh.faces.astype(np.int64)
+    if len(faces) <= target_faces:
+        return mesh
+    rng = np.random.default_rng(seed)
+    Q = vertex_quadrics(positions, faces)
+    n = len(positions)
+
+    while len(faces) > target_faces:
+        edge_keys = np.unique(np.sort(faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1) @ np.array([n, 1]))
+        edges = np.column_stack([edge_keys // n, edge_keys % n])
+        target, cost = _collapse_targets(Q, positions, edges)
+
+        # 候选：代价最低的若干条边，按代价排序
+        limit = max(1, min(len(edges), int(batch_fraction * len(edges))))
+        order = np.argpartition(cost, limit - 1)[:limit]
+        order = order[np.argsort(cost[order], kind="stable")]
+        candidates, targets, priority = edges[order], target[order], rng.permutation(limit)
+
+        progressed = False
+        while len(candidates) and len(faces) > target_faces:
+            chosen = _independent_collapses(candidates, faces, n, priority)
+            # 每次折叠大约去掉两个面
+            chosen = chosen[:max((len(faces) - target_faces + 1) // 2, 1)]
+            faces, ok = _apply_collapses(positions, faces, Q, candidates[chosen], targets[chosen])
+            if not ok.any():
+                break
+            progressed = True
+            # 端点参与过折叠（含被拒绝的）的候选代价已过期，留到下一轮重新计算
+            stale = np.zeros(n, dtype=bool)
+            stale[candidates[chosen].ravel()] = True
+            keep = ~(stale[candidates[:, 0]] | stale[candidates[:, 1]])
+            candidates, targets, priority = candidates[keep], targets[keep], priority[keep]
+        if not progressed:
+            break
+
+    used, inverse = np.unique(faces, return_inverse=True)
+    return MeshGeometry(positions[used], faces=inverse.reshape(-1, 3))
+
+
+def level_of_detail(mesh, budgets):
+    """按面数预算从细到粗逐级简化（每级从上一级继续），返回与 budgets 升序对应的网格列表"""
+    budgets = sorted(int(b) for b in budgets)
+    levels, current = [], mesh
+    for budget in reversed(budgets):
+        current = decimate(current, budget)
+        levels.append(current)
+    return levels[::-1]
+
+
+# ----------------------------------------------------------
+# 命令行
+# ----------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="网格导入 / 导出与 QEM 简化")
+    sub = parser.add_subparsers(dest="command", required=True)
+    info = sub.add_parser("info", help="读取网格并输出顶点 / 面数")
+    info.add_argument("path", type=Path)
+    convert = sub.add_parser("convert", help="转换格式，可同时简化到指定面数")
+    convert.add_argument("source", type=Path)
+    convert.add_argument("target", type=Path)
+    convert.add_argument("--faces", type=int, help="目标面数")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    path = args.path if args.command == "info" else args.source
+    mesh = load_mesh(path)
+    print(f"{path}: {mesh}，读取 {time.perf_counter() - start:.2f}s")
+    if args.command == "convert":
+        if args.faces:
+            start = time.perf_counter()
+            mesh = decimate(mesh, args.faces)
+            print(f"简化到 {mesh.num_faces} 个面，{time.perf_counter() - start:.2f}s")
+        save_mesh(args.target, mesh)
+        print(f"已写入 {args.target}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+# modal_recovery.py
+"""
+弹性恢复的模态解析解
+–––––––––––––––––––––––
+弹簧网络在静止形状处线性化：每根弹簧贡献 k·u·uᵀ（u 为静止方向），组装成 (3N, 3N) 稀疏刚度矩阵 K，
+与集中质量矩阵 M 一起做一次广义特征分解 K·φ = ω²·M·φ：
+    - 只要最低 k 个模态时用 scipy.sparse.linalg.eigsh 的 shift-invert（σ 取略小于 0，刚体模态也能收敛）
+    - 要全部模态且自由度不超过 DENSE_DOF 时才转成稠密矩阵调用 scipy.linalg.eigh
+模态基按 (K, M, 模态数) 的内容缓存，同一晶格配置重复构建时不再分解。
+
+松开外力后的位移 u(t) = Σ φᵢ·qᵢ(t)，每个模态是独立的阻尼振子（零初速度）：
+    qᵢ(t) = qᵢ(0)·e^(−ζωᵢt)·(cos ωdᵢt + ζωᵢ/ωdᵢ·sin ωdᵢt)，ωdᵢ = ωᵢ√(1 − ζ²)
+任意时刻都是闭式求值，不需要时间步进，长镜头和任意跳帧的代价都只与模态数有关。
+
+- 刚体模态（ω ≈ 0）没有回复力，动画要求回到初始形状，这里按最低非零频率的临界阻尼把它们衰减回原位
+- 物理频率通常远高于视频帧率：整体时间缩放到最低非零模态在整段动画里振动 cycles 个周期，
+  各模态之间的频率比不变；最后 TAIL 比例的时间内把残余振幅平滑收到 0，最后一帧精确落在静止形状上
+
+    response = ModalResponse.from_springs(rest, edges, stiffness, masses, deformed)
+    self.play(MorphAnimation(response, 0, bindings, rate_func=linear), run_time=2.5)
+"""
+import hashlib
+
+import numpy as np
+from scipy import sparse
+from scipy.linalg import eigh
+from scipy.sparse.linalg import eigsh
+
+RIGID_TOLERANCE = 1e-8
+TAIL = 0.1
+# modes=0（自动）时：自由度不超过 DENSE_DOF 取全部模态，否则只取最低 AUTO_MODES 个
+DENSE_DOF = 600
+AUTO_MODES = 48
+_BASIS_CACHE = {}
+_BASIS_CACHE_SIZE = 8
+
+
+def spring_stiffness_matrix(rest, edges, stiffness):
+    """弹簧网络在静止形状处的线性化刚度矩阵，(3N, 3N) CSR 稀疏矩阵"""
+    rest = np.asarray(rest, dtype=np.float64)
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    d = rest[edges[:, 1]] - rest[edges[:, 0]]
+    u = d / np.linalg.norm(d, axis=1)[:, None]
+    block = stiffness * np.einsum("ei,ej->eij", u, u)  # (E, 3, 3)
+
+    n = len(rest)
+    axis = np.arange(3)
+    rows, cols, values = [], [], []
+    for a, b, sign in ((0, 0, 1), (1, 1, 1), (0, 1, -1), (1, 0, -1)):
+        rows.append(np.broadcast_to(3 * edges[:, a, None, None] + axis[None, :, None], block.shape).ravel())
+        cols.append(np.broadcast_to(3 * edges[:, b, None, None] + axis[None, None, :], block.shape).ravel())
+        values.append((sign * block).ravel())
+    # COO 转 CSR 时重复的 (行, 列) 自动求和
+    return sparse.coo_matrix((np.concatenate(values), (np.concatenate(rows), np.concatenate(cols))),
+                             shape=(3 * n, 3 * n)).tocsr()
+
+
+def modal_basis(K, mass_diag, modes=0):
+    """
+    K·φ = ω²·M·φ 的最低若干阶：返回 (ω² 升序, φ)，φᵀ·M·φ = I；结果按输入内容缓存（只读）
+    modes=0 为自动（见 DENSE_DOF / AUTO_MODES），modes 不小于自由度数时取全部
+    """
+    K = sparse.csr_matrix(K)
+    dof = K.shape[0]
+    if modes <= 0:
+        modes = dof if dof <= DENSE_DOF else AUTO_MODES
+    modes = min(modes, dof)
+
+    digest = hashlib.sha1()
+    for array in (K.indptr, K.indices, K.data, mass_diag):
+        digest.update(np.ascontiguousarray(array).tobytes())
+    key = (digest.hexdigest(), dof, modes)
+    if key in _BASIS_CACHE:
+        return _BASIS_CACHE[key]
+
+    if modes >= dof - 1:
+        # ARPACK 要求 k < 自由度数，全部模态走稠密分解
+        omega2, phi = eigh(K.toarray(), np.diag(mass_diag), subset_by_index=(0, modes - 1))
+    else:
+        # shift-invert：σ 略小于 0 使 K - σM 正定，离 σ 最近的就是最低的 modes 个（含 ω² ≈ 0 的刚体模态）
+        sigma = -1e-6 * np.mean(K.diagonal() / mass_diag)
+        omega2, phi = eigsh(K, k=modes, M=sparse.diags(mass_diag), sigma=sigma, which="LM")
+        order = np.argsort(omega2)
+        omega2, phi = omega2[order], phi[:, order]
+        phi /= np.sqrt(np.einsum("ik,i,ik->k", phi, mass_diag, phi))
+    omega2.setflags(write=False)
+    phi.setflags(write=False)
+    if len(_BASIS_CACHE) >= _BASIS_CACHE_SIZE:
+        _BASIS_CACHE.pop(next(iter(_BASIS_CACHE)))
+    _BASIS_CACHE[key] = omega2, phi
+    return omega2, phi
+
+
+class ModalResponse:
+    """
+    阻尼模态响应；提供与 morph.MorphChain 相同的接口（keyframes / num_segments / at），
+    可直接交给 MorphAnimation 播放，t ∈ [0, 1] 为整段动画的归一化时间
+    """
+
+    def __init__(self, rest, deformed, K, masses, damping_ratio=0.2, cycles=3.0, modes=0):
+        if not 0 < damping_ratio < 1:
+            raise ValueError(f"damping_ratio 应在 (0, 1) 内，当前为 {damping_ratio}")
+        self.rest = np.asarray(rest, dtype=np.float64)
+        deformed = np.asarray(deformed, dtype=np.float64)
+        mass_diag = np.repeat(np.asarray(masses, dtype=np.float64), 3)
+        omega2, phi = modal_basis(K, mass_diag, modes)  # φᵀMφ = I
+
+        # 刚体模态的 ω² 理论上为 0，数值上是相对最大特征值很小的正负数
+        elastic = omega2 > RIGID_TOLERANCE * max(omega2.max(initial=0.0), 1e-300)
+        self.elastic = elastic
+        self.omega = np.sqrt(np.where(elastic, omega2, 0.0))
+        self.phi = phi
+        # 初始模态坐标 q(0) = φᵀ·M·u0；截断模态时未覆盖的部分直接按刚体方式衰减
+        u0 = (deformed - self.rest).ravel()
+        self.q0 = phi.T @ (mass_diag * u0)
+        self.remainder = u0 - phi @ self.q0
+
+        fundamental = self.omega[elastic].min() if elastic.any() else 2 * np.pi
+        # 时间缩放：最低非零模态在 t ∈ [0, 1] 内振动 cycles 个周期
+        self.time_scale = 2 * np.pi * cycles / fundamental
+        self.zeta = damping_ratio
+        self.rigid_rate = fundamental
+
+        self.keyframes = np.stack([deformed, self.rest])
+        self.buffer = np.empty_like(self.rest)
+        self._q = np.empty_like(self.q0)
+
+    @classmethod
+    def from_springs(cls, rest, edges, stiffness, masses, deformed, **kwargs):
+        return cls(rest, deformed, spring_stiffness_matrix(rest, edges, stiffness), masses, **kwargs)
+
+    @property
+    def num_segments(self):
+        return 1
+
+    @property
+    def num_modes(self):
+        return len(self.omega)
+
+    def modal_coordinates(self, t):
+        """t（归一化时间）处各模态的坐标 q(t)，O(modes)"""
+        s = t * self.time_scale
+        w, z = self.omega, self.zeta
+        wd = w * np.sqrt(1 - z * z)
+        decay = np.exp(-z * w * s)
+        elastic = decay * (np.cos(wd * s) + z * w / np.where(wd > 0, wd, 1) * np.sin(wd * s))
+        r = self.rigid_rate * s
+        rigid = np.exp(-r) * (1 + r)  # 临界阻尼
+        np.multiply(self.q0, np.where(self.elastic, elastic, rigid), out=self._q)
+        return self._q, rigid
+
+    def at(self, segment, t):
+        if t >= 1.0:
+            np.copyto(self.buffer, self.rest)
+            return self.buffer
+        q, rigid = self.modal_coordinates(t)
+        displacement = self.phi @ q + rigid * self.remainder
+        if t > 1 - TAIL:
+            x = (1 - t) / TAIL
+            displacement *= x * x * (3 - 2 * x)
+        np.add(self.rest, displacement.reshape(-1, 3), out=self.buffer)
+        return self.buffer
@@ -0,0 +1,248 @@
+# morph.py
+"""
+同拓扑网格的形变目标（morph target）插值
+–––––––––––––––––––––––
+Transform(old, new) 每次都要新建一整套 mobject，再逐个子对象对齐点、复制家族、插值。
+同一网格的连续形变（抬头 → 扭头 → 转头、重力 → 挤压 → 恢复）拓扑不变，只有顶点坐标在变：
+
+- MorphChain 把各关键帧的顶点坐标存成一块 (K, N, 3) 数组，预先算好相邻帧的差，
+  每帧只做 lerp(src, dst, t) 写入同一块预分配缓冲区
+- 绑定（binding）把 mobject 的 points / 颜色换成共享数组的行视图，每帧对整块数组写一次：
+    FaceBinding     三角形 Polygon ↔ 网格面
+    PointBinding    圆点、标签等随某个顶点平移
+    SegmentBinding  线段 / 圆柱随一条边旋转、沿轴向拉伸（截面半径不变）
+- MorphAnimation 播放链上的某一段，段与段之间不创建任何中间 mobject
+
+    chain = MorphChain([rest, gravity, compressed, rest])
+    bindings = [PointBinding(dots, range(n)), SegmentBinding(lines, mesh.edges)]
+    for k in range(chain.num_segments):
+        self.play(MorphAnimation(chain, k, bindings))
+"""
+import numpy as np
+from manim import Animation
+
+# Polygon(a, b, c) 的 12 个贝塞尔控制点：三段直线 a→b、b→c、c→a，每段 [起点, 1/3, 2/3, 终点]
+_THIRDS = np.array([[1, 0], [2 / 3, 1 / 3], [1 / 3, 2 / 3], [0, 1]])
+TRIANGLE_WEIGHTS = np.zeros((12, 3))
+for _seg, (_p, _q) in enumerate(((0, 1), (1, 2), (2, 0))):
+    TRIANGLE_WEIGHTS[4 * _seg:4 * _seg + 4, _p] += _THIRDS[:, 0]
+    TRIANGLE_WEIGHTS[4 * _seg:4 * _seg + 4, _q] += _THIRDS[:, 1]
+
+
+class MorphChain:
+    """若干同形状的关键帧坐标；at(k, t) 返回第 k 段在 t 处的插值（写入共享缓冲区）"""
+
+    def __init__(self, keyframes):
+        self.keyframes = np.ascontiguousarray(np.stack([np.asarray(k, dtype=np.float64) for k in keyframes]))
+        if len(self.keyframes) < 2 or self.keyframes.ndim != 3 or self.keyframes.shape[2] != 3:
+            raise ValueError(f"至少需要两个 (N, 3) 关键帧，实际形状为 {self.keyframes.shape}")
+        self.deltas = np.diff(self.keyframes, axis=0)
+        self.buffer = np.empty_like(self.keyframes[0])
+
+    @property
+    def num_segments(self):
+        return len(self.deltas)
+
+    def at(self, segment, t):
+        np.multiply(self.deltas[segment], t, out=self.buffer)
+        self.buffer += self.keyframes[segment]
+        return self.buffer
+
+
+class _MemberBinding:
+    """把若干 mobject 家族中带点的成员拼成一块 points / fill / stroke 数组，成员持有其中的视图"""
+
+    def __init__(self, mobjects):
+        self.mobjects = list(mobjects)
+
+    def _collect(self):
+        members, owners = [], []
+        for k, mob in enumerate(self.mobjects):
+            for member in mob.family_members_with_points():
+                members.append(member)
+                owners.append(k)
+        self.members = members
+        sizes = [len(m.points) for m in members]
+        self.row_owner = np.repeat(np.array(owners, dtype=np.int64), sizes)
+        self.points = np.concatenate([m.points for m in members]) if members else np.zeros((0, 3))
+        self.fill, self.fill_owner = self._stack_colors("fill_rgbas", owners)
+        self.stroke, self.stroke_owner = self._stack_colors("stroke_rgbas", owners)
+
+        offset = fill_offset = stroke_offset = 0
+        for member in members:
+            n, nf, ns = len(member.points), len(member.fill_rgbas), len(member.stroke_rgbas)
+            member.points = self.points[offset:offset + n]
+            member.fill_rgbas = self.fill[fill_offset:fill_offset + nf]
+            member.stroke_rgbas = self.stroke[stroke_offset:stroke_offset + ns]
+            offset, fill_offset, stroke_offset = offset + n, fill_offset + nf, stroke_offset + ns
+
+    def _stack_colors(self, attr, owners):
+        arrays = [getattr(m, attr) for m in self.members]
+        owner = np.repeat(np.array(owners, dtype=np.int64), [len(a) for a in arrays])
+        return (np.concatenate(arrays) if arrays else np.zeros((0, 4))), owner
+
+    def set_rgb(self, rgb):
+        """rgb: (len(mobjects), 3)，透明度保持不变"""
+        self.fill[:, :3] = rgb[self.fill_owner]
+        self.stroke[:, :3] = rgb[self.stroke_owner]
+
+
+class FaceBinding:
+    """
+    三角形 Polygon 与网格面一一对应：points 按直边三角形的 12 个控制点重写，
+    fill / stroke 颜色各为 (F, 4) 数组的一行
+    """
+
+    def __init__(self, polygons, faces):
+        self.mobjects = list(polygons)
+        self.faces = np.asarray(faces)
+        if len(self.mobjects) != len(self.faces):
+            raise ValueError(f"Polygon 数量 {len(self.mobjects)} 与面数 {len(self.faces)} 不一致")
+        self.points = np.empty((len(self.faces), 12, 3))
+        self.fill = np.empty((len(self.faces), 4))
+        self.stroke = np.empty((len(self.faces), 4))
+
+    def bind(self, positions):
+        np.einsum("kj,fjd->fkd", TRIANGLE_WEIGHTS, positions[self.faces], out=self.points)
+        for i, polygon in enumerate(self.mobjects):
+            self.fill[i] = polygon.fill_rgbas[0]
+            self.stroke[i] = polygon.stroke_rgbas[0]
+            polygon.points = self.points[i]
+            polygon.fill_rgbas = self.fill[i:i + 1]
+            polygon.stroke_rgbas = self.stroke[i:i + 1]
+
+    def update(self, positions):
+        np.einsum("kj,fjd->fkd", TRIANGLE_WEIGHTS, positions[self.faces], out=self.points)
+
+    def set_rgb(self, rgb):
+        self.fill[:, :3] = rgb
+        self.stroke[:, :3] = rgb
+
+
+class PointBinding(_MemberBinding):
+    """第 k 个 mobject 随顶点 vertices[k] 平移，保持绑定时的相对位置"""
+
+    def __init__(self, mobjects, vertices):
+        super().__init__(mobjects)
+        self.vertices = np.asarray(vertices, dtype=np.int64)
+        if len(self.vertices) != len(self.mobjects):
+            raise ValueError(f"mobject 数量 {len(self.mobjects)} 与顶点数 {len(self.vertices)} 不一致")
+
+    def bind(self, positions):
+        self._collect()
+        self.row_vertex = self.vertices[self.row_owner]
+        self.offsets = self.points - positions[self.row_vertex]
+
+    def update(self, positions):
+        np.add(self.offsets, positions[self.row_vertex], out=self.points)
+
+
+class SegmentBinding(_MemberBinding):
+    """
+    第 k 个 mobject 跟随边 edges[k]：以起点为原点，沿轴向按长度比拉伸，
+    再用 Rodrigues 公式把绑定时的方向转到当前方向，全部边一次批量计算
+    """
+
+    def __init__(self, mobjects, edges):
+        super().__init__(mobjects)
+        self.edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        if len(self.edges) != len(self.mobjects):
+            raise ValueError(f"mobject 数量 {len(self.mobjects)} 与边数 {len(self.edges)} 不一致")
+
+    def bind(self, positions):
+        self._collect()
+        d = positions[self.edges[:, 1]] - positions[self.edges[:, 0]]
+        self.rest_lengths = np.linalg.norm(d, axis=1)
+        if np.any(self.rest_lengths <= 1e-12):
+            raise ValueError("存在长度为 0 的边，无法确定方向")
+        self.rest_dirs = d / self.rest_lengths[:, None]
+        self.row_start = self.edges[self.row_owner, 0]
+        self.local = self.points - positions[self.row_start]
+
+    def transforms(self, positions):
+        """每条边的线性变换 (E, 3, 3)：先沿原方向拉伸，再旋转到新方向"""
+        d = positions[self.edges[:, 1]] - positions[self.edges[:, 0]]
+        length = np.linalg.norm(d, axis=1)
+        u0 = self.rest_dirs
+        u = d / np.where(length > 1e-12, length, 1)[:, None]
+        u = np.where((length > 1e-12)[:, None], u, u0)
+
+        # R = I + [v]× + [v]×² / (1 + c)，v = u0 × u，c = u0 · u
+        v = np.cross(u0, u)
+        c = np.einsum("ij,ij->i", u0, u)
+        vx = np.zeros((len(u0), 3, 3))
+        vx[:, 0, 1], vx[:, 0, 2], vx[:, 1, 2] = -v[:, 2], v[:, 1], -v[:, 0]
+        vx[:, 1, 0], vx[:, 2, 0], vx[:, 2, 1] = v[:, 2], -v[:, 1], v[:, 0]
+        flipped = c < -1 + 1e-9
+        R = np.eye(3) + vx + np.einsum("eij,ejk->eik", vx, vx) / np.where(flipped, 1, 1 + c)[:, None, None]
+        if flipped.any():
+            # 反向时绕任一垂直轴转 180°：R = 2ppᵀ - I
+            p = np.cross(u0[flipped], np.where(np.abs(u0[flipped, :1]) < 0.9, [[1.0, 0, 0]], [[0, 1.0, 0]]))
+            p /= np.linalg.norm(p, axis=1)[:, None]
+            R[flipped] = 2 * np.einsum("ei,ej->eij", p, p) - np.eye(3)
+
+        # 轴向拉伸 S = I + (ratio - 1) u0 u0ᵀ
+        ratio = length / self.rest_lengths
+        S = np.eye(3) + (ratio - 1)[:, None, None] * np.einsum("ei,ej->eij", u0, u0)
+        return np.einsum("eij,ejk->eik", R, S)
+
+    def update(self, positions):
+        M = self.transforms(positions)
+        np.einsum("rij,rj->ri", M[self.row_owner], self.local, out=self.points)
+        self.points += positions[self.row_start]
+
+
+class MorphAnimation(Animation):
+    """
+    播放 chain 的第 segment 段；开始时各绑定重新抓取 mobject 的数组视图，
+    之后每帧：一次 lerp → 每个绑定一次整块写入 → on_frame(positions, t)（如按应变着色）
+
+    group 缺省时不另建顶层 VGroup（Scene 会把它追加到 mobjects 末尾，改变层叠顺序且播放后残留），
+    而是原地驱动被绑定的 mobject：开始时把场景中排在最前的那个作为动画的 mobject，
+    Scene 据此把它及之后的对象都当作运动对象逐帧重绘
+    """
+
+    def __init__(self, chain, segment, bindings, group=None, on_frame=None, **kwargs):
+        if not 0 <= segment < chain.num_segments:
+            raise ValueError(f"segment 应在 [0, {chain.num_segments}) 内，当前为 {segment}")
+        self.chain = chain
+        self.segment = segment
+        self.bindings = list(bindings)
+        self.on_frame = on_frame
+        self.in_place = group is None
+        if self.in_place:
+            self.bound = [mob for binding in self.bindings for mob in binding.mobjects]
+            if not self.bound:
+                raise ValueError("没有可驱动的 mobject")
+            group = self.bound[0]
+            # 标记为 introducer，Scene 不再自动 add(self.mobject)，由 _setup_scene 处理
+            kwargs.setdefault("introducer", True)
+        super().__init__(group, **kwargs)
+
+    def _setup_scene(self, scene):
+        if not self.in_place or scene is None:
+            return super()._setup_scene(scene)
+        present = {id(mob) for mob in scene.get_mobject_family_members()}
+        missing = [mob for mob in self.bound if id(mob) not in present]
+        if missing:
+            scene.add(*missing)
+        order = {id(mob): i for i, mob in enumerate(scene.get_mobject_family_members())}
+        self.mobject = min(self.bound, key=lambda mob: order[id(mob)])
+
+    def begin(self):
+        start = self.chain.keyframes[self.segment]
+        for binding in self.bindings:
+            binding.bind(start)
+        super().begin()
+
+    def create_starting_mobject(self):
+        # 插值只依赖关键帧数组，不需要复制整组 mobject
+        return self.mobject
+
+    def interpolate_mobject(self, alpha):
+        t = self.rate_func(alpha)
+        positions = self.chain.at(self.segment, t)
+        for binding in self.bindings:
+            binding.update(positions)
+        if self.on_frame is not None:
+            self.on_frame(positions, t)
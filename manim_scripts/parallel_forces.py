@@ -0,0 +1,181 @@
+# parallel_forces.py
+"""
+分块并行的内力计算
+–––––––––––––––––––––––
+大晶格的 SpringNetwork / CorotationalFEM 在长时间烘焙时只用满一个核。这里：
+
+1. 按静止形状的单元重心做 Morton 排序，把单元切成固定大小的空间块
+   （块的划分只取决于 chunk_elements，与 worker 数无关）
+2. 每块只对自己用到的顶点做局部散射累加，得到 (块内顶点, 3) 的部分力
+3. 归约：只属于一个块的内部顶点直接写入；块边界上的共享顶点按块序号依次累加
+
+每块的计算和归约顺序都是固定的，因此 workers = 1、2、8 … 的结果逐位相同。
+
+后端：
+    thread   线程池（NumPy 的 einsum / SVD / bincount 会释放 GIL）
+    process  进程池，顶点坐标与部分力放在 multiprocessing.shared_memory 里，不经过 pickle
+"""
+import copy
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+BACKENDS = ("thread", "process")
+
+
+def morton_order(points, bits=10):
+    """三维点按 Morton（Z 序）编码排序，空间上相邻的点在序列里也相邻"""
+    points = np.asarray(points, dtype=np.float64)
+    lo, hi = points.min(axis=0), points.max(axis=0)
+    scale = np.where(hi > lo, (2 ** bits - 1) / np.where(hi > lo, hi - lo, 1), 0)
+    q = ((points - lo) * scale).astype(np.uint64)
+    code = np.zeros(len(points), dtype=np.uint64)
+    for bit in range(bits):
+        for axis in range(3):
+            code |= ((q[:, axis] >> np.uint64(bit)) & np.uint64(1)) << np.uint64(3 * bit + axis)
+    return np.argsort(code, kind="stable")
+
+
+class _Chunk:
+    __slots__ = ("start", "stop", "vertices", "local", "offset")
+
+    def __init__(self, start, stop, vertices, local, offset):
+        self.start, self.stop = start, stop
+        self.vertices = vertices  # 块内用到的全局顶点下标（升序）
+        self.local = local        # 单元顶点 → 块内局部下标，展平
+        self.offset = offset      # 部分力在共享缓冲区中的起始行
+
+
+def _chunk_forces(model, chunk, x, out):
+    f = model.element_forces(x, chunk.start, chunk.stop).reshape(-1, 3)
+    n = len(chunk.vertices)
+    for axis in range(3):
+        out[:, axis] = np.bincount(chunk.local, weights=f[:, axis], minlength=n)
+
+
+# 进程后端：每个 worker 在初始化时拿到模型和共享内存，只按块下标取任务
+_worker = {}
+
+
+def _process_init(model, chunks, x_name, x_shape, out_name, out_shape):
+    x_shm = shared_memory.SharedMemory(name=x_name)
+    out_shm = shared_memory.SharedMemory(name=out_name)
+    _worker.update(
+        model=model, chunks=chunks, x_shm=x_shm, out_shm=out_shm,
+        x=np.ndarray(x_shape, dtype=np.float64, buffer=x_shm.buf),
+        out=np.ndarray(out_shape, dtype=np.float64, buffer=out_shm.buf),
+    )
+
+
+def _process_task(index):
+    chunk = _worker["chunks"][index]
+    _chunk_forces(_worker["model"], chunk, _worker["x"],
+                  _worker["out"][chunk.offset:chunk.offset + len(chunk.vertices)])
+    return index
+
+
+class ParallelForces:
+    """
+    包装 soft_body 中的力学模型，forces(x) 与 model.forces(x) 用法相同
+    单元重排作用在模型的浅拷贝（self.model）上，传入的模型及其 tets / edges 顺序保持不变
+    用完需 close()（或用 with 语句），进程后端会释放共享内存
+    """
+
+    def __init__(self, model, workers=1, backend="thread", chunk_elements=2048):
+        if backend not in BACKENDS:
+            raise ValueError(f"未知后端：{backend}（可选 {', '.join(BACKENDS)}）")
+        if chunk_elements < 1:
+            raise ValueError("chunk_elements 至少为 1")
+        # reorder_elements 换成新数组而不是原地修改，浅拷贝即可与调用方的模型互不影响
+        model = copy.copy(model)
+        self.model = model
+        self.masses = model.masses
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.backend = backend
+
+        # 单元按重心的空间顺序重排，再切成固定大小的块
+        indices = model.element_indices()
+        model.reorder_elements(morton_order(model.rest[indices].mean(axis=1)))
+        self.num_vertices = len(model.rest)
+        self.chunks = []
+        offset = 0
+        for start in range(0, model.num_elements, chunk_elements):
+            stop = min(start + chunk_elements, model.num_elements)
+            elements = model.element_indices(start, stop).ravel()
+            vertices, local = np.unique(elements, return_inverse=True)
+            self.chunks.append(_Chunk(start, stop, vertices, local.astype(np.int64), offset))
+            offset += len(vertices)
+
+        # 只被一个块引用的顶点为内部顶点，其余为块边界上的共享顶点
+        owners = np.zeros(self.num_vertices, dtype=np.int64)
+        for chunk in self.chunks:
+            owners[chunk.vertices] += 1
+        self._interior = [owners[chunk.vertices] == 1 for chunk in self.chunks]
+
+        self._x = None
+        self._out = None
+        self._shms = []
+        self._pool = None
+        if self.workers > 1 and len(self.chunks) > 1:
+            if backend == "thread":
+                self._pool = ThreadPoolExecutor(self.workers)
+            else:
+                self._open_process_pool(offset)
+        if self._out is None:
+            self._out = np.empty((offset, 3))
+
+    def _open_process_pool(self, rows):
+        x_shm = shared_memory.SharedMemory(create=True, size=max(1, self.num_vertices * 3 * 8))
+        out_shm = shared_memory.SharedMemory(create=True, size=max(1, rows * 3 * 8))
+        self._shms = [x_shm, out_shm]
+        self._x = np.ndarray((self.num_vertices, 3), dtype=np.float64, buffer=x_shm.buf)
+        self._out = np.ndarray((rows, 3), dtype=np.float64, buffer=out_shm.buf)
+        self._pool = ProcessPoolExecutor(
+            self.workers, initializer=_process_init,
+            initargs=(self.model, self.chunks, x_shm.name, self._x.shape, out_shm.name, self._out.shape),
+        )
+
+    def _part(self, chunk):
+        return self._out[chunk.offset:chunk.offset + len(chunk.vertices)]
+
+    def forces(self, x):
+        x = np.ascontiguousarray(x, dtype=np.float64)
+        if self._pool is None:
+            for chunk in self.chunks:
+                _chunk_forces(self.model, chunk, x, self._part(chunk))
+        elif self.backend == "thread":
+            list(self._pool.map(lambda c: _chunk_forces(self.model, c, x, self._part(c)), self.chunks))
+        else:
+            self._x[:] = x
+            list(self._pool.map(_process_task, range(len(self.chunks))))
+        return self._reduce()
+
+    def _reduce(self):
+        f = np.zeros((self.num_vertices, 3))
+        for chunk, interior in zip(self.chunks, self._interior):
+            part = self._part(chunk)
+            f[chunk.vertices[interior]] = part[interior]
+        # 共享顶点按块序号依次累加，顺序固定
+        for chunk, interior in zip(self.chunks, self._interior):
+            shared = ~interior
+            f[chunk.vertices[shared]] += self._part(chunk)[shared]
+        return f
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        if self._shms:
+            self._x = self._out = None  # 先释放对共享内存的引用
+        for shm in self._shms:
+            shm.close()
+            shm.unlink()
+        self._shms = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,515 @@
+# preview_renderer.py
+"""
+快速预览渲染器（纯 NumPy，CPU 即可）
+–––––––––––––––––––––––
+不经过 Cairo，直接把三角形 / 线段 / 顶点从网格数组光栅化到 NumPy 帧缓冲：
+    - 与 ThreeDCamera 相同的 phi/theta 旋转和透视投影
+    - 三角形按包围盒大小分桶，整桶一次性计算重心坐标并填充，平面着色
+    - z-buffer 深度测试，线段与顶点带少量深度偏移画在面上方
+时间轴复刻 TriangleMesh3D / TetrahedronPhysics 的几何阶段，读取同一份场景配置，
+各阶段的形状取自场景模块本身（mesh_levels、stage_positions、recovery_response、应变配色），
+model_path、recovery_mode、strain_colors 与正式渲染一致；不含文字、顶点标签和面的半透明，
+适合在正式 Cairo 渲染前快速拖动查看动画。
+
+用法：
+    python manim_scripts/preview_renderer.py TriangleMesh3D -o videos/preview/TriangleMesh3D.mp4
+    python manim_scripts/preview_renderer.py TetrahedronPhysics --frames /tmp/frames --height 480
+    python manim_scripts/preview_renderer.py TriangleMesh3D --benchmark
+"""
+import argparse
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+from manim import BLUE, GREY, RED, TEAL, YELLOW, ManimColor, config
+from manim.utils.rate_functions import smooth
+from manim.utils.space_ops import rotation_about_z, rotation_matrix
+
+from frame_pipeline import FramePipeline
+from geometry import face_edges, lattice_tetrahedra, scene_lattice
+from scene_config import load_scene_config
+from strain_colors import ColorLUT, face_area_change, face_areas
+from tetrahedron_physics import TETRA_NETWORK, recovery_response, stage_positions, strain_coloring
+from triangle_mesh_3d import OCTA_MESH, SPHERE_PALETTE, TETRA_MESH, mesh_levels
+
+DEGREES = np.pi / 180
+RIGHT = np.array([1.0, 0.0, 0.0])
+
+
+def rgb(color):
+    return np.asarray(ManimColor(color).to_rgb(), dtype=np.float32)
+
+
+# ----------------------------------------------------------
+# 相机与光栅化
+# ----------------------------------------------------------
+class PreviewCamera:
+    """与 manim ThreeDCamera（非指数投影）一致的旋转 + 透视"""
+
+    def __init__(self, width, height, frame_height=8.0, focal_distance=20.0, zoom=1.0):
+        self.width, self.height = width, height
+        self.frame_height = frame_height
+        self.frame_width = frame_height * width / height
+        self.focal_distance = focal_distance
+        self.zoom = zoom
+        self.set_orientation(0, -90 * DEGREES)
+
+    def set_orientation(self, phi, theta, gamma=0.0):
+        result = np.identity(3)
+        for matrix in (rotation_about_z(-theta - 90 * DEGREES), rotation_matrix(-phi, RIGHT), rotation_about_z(gamma)):
+            result = matrix @ result
+        self.rotation = result
+
+    def to_camera(self, points):
+        return np.asarray(points, dtype=np.float64) @ self.rotation.T
+
+    def project(self, cam_points):
+        """相机坐标 → (像素坐标 (N, 2), 深度 (N,)，深度越小越近)"""
+        zs = cam_points[:, 2]
+        denom = self.focal_distance - zs
+        factor = np.where(denom > 0, self.focal_distance / np.where(denom > 0, denom, 1), 1e6) * self.zoom
+        px = np.empty((len(cam_points), 2))
+        px[:, 0] = cam_points[:, 0] * factor * (self.width / self.frame_width) + self.width / 2
+        px[:, 1] = self.height / 2 - cam_points[:, 1] * factor * (self.height / self.frame_height)
+        return px, -zs
+
+
+class Rasterizer:
+    """带 z-buffer 的平面着色光栅器，帧缓冲预先分配、逐帧复用"""
+
+    # 每批光栅化的采样点上限，控制临时数组大小
+    max_batch_samples = 1 << 20
+    line_depth_bias = 1e-3
+
+    def __init__(self, width, height, background=(0, 0, 0)):
+        self.width, self.height = width, height
+        self.background = np.asarray(background, dtype=np.uint8)
+        self.color = np.empty((height, width, 3), dtype=np.uint8)
+        self.depth = np.empty(height * width, dtype=np.float32)
+        self._flat_color = self.color.reshape(-1, 3)
+
+    def clear(self):
+        self.color[:] = self.background
+        self.depth.fill(np.inf)
+
+    def _resolve(self, pix, z, colors):
+        """同一像素多个片元取最近者，再与 z-buffer 比较后写入"""
+        if len(pix) == 0:
+            return
+        order = np.lexsort((z, pix))
+        pix_sorted = pix[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = pix_sorted[1:] != pix_sorted[:-1]
+        sel = order[first]
+        pix, z = pix[sel], z[sel]
+        visible = z < self.depth[pix]
+        pix = pix[visible]
+        self.depth[pix] = z[visible]
+        self._flat_color[pix] = colors[sel][visible]
+
+    def draw_triangles(self, px, depth, faces, colors):
+        """px: (N, 2) 像素坐标；depth: (N,)；faces: (F, 3)；colors: (F, 3) uint8"""
+        faces = np.asarray(faces, dtype=np.int64)
+        if len(faces) == 0:
+            return
+        tri = px[faces]                      # (F, 3, 2)
+        tz = depth[faces].astype(np.float32)  # (F, 3)
+        lo = np.floor(tri.min(axis=1)).astype(np.int64)
+        hi = np.ceil(tri.max(axis=1)).astype(np.int64)
+        lo = np.maximum(lo, 0)
+        hi = np.minimum(hi, [self.width - 1, self.height - 1])
+        size = hi - lo + 1
+        a, b, c = tri[:, 0], tri[:, 1], tri[:, 2]
+        area = (b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0])
+        keep = (size[:, 0] > 0) & (size[:, 1] > 0) & (np.abs(area) > 1e-9)
+        if not keep.any():
+            return
+
+        # 按包围盒尺寸（向上取 2 的幂）分桶，同一桶的三角形共享采样网格
+        bucket_w = 1 << np.ceil(np.log2(np.maximum(size[:, 0], 1))).astype(np.int64)
+        bucket_h = 1 << np.ceil(np.log2(np.maximum(size[:, 1], 1))).astype(np.int64)
+        keys = np.where(keep, bucket_w * (1 << 20) + bucket_h, -1)
+        for key in np.unique(keys[keys >= 0]):
+            idx = np.nonzero(keys == key)[0]
+            bw, bh = int(key >> 20), int(key & ((1 << 20) - 1))
+            per_batch = max(1, self.max_batch_samples // (bw * bh))
+            gy, gx = np.mgrid[0:bh, 0:bw]
+            for start in range(0, len(idx), per_batch):
+                self._fill_batch(idx[start:start + per_batch], gx, gy, lo, hi, a, b, c, area, tz, colors)
+
+    def _fill_batch(self, idx, gx, gy, lo, hi, a, b, c, area, tz, colors):
+        xi = lo[idx, 0, None, None] + gx     # (T, bh, bw) 整数像素
+        yi = lo[idx, 1, None, None] + gy
+        x = xi + 0.5
+        y = yi + 0.5
+        a, b, c = a[idx], b[idx], c[idx]
+        inv_area = 1.0 / area[idx, None, None]
+
+        def edge(p, q):
+            return ((q[:, 0, None, None] - p[:, 0, None, None]) * (y - p[:, 1, None, None])
+                    - (q[:, 1, None, None] - p[:, 1, None, None]) * (x - p[:, 0, None, None]))
+
+        l0 = edge(b, c) * inv_area
+        l1 = edge(c, a) * inv_area
+        l2 = 1.0 - l0 - l1
+        inside = (l0 >= 0) & (l1 >= 0) & (l2 >= 0)
+        inside &= (xi <= hi[idx, 0, None, None]) & (yi <= hi[idx, 1, None, None])
+        t, r, s = np.nonzero(inside)
+        if len(t) == 0:
+            return
+        z = l0[t, r, s] * tz[idx[t], 0] + l1[t, r, s] * tz[idx[t], 1] + l2[t, r, s] * tz[idx[t], 2]
+        pix = yi[t, r, s] * self.width + xi[t, r, s]
+        self._resolve(pix, z.astype(np.float32), colors[idx[t]])
+
+    def draw_lines(self, px, depth, segments, colors, width=1):
+        """segments: (E, 2) 顶点下标；colors: (E, 3) uint8；width: 像素线宽"""
+        segments = np.asarray(segments, dtype=np.int64)
+        if len(segments) == 0:
+            return
+        p0, p1 = px[segments[:, 0]], px[segments[:, 1]]
+        z0, z1 = depth[segments[:, 0]], depth[segments[:, 1]]
+        # 屏幕外过远的线段（透视发散）不采样
+        n = np.ceil(np.abs(p1 - p0).max(axis=1)).astype(np.int64) + 1
+        n = np.minimum(n, 4 * (self.width + self.height))
+        seg = np.repeat(np.arange(len(segments)), n)
+        starts = np.cumsum(n) - n
+        t = (np.arange(n.sum()) - np.repeat(starts, n)) / np.maximum(np.repeat(n, n) - 1, 1)
+        pts = p0[seg] + (p1[seg] - p0[seg]) * t[:, None]
+        z = z0[seg] + (z1[seg] - z0[seg]) * t - self.line_depth_bias
+        self._splat(pts, z, colors[seg], width)
+
+    def draw_points(self, px, depth, colors, radius=2):
+        self._splat(px, depth - 2 * self.line_depth_bias, colors, 2 * radius + 1, round_brush=True)
+
+    def _splat(self, pts, z, colors, width, round_brush=False):
+        r = (width - 1) // 2
+        offsets = np.stack(np.mgrid[-r:r + 1, -r:r + 1], axis=-1).reshape(-1, 2)
+        if round_brush:
+            offsets = offsets[(offsets ** 2).sum(axis=1) <= r * r + r]
+        xi = (np.floor(pts[:, 0])[:, None] + offsets[None, :, 1]).astype(np.int64).ravel()
+        yi = (np.floor(pts[:, 1])[:, None] + offsets[None, :, 0]).astype(np.int64).ravel()
+        rep = len(offsets)
+        ok = (xi >= 0) & (xi < self.width) & (yi >= 0) & (yi < self.height)
+        pix = (yi * self.width + xi)[ok]
+        self._resolve(pix, np.repeat(z, rep)[ok].astype(np.float32), np.repeat(colors, rep, axis=0)[ok])
+
+
+# ----------------------------------------------------------
+# 预览时间轴
+# ----------------------------------------------------------
+@dataclass
+class PreviewMesh:
+    vertices: np.ndarray
+    faces: np.ndarray = None
+    face_colors: np.ndarray = None
+    edges: np.ndarray = None
+    edge_colors: np.ndarray = None
+    edge_width: int = 1
+    point_color: np.ndarray = None  # (3,) 或逐顶点 (N, 3)
+    point_radius: int = 0
+
+
+@dataclass
+class Shot:
+    """一个镜头：duration 秒内 frame(alpha) 返回 (phi, theta, [PreviewMesh])"""
+    duration: float
+    frame: object
+    name: str = ""
+
+
+@dataclass
+class Timeline:
+    shots: list = field(default_factory=list)
+
+    def add(self, duration, frame, name=""):
+        self.shots.append(Shot(duration, frame, name))
+
+    @property
+    def duration(self):
+        return sum(shot.duration for shot in self.shots)
+
+    def frames(self, fps):
+        for shot in self.shots:
+            count = max(1, int(round(shot.duration * fps)))
+            for k in range(count):
+                yield shot.frame(k / max(count - 1, 1))
+
+
+def axes_mesh(x_range, y_range, z_range):
+    vertices = np.array([
+        [x_range[0], 0, 0], [x_range[1], 0, 0],
+        [0, y_range[0], 0], [0, y_range[1], 0],
+        [0, 0, z_range[0]], [0, 0, z_range[1]],
+    ], dtype=np.float64)
+    return PreviewMesh(vertices, edges=np.array([[0, 1], [2, 3], [4, 5]]),
+                       edge_colors=np.tile(rgb(GREY), (3, 1)), edge_width=1)
+
+
+def _colors(colors):
+    return np.array([rgb(c) for c in colors], dtype=np.float32)
+
+
+def _lerp(a, b, alpha):
+    return a + (b - a) * alpha
+
+
+def _stage(a, b):
+    """a → b 的平滑插值：alpha ∈ [0, 1] → (顶点坐标, 缓动后的 t)"""
+    def positions(alpha):
+        t = smooth(alpha)
+        return _lerp(a, b, t), t
+    return positions
+
+
+def _response(response):
+    """与场景的 MorphAnimation(response, 0, rate_func=linear) 相同：alpha 直接作为归一化时间"""
+    return lambda alpha: (response.at(0, alpha), alpha)
+
+
+def _reveal(count, alpha, reveal_fraction):
+    """前 reveal_fraction 的时间里逐个出现"""
+    if reveal_fraction <= 0:
+        return count
+    return int(np.clip(np.ceil(alpha / reveal_fraction * count), 1, count))
+
+
+def _orbit_shots(timeline, start, moves, extra):
+    """摄像机环绕：依次平滑移动到 moves 中的 (phi, theta)"""
+    current = start
+    for target in moves:
+        def frame(alpha, a=current, b=target):
+            s = smooth(alpha)
+            return _lerp(a[0], b[0], s), _lerp(a[1], b[1], s), extra()
+        timeline.add(2, frame, "camera")
+        current = target
+    return current
+
+
+def mesh3d_timeline(cfg):
+    timeline = Timeline()
+    view = (60 * DEGREES, -30 * DEGREES)
+    axes = axes_mesh((-3, 3), (-3, 3), (-2, 3))
+
+    def solid(vertices, faces, colors, count=None):
+        faces = np.asarray(faces)[:count]
+        return PreviewMesh(np.asarray(vertices, dtype=np.float64), faces=faces, face_colors=colors[:count],
+                           edges=face_edges(faces), edge_colors=None, edge_width=1)
+
+    for mesh, face_rt in ((TETRA_MESH, cfg.tetra_face_run_time), (OCTA_MESH, cfg.octa_face_run_time)):
+        vertices, faces, colors = mesh.positions, mesh.faces, _colors(mesh.face_colors)
+        reveal_time = len(faces) * face_rt
+        duration = reveal_time + 2
+
+        def frame(alpha, v=vertices, f=faces, c=colors, frac=reveal_time / duration):
+            return (*view, [axes, solid(v, f, c, _reveal(len(f), alpha, frac))])
+        timeline.add(duration, frame, f"{len(faces)} faces")
+
+    # 细分球体或外部模型的各级 LOD，最后一级参与变形
+    palette = _colors(SPHERE_PALETTE)
+    for sphere, index in mesh_levels(cfg):
+        timeline.add(2, lambda alpha, m=sphere, c=palette[index]: (*view, [axes, solid(m.positions, m.faces, c)]),
+                     f"{sphere.num_faces} faces")
+    rest, sphere_faces, sphere_colors = sphere.positions, sphere.faces, palette[index]
+
+    # strain_colors 开启时与场景的 StrainDeform 一样，从第一次变形起按面积变化着色
+    if cfg.strain_colors:
+        lut = ColorLUT(cfg.strain_colormap, -cfg.strain_range, cfg.strain_range)
+        rest_areas = face_areas(rest, sphere_faces)
+
+        def deformed(positions):
+            colors = lut.rgb(face_area_change(positions, sphere_faces, rest_areas)).astype(np.float32)
+            return [axes, solid(positions, sphere_faces, colors)]
+    else:
+        def deformed(positions):
+            return [axes, solid(positions, sphere_faces, sphere_colors)]
+
+    angle = cfg.rotate_degrees * DEGREES
+    rotate = np.array([[np.cos(angle), -np.sin(angle), 0], [np.sin(angle), np.cos(angle), 0], [0, 0, 1]])
+    stretched = rest * np.array(cfg.stretch_scale)
+    compressed = stretched * np.array(cfg.compress_scale)
+    rotated = compressed @ rotate.T
+    current = rest
+    for target, hold in ((stretched, 1), (compressed, 1), (rotated, 2)):
+        def deform(alpha, p=_stage(current, target)):
+            return (*view, deformed(p(alpha)[0]))
+        timeline.add(cfg.deform_run_time, deform, "deform")
+        timeline.add(hold, lambda alpha, b=target: (*view, deformed(b)), "hold")
+        current = target
+
+    final = current
+    _orbit_shots(timeline, view, [(30 * DEGREES, 0), (60 * DEGREES, np.pi), (60 * DEGREES, np.pi / 2)],
+                 lambda: deformed(final))
+    return timeline
+
+
+def physics_timeline(cfg):
+    timeline = Timeline()
+    view = (70 * DEGREES, -45 * DEGREES)
+    axes = axes_mesh((-4, 4), (-4, 4), (-2, 4))
+
+    def network(vertices, edges, edge_color, point_color, edge_count=None, point_count=None, width=2):
+        vertices = np.asarray(vertices, dtype=np.float64)
+        edges = np.asarray(edges)[:edge_count]
+        return PreviewMesh(vertices[:point_count] if edge_count == 0 else vertices, edges=edges,
+                           edge_colors=np.tile(rgb(edge_color), (len(edges), 1)), edge_width=width,
+                           point_color=rgb(point_color), point_radius=3)
+
+    # 单四面体：顶点 → 弹簧 → 受力变形 → 恢复
+    rest, tetra_edges = TETRA_NETWORK.positions, TETRA_NETWORK.edges
+    build = 4 * 0.5 + len(tetra_edges) * 0.3
+    timeline.add(build + 1.5, lambda alpha: (*view, [axes, network(
+        rest, tetra_edges, BLUE, RED, _reveal(len(tetra_edges), alpha, build / (build + 1.5)))]), "tetra")
+    pushed = rest.copy()
+    pushed[0] += np.array(cfg.force_vec)
+    modal = cfg.recovery_mode == "modal"
+    stages = [(_stage(rest, pushed), pushed)]
+    if modal:
+        stages.append((_response(recovery_response(rest, pushed, np.array([[0, 1, 2, 3]]), cfg)), rest))
+    else:
+        stages.append((_stage(pushed, rest), rest))
+    for positions, b in stages:
+        timeline.add(cfg.deform_run_time, lambda alpha, p=positions: (*view, [axes, network(
+            p(alpha)[0], tetra_edges, BLUE, RED)]), "deform")
+        timeline.add(1, lambda alpha, b=b: (*view, [axes, network(b, tetra_edges, BLUE, RED)]), "hold")
+
+    # 多四面体立方体：重力 → 碰撞压缩 → 恢复
+    lattice_mesh = scene_lattice(cfg)
+    lattice, conns = lattice_mesh.positions, lattice_mesh.edges
+    build = len(conns) * cfg.edge_run_time
+    timeline.add(build + 1, lambda alpha: (*view, [axes, network(
+        lattice, conns, TEAL, YELLOW, _reveal(len(conns), alpha, build / (build + 1)))]), "lattice")
+    gravity, compressed = stage_positions(lattice_mesh, cfg)
+    if modal:
+        tets = lattice_tetrahedra(cfg.lattice_cells, cfg.lattice_count)
+        recovery = _response(recovery_response(lattice, compressed, tets, cfg))
+    else:
+        recovery = _stage(compressed, lattice)
+
+    # strain_colors 开启时与场景的 lattice_morph 一样按应变着色：重力段从原配色渐变过来，恢复段再渐变回去
+    strain_rgb = strain_coloring(lattice_mesh, cfg) if cfg.strain_colors else None
+    base = (rgb(YELLOW), rgb(TEAL))
+
+    def lattice_network(positions, w=1.0):
+        """w 为原配色的混合权重，w = 1 时就是未着色的晶格"""
+        if strain_rgb is None or w >= 1:
+            return network(positions, conns, TEAL, YELLOW)
+        point_rgb, edge_rgb = (c + w * (b - c) for c, b in zip(strain_rgb(positions), base))
+        return PreviewMesh(np.asarray(positions, dtype=np.float64), edges=conns,
+                           edge_colors=edge_rgb.astype(np.float32), edge_width=2,
+                           point_color=point_rgb.astype(np.float32), point_radius=3)
+
+    for positions, target, run_time, hold, fade in (
+        (_stage(lattice, gravity), gravity, cfg.gravity_run_time, 1.5, lambda t: 1 - t),
+        (_stage(gravity, compressed), compressed, cfg.compression_run_time, 1, lambda t: 0.0),
+        (recovery, lattice, cfg.recovery_run_time, 1.5, lambda t: t),
+    ):
+        def stage(alpha, p=positions, fade=fade):
+            x, t = p(alpha)
+            return (*view, [axes, lattice_network(x, fade(t))])
+        timeline.add(run_time, stage, "stage")
+        timeline.add(hold, lambda alpha, b=target, w=fade(1.0): (*view, [axes, lattice_network(b, w)]), "hold")
+
+    _orbit_shots(timeline, view, [(45 * DEGREES, 0), (75 * DEGREES, np.pi), (75 * DEGREES, np.pi / 2)],
+                 lambda: [axes, lattice_network(lattice)])
+    return timeline
+
+
+TIMELINES = {
+    "TriangleMesh3D": ("triangle_mesh_3d", mesh3d_timeline),
+    "TetrahedronPhysics": ("tetrahedron_physics", physics_timeline),
+}
+
+
+# ----------------------------------------------------------
+# 渲染
+# ----------------------------------------------------------
+class PreviewRenderer:
+    light = np.array([0.3, 0.5, 0.8]) / np.linalg.norm([0.3, 0.5, 0.8])
+
+    def __init__(self, width, height):
+        self.camera = PreviewCamera(width, height)
+        self.raster = Rasterizer(width, height)
+
+    def render(self, phi, theta, meshes):
+        """渲染一帧，返回光栅器的颜色缓冲本身（每次 render 复用同一块数组，需要保留时自行拷贝）"""
+        self.camera.set_orientation(phi, theta)
+        raster = self.raster
+        raster.clear()
+        for mesh in meshes:
+            cam = self.camera.to_camera(mesh.vertices)
+            px, depth = self.camera.project(cam)
+            if mesh.faces is not None and len(mesh.faces):
+                faces = np.asarray(mesh.faces, dtype=np.int64)
+                a, b, c = cam[faces[:, 0]], cam[faces[:, 1]], cam[faces[:, 2]]
+                normals = np.cross(b - a, c - a)
+                norms = np.linalg.norm(normals, axis=1)
+                shade = 0.35 + 0.65 * np.abs(normals @ self.light) / np.where(norms > 0, norms, 1)
+                colors = np.clip(mesh.face_colors * shade[:, None] * 255, 0, 255).astype(np.uint8)
+                raster.draw_triangles(px, depth, faces, colors)
+            if mesh.edges is not None and len(mesh.edges):
+                edge_colors = mesh.edge_colors
+                if edge_colors is None:
+                    edge_colors = np.ones((len(mesh.edges), 3), dtype=np.float32)
+                raster.draw_lines(px, depth, mesh.edges, (edge_colors * 255).astype(np.uint8), mesh.edge_width)
+            if mesh.point_radius:
+                colors = np.broadcast_to((mesh.point_color * 255).astype(np.uint8), (len(px), 3))
+                raster.draw_points(px, depth, colors, mesh.point_radius)
+        return raster.color
+
+
+def ffmpeg_rgb_command(path, width, height, fps):
+    return [
+        config.ffmpeg_executable, "-y", "-loglevel", "error",
+        "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{width}x{height}", "-r", str(fps), "-i", "-",
+        "-an", "-vcodec", "libx264", "-pix_fmt", "yuv420p", str(path),
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="NumPy 快速预览渲染")
+    parser.add_argument("scene", choices=sorted(TIMELINES))
+    parser.add_argument("-o", "--output", type=Path, help="输出 MP4（需要 ffmpeg）")
+    parser.add_argument("--frames", type=Path, help="输出 PNG 帧序列目录")
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--benchmark", action="store_true", help="只渲染不输出，报告帧率")
+    args = parser.parse_args(argv)
+
+    section, build = TIMELINES[args.scene]
+    timeline = build(load_scene_config(section))
+    height = args.height - args.height % 2
+    width = int(round(height * 16 / 9)) // 2 * 2
+    renderer = PreviewRenderer(width, height)
+
+    pipeline = None
+    output = args.output
+    if output is None and args.frames is None and not args.benchmark:
+        output = Path("videos") / "preview" / f"{args.scene}.mp4"
+    if output is not None:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        pipeline = FramePipeline((height, width, 3), queue_size=4)
+        pipeline.open(ffmpeg_rgb_command(output, width, height, args.fps))
+    if args.frames is not None:
+        from PIL import Image
+        args.frames.mkdir(parents=True, exist_ok=True)
+
+    start = time.perf_counter()
+    count = 0
+    for phi, theta, meshes in timeline.frames(args.fps):
+        frame = renderer.render(phi, theta, meshes)
+        if pipeline is not None:
+            pipeline.submit(frame)
+        if args.frames is not None:
+            Image.fromarray(frame).save(args.frames / f"{args.scene}{count:05d}.png")
+        count += 1
+    elapsed = time.perf_counter() - start
+    if pipeline is not None:
+        pipeline.close()
+    print(f"{args.scene}: {count} 帧 {width}x{height}，{elapsed:.2f}s（{count / elapsed:.1f} fps）")
+    if output is not None:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,378 @@
+# render_cache.py
+"""
+整场景渲染结果缓存
+–––––––––––––––––––––––
+键 = hash(场景模块及其本地依赖的源码, manim 版本, 画质参数, 场景参数)
+命中时直接取出成品 MP4 / 帧序列；未命中才调用 manim 渲染并入库。
+
+存储布局（内容寻址）：
+    <root>/objects/ab/abcdef...   按内容 sha256 存放的文件
+    <root>/entries/<key>.json     键 → 文件列表，mtime 作为最近使用时间
+
+用法：
+    python manim_scripts/render_cache.py render manim_scripts/triangle_scenes.py TriangleDecomposition -ql
+    python manim_scripts/render_cache.py render manim_scripts/triangle_mesh_3d.py TriangleMesh3D -qh --preset production
+    python manim_scripts/render_cache.py --max-bytes 10G prune
+    python manim_scripts/render_cache.py info
+"""
+import argparse
+import ast
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from dataclasses import asdict
+from importlib import metadata
+from pathlib import Path
+
+from scene_config import SCENE_SECTIONS, load_all, load_scene_config
+
+DEFAULT_ROOT = Path(os.environ.get("LESSON_CACHE_DIR", Path.home() / ".cache" / "manim_lessons"))
+DEFAULT_MAX_BYTES = 20 * 1024 ** 3
+# 未被任何条目引用的对象在这段时间内不回收：可能是其它进程正在入库、尚未写入条目
+ORPHAN_GRACE_SECONDS = 3600
+
+# 只影响预览、不影响输出内容的参数，不参与键计算
+_PREVIEW_FLAGS = {"-p", "--preview", "-f", "--show_in_file_browser"}
+# 渲染产物所在的 media 子目录；其余（Tex、texts、partial_movie_files）是中间文件
+_OUTPUT_DIRS = ("videos", "images")
+
+
+def _sha256_file(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def local_dependencies(scene_file):
+    """场景文件及其递归 import 的同目录模块（frame_pipeline.py 等）"""
+    scene_file = Path(scene_file).resolve()
+    seen, stack = {}, [scene_file]
+    while stack:
+        path = stack.pop()
+        if path in seen:
+            continue
+        source = path.read_bytes()
+        seen[path] = source
+        for node in ast.walk(ast.parse(source, filename=str(path))):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                candidate = path.parent / (name.split(".")[0] + ".py")
+                if candidate.is_file():
+                    stack.append(candidate.resolve())
+    return seen
+
+
+def manim_version():
+    try:
+        return metadata.version("manim")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def normalize_manim_args(args):
+    normalized = []
+    for arg in args:
+        if arg in _PREVIEW_FLAGS:
+            continue
+        # -pql → -ql
+        match = re.fullmatch(r"-[pf]+(q[lmhpk])", arg)
+        normalized.append(f"-{match.group(1)}" if match else arg)
+    return normalized
+
+
+def cache_key(scene_file, scene_name, manim_args=(), params=None):
+    scene_file = Path(scene_file).resolve()
+    sources = {
+        str(path.relative_to(scene_file.parent)) if path.is_relative_to(scene_file.parent) else str(path):
+            hashlib.sha256(source).hexdigest()
+        for path, source in local_dependencies(scene_file).items()
+    }
+    payload = {
+        "scene": scene_name,
+        "sources": dict(sorted(sources.items())),
+        "manim": manim_version(),
+        "args": normalize_manim_args(manim_args),
+        "params": dict(sorted((params or {}).items())),
+    }
+    blob = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()
+
+
+class RenderCache:
+    """内容寻址的本地渲染缓存，按最近使用时间淘汰到 max_bytes 以内"""
+
+    def __init__(self, root=DEFAULT_ROOT, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.objects_dir = self.root / "objects"
+        self.entries_dir = self.root / "entries"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.entries_dir.mkdir(parents=True, exist_ok=True)
+
+    # ----------------------------------------------------------
+    # 查询 / 入库
+    # ----------------------------------------------------------
+    def lookup(self, key):
+        entry_path = self.entries_dir / f"{key}.json"
+        try:
+            entry = json.loads(entry_path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if not all(self._object_path(f["object"]).is_file() for f in entry["files"]):
+            return None
+        os.utime(entry_path)  # 标记为最近使用
+        return entry
+
+    def store(self, key, files, meta=None):
+        """
+        files: {相对路径: 源文件路径}
+        单个条目就超过 max_bytes 时不入库，返回 None（调用方直接使用源文件）
+        """
+        size = sum(Path(src).stat().st_size for src in files.values())
+        if size > self.max_bytes:
+            print(f"警告：渲染结果 {size / 1024 ** 2:.1f} MiB 超过缓存上限 "
+                  f"{self.max_bytes / 1024 ** 2:.0f} MiB，不写入缓存", file=sys.stderr)
+            return None
+        records = []
+        for name, src in sorted(files.items()):
+            digest = _sha256_file(src)
+            target = self._object_path(digest)
+            if not target.is_file():
+                target.parent.mkdir(parents=True, exist_ok=True)
+                tmp = _temp_path(target.parent)
+                shutil.copyfile(src, tmp)
+                os.replace(tmp, target)
+            records.append({"name": name, "object": digest, "size": target.stat().st_size})
+        entry = {"key": key, "files": records, "created": time.time(), **(meta or {})}
+        tmp = _temp_path(self.entries_dir)
+        tmp.write_text(json.dumps(entry, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp, self.entries_dir / f"{key}.json")
+        self.evict(keep=key)
+        return entry
+
+    def materialize(self, entry, output_dir):
+        """把缓存条目取出到 output_dir；单文件平铺，帧序列放在以场景命名的子目录"""
+        sources = {record["name"]: self._object_path(record["object"]) for record in entry["files"]}
+        return place_outputs(sources, output_dir, entry.get("scene", entry["key"][:12]))
+
+    # ----------------------------------------------------------
+    # 淘汰
+    # ----------------------------------------------------------
+    def total_bytes(self):
+        return sum(self._object_sizes().values())
+
+    def _object_sizes(self):
+        sizes = {}
+        for obj in self.objects_dir.glob("*/*"):
+            if obj.suffix != ".tmp":
+                try:
+                    sizes[obj.name] = obj.stat().st_size
+                except FileNotFoundError:
+                    continue
+        return sizes
+
+    def _entry_objects(self):
+        """[(条目路径, 引用的对象集合)]，按最近使用时间从旧到新"""
+        entries = []
+        for entry_path in self.entries_dir.glob("*.json"):
+            try:
+                mtime = entry_path.stat().st_mtime
+                entry = json.loads(entry_path.read_text(encoding="utf-8"))
+            except (FileNotFoundError, json.JSONDecodeError):
+                continue
+            entries.append((mtime, entry_path, {f["object"] for f in entry["files"]}))
+        entries.sort(key=lambda item: item[0])
+        return [(path, objects) for _, path, objects in entries]
+
+    def evict(self, max_bytes=None, keep=None):
+        """
+        按条目最近使用时间从旧到新删除，直到对象总大小不超过上限；键为 keep 的条目（刚入库的）不删除
+        总大小只统计一次，之后按引用计数减去真正被释放的对象
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        sizes = self._object_sizes()
+        total = sum(sizes.values())
+        if total <= max_bytes:
+            return 0
+        entries = self._entry_objects()
+        refs = Counter(digest for _, objects in entries for digest in objects)
+
+        # 先回收孤立对象（中断的入库留下的），再淘汰旧条目
+        cutoff = time.time() - ORPHAN_GRACE_SECONDS
+        for digest in [d for d in sizes if refs[d] == 0]:
+            path = self._object_path(digest)
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    total -= sizes.pop(digest)
+            except FileNotFoundError:
+                sizes.pop(digest)
+
+        removed = 0
+        for entry_path, objects in entries:
+            if total <= max_bytes:
+                break
+            if entry_path.stem == keep:
+                continue
+            entry_path.unlink(missing_ok=True)
+            removed += 1
+            for digest in objects:
+                refs[digest] -= 1
+                if refs[digest] == 0:
+                    self._object_path(digest).unlink(missing_ok=True)
+                    total -= sizes.pop(digest, 0)
+        return removed
+
+    def _object_path(self, digest):
+        return self.objects_dir / digest[:2] / digest
+
+
+def _temp_path(directory):
+    """同目录下唯一的临时文件名（多个进程同时入库时互不覆盖），写完后 os.replace 到正式位置"""
+    with tempfile.NamedTemporaryFile(dir=directory, suffix=".tmp", delete=False) as f:
+        return Path(f.name)
+
+
+def place_outputs(sources, output_dir, scene_name):
+    """sources: {相对路径: 文件}；单文件平铺到 output_dir，多个文件（帧序列）放在以场景命名的子目录"""
+    output_dir = Path(output_dir)
+    if len(sources) > 1:
+        output_dir = output_dir / scene_name
+    output_dir.mkdir(parents=True, exist_ok=True)
+    written = []
+    for name, src in sources.items():
+        target = output_dir / Path(name).name
+        if target.exists():
+            target.unlink()
+        try:
+            os.link(src, target)
+        except OSError:
+            shutil.copyfile(src, target)
+        written.append(target)
+    return written
+
+
+def resolved_scene_config(scene_name, environ):
+    """场景实际读取到的配置（合并预设、TOML 与覆盖项之后），作为键的一部分"""
+    kwargs = {"environ": environ}
+    section = SCENE_SECTIONS.get(scene_name)
+    if section is None:
+        return {name: asdict(cfg) for name, cfg in load_all(**kwargs).items()}
+    return {section: asdict(load_scene_config(section, **kwargs))}
+
+
+def model_digests(config):
+    """配置中引用的外部模型文件（model_path）按内容参与缓存键"""
+    digests = {
+        section: _sha256_file(values["model_path"])
+        for section, values in config.items() if values.get("model_path")
+    }
+    return {"models": digests} if digests else {}
+
+
+def render(scene_file, scene_name, manim_args, params, cache, output_dir, environ=None):
+    environ = dict(os.environ if environ is None else environ)
+    config = resolved_scene_config(scene_name, environ)
+    params = {**params, "config": config, **model_digests(config)}
+    key = cache_key(scene_file, scene_name, manim_args, params)
+    entry = cache.lookup(key)
+    if entry is not None:
+        print(f"缓存命中 {key[:12]}：{scene_name}")
+        return cache.materialize(entry, output_dir)
+
+    print(f"缓存未命中 {key[:12]}：渲染 {scene_name}")
+    with tempfile.TemporaryDirectory(prefix="manim_cache_") as media_dir:
+        command = [
+            sys.executable, "-m", "manim", "render",
+            *normalize_manim_args(manim_args),
+            "--media_dir", media_dir,
+            str(scene_file), scene_name,
+        ]
+        subprocess.run(command, check=True, env=environ)
+        files = {}
+        for sub in _OUTPUT_DIRS:
+            for path in sorted(Path(media_dir, sub).rglob("*")):
+                if path.is_file() and "partial_movie_files" not in path.parts:
+                    files[str(path.relative_to(media_dir))] = path
+        if not files:
+            raise RuntimeError(f"manim 没有产生 {scene_name} 的输出文件")
+        entry = cache.store(key, files, meta={"scene": scene_name, "args": list(manim_args), "params": params})
+        if entry is None:
+            # 超过缓存上限，不入库：直接从临时 media 目录复制出来
+            return place_outputs(dict(sorted(files.items())), output_dir, scene_name)
+    return cache.materialize(entry, output_dir)
+
+
+def _parse_size(text):
+    units = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4}
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)\s*([KMGT]?)i?B?", text.strip(), re.IGNORECASE)
+    if not match:
+        raise argparse.ArgumentTypeError(f"无法解析大小：{text}")
+    return int(float(match.group(1)) * units[match.group(2).upper()])
+
+
+def _parse_param(text):
+    key, sep, value = text.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"参数应为 key=value：{text}")
+    return key.strip(), value.strip()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="manim 场景渲染结果缓存", allow_abbrev=False)
+    parser.add_argument("--cache-dir", type=Path, default=DEFAULT_ROOT)
+    parser.add_argument("--max-bytes", type=_parse_size, default=DEFAULT_MAX_BYTES)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_render = sub.add_parser("render", help="命中缓存则直接取出，否则渲染并入库", allow_abbrev=False)
+    p_render.add_argument("scene_file", type=Path)
+    p_render.add_argument("scene_name")
+    p_render.add_argument("--output-dir", type=Path, default=Path("videos"))
+    p_render.add_argument("--param", type=_parse_param, action="append", default=[],
+                          help="参与键计算的场景参数 key=value，可重复")
+    p_render.add_argument("--config", help="场景配置 TOML 文件（LESSON_CONFIG）")
+    p_render.add_argument("--preset", help="场景配置预设（LESSON_PRESET）")
+    p_render.add_argument("--set", action="append", default=[],
+                          help="场景配置覆盖 section.field=value，可重复（LESSON_SET）")
+
+    sub.add_parser("prune", help="按 --max-bytes 淘汰旧条目")
+    sub.add_parser("info", help="显示缓存占用")
+
+    args, manim_args = parser.parse_known_args(argv)
+    cache = RenderCache(args.cache_dir, args.max_bytes)
+    if args.command == "render":
+        environ = dict(os.environ)
+        if args.config:
+            environ["LESSON_CONFIG"] = str(Path(args.config).resolve())
+        if args.preset:
+            environ["LESSON_PRESET"] = args.preset
+        if args.set:
+            environ["LESSON_SET"] = ";".join(filter(None, [environ.get("LESSON_SET", ""), *args.set]))
+        outputs = render(args.scene_file, args.scene_name, manim_args, dict(args.param), cache, args.output_dir,
+                         environ=environ)
+        for path in outputs:
+            print(path)
+    elif args.command == "prune":
+        print(f"已淘汰 {cache.evict()} 个条目")
+    else:
+        entries = len(list(cache.entries_dir.glob("*.json")))
+        print(f"{cache.root}: {entries} 个条目，{cache.total_bytes() / 1024 ** 2:.1f} MiB / "
+              f"{cache.max_bytes / 1024 ** 2:.0f} MiB")
+
+
+if __name__ == "__main__":
+    main()
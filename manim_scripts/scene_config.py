@@ -0,0 +1,392 @@
+# scene_config.py
+"""
+场景参数配置
+–––––––––––––––––––––––
+三个场景中决定计算量的参数（网格细分、采样点、晶格规模、外力、run_time）
+集中在这里，按以下优先级合并（后者覆盖前者）：
+
+    1. 数据类中的默认值（与原始视频一致）
+    2. 预设 LESSON_PRESET=preview|production（或 TOML 顶层 preset = "..."）
+    3. TOML 文件 LESSON_CONFIG=path/to/lesson.toml
+    4. 单项覆盖 LESSON_SET="triangle_mesh_3d.u_segments=24;tetrahedron_physics.lattice_cells=2"
+
+TOML 示例：
+    preset = "preview"
+
+    [triangle_mesh_3d]
+    u_segments = 24
+    v_segments = 12
+
+    [tetrahedron_physics]
+    force_vec = [0, 1.5, -0.5]
+
+命令行：
+    python manim_scripts/scene_config.py show --preset production --set triangle_mesh_3d.u_segments=48
+"""
+import argparse
+import difflib
+import os
+import typing
+from dataclasses import asdict, dataclass, fields
+
+try:
+    import tomllib
+except ModuleNotFoundError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ModuleNotFoundError:
+        tomllib = None
+
+
+PHYSICS_MODELS = ("kinematic", "springs", "fem")
+RECOVERY_MODES = ("linear", "modal")
+
+
+@dataclass(frozen=True)
+class TriangleDecompositionConfig:
+    # 人脸轮廓关键点（顺时针，首尾相连）
+    face_key_points: typing.Tuple[typing.Tuple[float, float], ...] = (
+        (0, 2.5), (1, 2.3), (1.8, 1.5), (2.0, 0.5), (1.8, -0.5), (1.2, -1.2),
+        (0, -1.5), (-1.2, -1.2), (-1.8, -0.5), (-2.0, 0.5), (-1.8, 1.5), (-1, 2.3),
+    )
+    # 粗糙拟合采样的关键点下标
+    rough_indices: typing.Tuple[int, ...] = (0, 2, 4, 6, 8, 10)
+    # 显示坐标的关键顶点下标（另加中心点）
+    key_point_indices: typing.Tuple[int, ...] = (3, 7)
+    rough_run_time: float = 0.3
+    fine_run_time: float = 0.2
+    transform_run_time: float = 2.0
+
+    def validate(self):
+        n = len(self.face_key_points)
+        if n < 3:
+            raise ValueError("face_key_points 至少需要 3 个点")
+        if any(len(p) != 2 for p in self.face_key_points):
+            raise ValueError("face_key_points 中每个点必须是 (x, y)")
+        if len(self.rough_indices) < 3:
+            raise ValueError("rough_indices 至少需要 3 个下标")
+        for name in ("rough_indices", "key_point_indices"):
+            bad = [i for i in getattr(self, name) if not 0 <= i < n]
+            if bad:
+                raise ValueError(f"{name} 越界：{bad}（共 {n} 个关键点）")
+        _check_positive(self, "rough_run_time", "fine_run_time", "transform_run_time")
+
+
+@dataclass(frozen=True)
+class TriangleMesh3DConfig:
+    # 球体经度 / 纬度方向的分段数
+    u_segments: int = 6
+    v_segments: int = 4
+    sphere_radius: float = 1.2
+    stretch_scale: typing.Tuple[float, float, float] = (1.0, 1.0, 1.5)
+    compress_scale: typing.Tuple[float, float, float] = (0.8, 0.8, 0.7)
+    rotate_degrees: float = 45.0
+    tetra_face_run_time: float = 0.6
+    octa_face_run_time: float = 0.4
+    deform_run_time: float = 2.0
+    # 拉伸 / 压缩时按每个面的面积变化着色（colormap 覆盖 ±strain_range）
+    strain_colors: bool = False
+    strain_colormap: str = "coolwarm"
+    strain_range: float = 0.5
+    # 分块模式：整张球面作为一个 ChunkedMesh，按块流式绘制，临时数据不超过 memory_budget_mb
+    chunked_mesh: bool = False
+    memory_budget_mb: float = 256.0
+    # 外部模型（.obj / .ply / .stl）：非空时阶段 3 改为按 lod_faces 的面数预算由粗到细展示模型，
+    # 最精细的一级参与后面的变形；模型缩放到 sphere_radius
+    model_path: str = ""
+    lod_faces: typing.Tuple[int, ...] = (200, 2000)
+
+    def validate(self):
+        if self.u_segments < 3:
+            raise ValueError("u_segments 至少为 3")
+        if self.v_segments < 2:
+            raise ValueError("v_segments 至少为 2")
+        _check_positive(self, "sphere_radius", "tetra_face_run_time", "octa_face_run_time", "deform_run_time",
+                        "strain_range", "memory_budget_mb")
+        _check_colormap(self, "strain_colormap")
+        for name in ("stretch_scale", "compress_scale"):
+            if len(getattr(self, name)) != 3:
+                raise ValueError(f"{name} 必须是 3 个分量")
+        if not self.lod_faces or min(self.lod_faces) < 4:
+            raise ValueError(f"lod_faces 至少一级，且每级至少 4 个面，当前为 {self.lod_faces}")
+
+
+@dataclass(frozen=True)
+class TetrahedronPhysicsConfig:
+    # 单四面体顶点所受外力（位移）
+    force_vec: typing.Tuple[float, float, float] = (0.0, 1.2, -0.5)
+    # 多四面体立方体：每条棱上的单元数（1 即原始的 2×2×2 顶点）
+    lattice_cells: int = 1
+    lattice_size: float = 3.0
+    # 沿挤压方向排成一排的晶格个数；大于 1 时晶格之间按顶点–表面三角形碰撞（需要 springs / fem，lattice_cells ≥ 2）
+    lattice_count: int = 1
+    # 重力下底层 / 顶层顶点的下沉量，中间按高度线性插值
+    gravity_sag_bottom: float = 0.4
+    gravity_sag_top: float = 0.8
+    # 地面高度（重力下沉不会穿过）；挤压墙从 ±lattice_size/2 向内推进 compression_shift
+    ground_height: float = -0.4
+    compression_shift: float = 0.6
+    label_vertices: bool = True
+    vertex_run_time: float = 0.3
+    edge_run_time: float = 0.2
+    deform_run_time: float = 2.0
+    gravity_run_time: float = 3.0
+    compression_run_time: float = 2.0
+    recovery_run_time: float = 2.5
+    # 多四面体的形变来源：kinematic（解析公式）/ springs（弹簧网络）/ fem（共旋线性有限元）
+    physics_model: str = "kinematic"
+    spring_stiffness: float = 150.0
+    young_modulus: float = 80.0
+    poisson_ratio: float = 0.3
+    density: float = 1.0
+    gravity: float = 9.8
+    sim_steps: int = 400
+    sim_dt: float = 0.01
+    sim_damping: float = 4.0
+    # 内力并行计算：worker 数（0 为 CPU 核数）与后端 thread / process；结果与 worker 数无关
+    sim_workers: int = 1
+    sim_backend: str = "thread"
+    # 重力 / 挤压阶段按每条边的应变给弹簧和顶点着色（colormap 覆盖 ±strain_range）
+    strain_colors: bool = False
+    strain_colormap: str = "coolwarm"
+    strain_range: float = 0.3
+    # 分块模式：整个晶格（顶点 + 边）作为一个 ChunkedMesh，按块流式绘制
+    chunked_mesh: bool = False
+    memory_budget_mb: float = 256.0
+    # 弹性恢复：linear（直接插值回静止形状）/ modal（弹簧网络的阻尼振动模态解析解）
+    # modal 时最低阶模态在恢复动画内振动 recovery_cycles 个周期，recovery_modes 为保留的低阶模态数
+    # （0 为自动：自由度不多时取全部，大晶格只取最低几十个，稀疏 shift-invert 求解）
+    recovery_mode: str = "linear"
+    recovery_damping_ratio: float = 0.2
+    recovery_cycles: float = 3.0
+    recovery_modes: int = 0
+
+    def validate(self):
+        if self.physics_model not in PHYSICS_MODELS:
+            raise ValueError(f"physics_model 应为 {' / '.join(PHYSICS_MODELS)}，当前为 {self.physics_model!r}")
+        if not 0 <= self.poisson_ratio < 0.5:
+            raise ValueError(f"poisson_ratio 应在 [0, 0.5) 内，当前为 {self.poisson_ratio}")
+        if self.sim_steps < 1:
+            raise ValueError("sim_steps 至少为 1")
+        if self.sim_workers < 0:
+            raise ValueError("sim_workers 不能为负数")
+        if self.sim_backend not in ("thread", "process"):
+            raise ValueError(f"sim_backend 应为 thread / process，当前为 {self.sim_backend!r}")
+        if self.recovery_mode not in RECOVERY_MODES:
+            raise ValueError(f"recovery_mode 应为 {' / '.join(RECOVERY_MODES)}，当前为 {self.recovery_mode!r}")
+        if not 0 < self.recovery_damping_ratio < 1:
+            raise ValueError(f"recovery_damping_ratio 应在 (0, 1) 内，当前为 {self.recovery_damping_ratio}")
+        if self.recovery_modes < 0:
+            raise ValueError("recovery_modes 不能为负数")
+        _check_positive(self, "spring_stiffness", "young_modulus", "density", "sim_dt", "strain_range",
+                        "memory_budget_mb", "recovery_cycles")
+        _check_colormap(self, "strain_colormap")
+        if len(self.force_vec) != 3:
+            raise ValueError("force_vec 必须是 3 个分量")
+        if self.lattice_cells < 1:
+            raise ValueError("lattice_cells 至少为 1")
+        if self.lattice_count < 1:
+            raise ValueError("lattice_count 至少为 1")
+        if self.lattice_count > 1 and self.physics_model == "kinematic":
+            raise ValueError("lattice_count > 1 时晶格之间的碰撞由力学模型求解，physics_model 应为 springs / fem")
+        if self.lattice_count > 1 and self.lattice_cells < 2:
+            # 单个单元的侧面只有两个三角形，只靠顶点–三角形接触顶不住相邻晶格
+            raise ValueError("lattice_count > 1 时 lattice_cells 至少为 2")
+        _check_positive(
+            self, "lattice_size", "vertex_run_time", "edge_run_time", "deform_run_time",
+            "gravity_run_time", "compression_run_time", "recovery_run_time",
+        )
+        if not 0 <= self.compression_shift < self.lattice_size / 2:
+            raise ValueError(f"compression_shift 应在 [0, {self.lattice_size / 2}) 内，当前为 {self.compression_shift}")
+
+
+SECTIONS = {
+    "triangle_decomposition": TriangleDecompositionConfig,
+    "triangle_mesh_3d": TriangleMesh3DConfig,
+    "tetrahedron_physics": TetrahedronPhysicsConfig,
+}
+
+# 场景类名 → 配置节
+SCENE_SECTIONS = {
+    "TriangleDecomposition": "triangle_decomposition",
+    "TriangleMesh3D": "triangle_mesh_3d",
+    "TetrahedronPhysics": "tetrahedron_physics",
+}
+
+PRESETS = {
+    # 快速预览：动画时长减半，网格保持最粗
+    "preview": {
+        "triangle_decomposition": {"rough_run_time": 0.15, "fine_run_time": 0.1, "transform_run_time": 1.0},
+        "triangle_mesh_3d": {"tetra_face_run_time": 0.3, "octa_face_run_time": 0.2, "deform_run_time": 1.0},
+        "tetrahedron_physics": {
+            "vertex_run_time": 0.15, "edge_run_time": 0.1, "deform_run_time": 1.0,
+            "gravity_run_time": 1.5, "compression_run_time": 1.0, "recovery_run_time": 1.25,
+        },
+    },
+    # 正式课件：更精细的球面和晶格
+    "production": {
+        "triangle_mesh_3d": {"u_segments": 24, "v_segments": 12, "strain_colors": True},
+        "tetrahedron_physics": {"lattice_cells": 2, "label_vertices": False, "strain_colors": True},
+    },
+}
+
+
+def _check_colormap(cfg, name):
+    """colormap 名须是 strain_colors.ColorLUT 能查到的 matplotlib colormap"""
+    from matplotlib import colormaps
+
+    value = getattr(cfg, name)
+    if value not in colormaps:
+        close = difflib.get_close_matches(value, list(colormaps), n=3)
+        hint = f"（相近的有 {', '.join(close)}）" if close else ""
+        raise ValueError(f"{name} 不是 matplotlib 的 colormap：{value!r}{hint}")
+
+
+def _check_positive(cfg, *names):
+    for name in names:
+        if getattr(cfg, name) <= 0:
+            raise ValueError(f"{name} 必须为正数，当前为 {getattr(cfg, name)}")
+
+
+def _coerce(value, annotation, name):
+    """按字段注解把 TOML / 字符串值转换成目标类型"""
+    origin = typing.get_origin(annotation)
+    if origin is tuple:
+        args = typing.get_args(annotation)
+        if not isinstance(value, (list, tuple)):
+            raise ValueError(f"{name} 应为数组，实际为 {value!r}")
+        if len(args) == 2 and args[1] is Ellipsis:
+            return tuple(_coerce(v, args[0], name) for v in value)
+        if len(value) != len(args):
+            raise ValueError(f"{name} 应有 {len(args)} 个分量，实际为 {len(value)}")
+        return tuple(_coerce(v, a, name) for v, a in zip(value, args))
+    if annotation is bool:
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, str) and value.lower() in ("true", "false", "1", "0", "yes", "no"):
+            return value.lower() in ("true", "1", "yes")
+        raise ValueError(f"{name} 应为布尔值，实际为 {value!r}")
+    if annotation is int:
+        if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+            raise ValueError(f"{name} 应为整数，实际为 {value!r}")
+        return int(value)
+    if annotation is float:
+        if isinstance(value, bool):
+            raise ValueError(f"{name} 应为数值，实际为 {value!r}")
+        return float(value)
+    return annotation(value)
+
+
+def _parse_value(text):
+    """单项覆盖的值按 TOML 语法解析（支持数组），解析失败时当作字符串"""
+    if tomllib is not None:
+        try:
+            return tomllib.loads(f"v = {text}")["v"]
+        except tomllib.TOMLDecodeError:
+            pass
+    return text
+
+
+def parse_overrides(text):
+    """'section.field=value;section.field=value' → {section: {field: value}}"""
+    overrides = {}
+    for item in filter(None, (part.strip() for part in text.split(";"))):
+        key, sep, value = item.partition("=")
+        section, dot, field = key.strip().partition(".")
+        if not sep or not dot:
+            raise ValueError(f"覆盖项应为 section.field=value：{item}")
+        overrides.setdefault(section, {})[field] = _parse_value(value.strip())
+    return overrides
+
+
+def read_toml(path):
+    if tomllib is None:
+        raise RuntimeError("读取 TOML 需要 Python 3.11+ 或安装 tomli")
+    with open(path, "rb") as f:
+        return tomllib.load(f)
+
+
+def build_config(section, *layers):
+    """把若干层 {field: value} 依次覆盖到默认值上并校验"""
+    cls = SECTIONS[section]
+    hints = typing.get_type_hints(cls)
+    known = {f.name for f in fields(cls)}
+    values = {}
+    for layer in layers:
+        unknown = set(layer) - known
+        if unknown:
+            raise ValueError(f"[{section}] 未知参数：{', '.join(sorted(unknown))}")
+        for name, value in layer.items():
+            values[name] = _coerce(value, hints[name], f"{section}.{name}")
+    cfg = cls(**values)
+    cfg.validate()
+    return cfg
+
+
+def load_scene_config(section, path=None, preset=None, overrides=None, environ=None):
+    """读取单个场景的配置；参数为 None 时回退到对应环境变量"""
+    if section not in SECTIONS:
+        raise ValueError(f"未知配置节：{section}（可选 {', '.join(SECTIONS)}）")
+    environ = os.environ if environ is None else environ
+    path = path or environ.get("LESSON_CONFIG")
+    data = read_toml(path) if path else {}
+    unknown = set(data) - set(SECTIONS) - {"preset"}
+    if unknown:
+        raise ValueError(f"配置文件中未知的节：{', '.join(sorted(unknown))}")
+
+    preset = preset or environ.get("LESSON_PRESET") or data.get("preset")
+    if preset and preset not in PRESETS:
+        raise ValueError(f"未知预设：{preset}（可选 {', '.join(PRESETS)}）")
+    if overrides is None:
+        overrides = parse_overrides(environ.get("LESSON_SET", ""))
+    unknown = set(overrides) - set(SECTIONS)
+    if unknown:
+        raise ValueError(f"覆盖项中未知的节：{', '.join(sorted(unknown))}")
+
+    return build_config(
+        section,
+        PRESETS.get(preset, {}).get(section, {}),
+        data.get(section, {}),
+        overrides.get(section, {}),
+    )
+
+
+def load_all(**kwargs):
+    return {section: load_scene_config(section, **kwargs) for section in SECTIONS}
+
+
+def _to_toml(sections):
+    def fmt(value):
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        if isinstance(value, (list, tuple)):
+            return "[" + ", ".join(fmt(v) for v in value) + "]"
+        return repr(value)
+
+    lines = []
+    for section, cfg in sections.items():
+        lines.append(f"[{section}]")
+        lines.extend(f"{name} = {fmt(value)}" for name, value in asdict(cfg).items())
+        lines.append("")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="查看 / 校验场景配置")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_show = sub.add_parser("show", help="打印合并后的完整配置（TOML 格式）")
+    p_show.add_argument("--config", help="TOML 配置文件")
+    p_show.add_argument("--preset", choices=sorted(PRESETS))
+    p_show.add_argument("--set", action="append", default=[], help="section.field=value，可重复")
+    p_show.add_argument("--section", choices=sorted(SECTIONS))
+    args = parser.parse_args(argv)
+
+    overrides = parse_overrides(";".join(args.set)) if args.set else None
+    sections = load_all(path=args.config, preset=args.preset, overrides=overrides)
+    if args.section:
+        sections = {args.section: sections[args.section]}
+    print(_to_toml(sections))
+
+
+if __name__ == "__main__":
+    main()
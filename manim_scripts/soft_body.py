@@ -0,0 +1,199 @@
+# soft_body.py
+"""
+四面体软体的两种力学模型
+–––––––––––––––––––––––
+- SpringNetwork：每条边一根胡克弹簧（动画里画出来的那套）
+- CorotationalFEM：共旋线性有限元。每个四面体预先求静止形状矩阵的逆 Dm⁻¹，
+  每步批量计算形变梯度 F = Ds·Dm⁻¹，SVD 极分解 F = R·S 去掉刚体旋转，
+  再由线弹性应力 P = 2μ(F − R) + λ·tr(RᵀF − I)·R 得到节点力，按顶点散射累加
+
+两种模型接口相同：forces(x) → (N, 3)，masses → (N,)。
+relax() 用带阻尼的半隐式欧拉积分 + 碰撞投影求各阶段的平衡形状；
+多个晶格时碰撞体里再加一个 CollisionWorld，处理晶格之间的顶点–表面接触。
+"""
+import numpy as np
+
+from collision import Box, CollisionWorld, GroundPlane
+from parallel_forces import ParallelForces
+
+
+def scatter_add(indices, values, n):
+    """values[k] 累加到第 indices[k] 个顶点：(M,) + (M, 3) → (n, 3)"""
+    out = np.empty((n, 3))
+    for axis in range(3):
+        out[:, axis] = np.bincount(indices, weights=values[:, axis], minlength=n)
+    return out
+
+
+def tetrahedra_edges(tets):
+    """四面体剖分的不重复边 (E, 2)"""
+    pairs = np.asarray(tets)[:, [0, 1, 0, 2, 0, 3, 1, 2, 1, 3, 2, 3]].reshape(-1, 2)
+    return np.unique(np.sort(pairs, axis=1), axis=0)
+
+
+def lumped_masses(rest, tets, density=1.0):
+    """每个四面体质量平均分给 4 个顶点"""
+    d = rest[tets[:, 1:]] - rest[tets[:, :1]]
+    volume = np.abs(np.linalg.det(d)) / 6.0
+    return np.bincount(tets.ravel(), weights=np.repeat(density * volume / 4.0, 4), minlength=len(rest))
+
+
+class SpringNetwork:
+    def __init__(self, rest, edges, stiffness, masses):
+        self.rest = np.ascontiguousarray(rest, dtype=np.float64)
+        self.edges = np.ascontiguousarray(edges, dtype=np.int64)
+        self.stiffness = stiffness
+        self.masses = masses
+        d = self.rest[self.edges[:, 1]] - self.rest[self.edges[:, 0]]
+        self.rest_lengths = np.linalg.norm(d, axis=1)
+
+    @property
+    def num_elements(self):
+        return len(self.edges)
+
+    def element_forces(self, x, start=0, stop=None):
+        """[start, stop) 范围内每条弹簧作用在两个端点上的力 (M, 2, 3)"""
+        edges = self.edges[start:stop]
+        d = x[edges[:, 1]] - x[edges[:, 0]]
+        length = np.linalg.norm(d, axis=1)
+        rest = self.rest_lengths[start:stop]
+        # F = -k(|d| - L0) d/|d|
+        magnitude = self.stiffness * (length - rest) / np.where(length > 0, length, 1)
+        f = magnitude[:, None] * d
+        return np.stack([f, -f], axis=1)
+
+    def element_indices(self, start=0, stop=None):
+        return self.edges[start:stop]
+
+    def reorder_elements(self, order):
+        """按 order 重排单元；换成新数组而不原地修改，与浅拷贝共享的旧数组不受影响"""
+        self.edges = np.ascontiguousarray(self.edges[order])
+        self.rest_lengths = np.ascontiguousarray(self.rest_lengths[order])
+
+    def forces(self, x):
+        return scatter_add(self.edges.ravel(), self.element_forces(x).reshape(-1, 3), len(x))
+
+
+class CorotationalFEM:
+    def __init__(self, rest, tets, young_modulus, poisson_ratio, masses):
+        self.rest = np.ascontiguousarray(rest, dtype=np.float64)
+        tets = np.ascontiguousarray(tets, dtype=np.int64)
+        # 统一为正体积朝向
+        dm = self._shape_matrices(self.rest, tets)
+        flip = np.linalg.det(dm) < 0
+        tets[flip] = tets[flip][:, [0, 2, 1, 3]]
+        self.tets = tets
+        dm = self._shape_matrices(self.rest, tets)
+        self.volumes = np.linalg.det(dm) / 6.0
+        if np.any(self.volumes <= 1e-12):
+            raise ValueError("存在体积为 0 的退化四面体")
+        self.dm_inv = np.linalg.inv(dm)
+        self.dm_inv_t = np.ascontiguousarray(np.swapaxes(self.dm_inv, 1, 2))
+        self.mu = young_modulus / (2 * (1 + poisson_ratio))
+        self.lam = young_modulus * poisson_ratio / ((1 + poisson_ratio) * (1 - 2 * poisson_ratio))
+        self.masses = masses
+
+    @staticmethod
+    def _shape_matrices(x, tets):
+        # 列向量为 x1-x0, x2-x0, x3-x0
+        return np.swapaxes(x[tets[:, 1:]] - x[tets[:, :1]], 1, 2)
+
+    @property
+    def num_elements(self):
+        return len(self.tets)
+
+    def element_forces(self, x, start=0, stop=None):
+        """[start, stop) 范围内每个四面体作用在 4 个顶点上的力 (M, 4, 3)"""
+        tets = self.tets[start:stop]
+        ds = self._shape_matrices(x, tets)
+        F = np.einsum("tij,tjk->tik", ds, self.dm_inv[start:stop])
+        U, _, Vt = np.linalg.svd(F)
+        # 反射修正：保证 R 为纯旋转
+        reflect = np.linalg.det(U) * np.linalg.det(Vt) < 0
+        U[reflect, :, 2] *= -1
+        R = np.einsum("tij,tjk->tik", U, Vt)
+        trace = np.einsum("tij,tij->t", R, F) - 3.0
+        P = 2 * self.mu * (F - R) + (self.lam * trace)[:, None, None] * R
+        H = -self.volumes[start:stop, None, None] * np.einsum("tij,tjk->tik", P, self.dm_inv_t[start:stop])
+        f = np.empty((len(tets), 4, 3))
+        f[:, 1:] = np.swapaxes(H, 1, 2)
+        f[:, 0] = -f[:, 1:].sum(axis=1)
+        return f
+
+    def element_indices(self, start=0, stop=None):
+        return self.tets[start:stop]
+
+    def reorder_elements(self, order):
+        """按 order 重排单元；换成新数组而不原地修改，与浅拷贝共享的旧数组不受影响"""
+        self.tets = np.ascontiguousarray(self.tets[order])
+        self.volumes = np.ascontiguousarray(self.volumes[order])
+        self.dm_inv = np.ascontiguousarray(self.dm_inv[order])
+        self.dm_inv_t = np.ascontiguousarray(self.dm_inv_t[order])
+
+    def forces(self, x):
+        return scatter_add(self.tets.ravel(), self.element_forces(x).reshape(-1, 3), len(x))
+
+
+def build_model(cfg, lattice, tets):
+    """按配置构建力学模型；lattice 为 cube_lattice() 返回的 MeshGeometry"""
+    masses = lumped_masses(lattice.positions, tets, cfg.density)
+    if cfg.physics_model == "springs":
+        # 动画里的弹簧网络不足以约束所有自由度，这里用四面体剖分的全部边
+        return SpringNetwork(lattice.positions, tetrahedra_edges(tets), cfg.spring_stiffness, masses)
+    if cfg.physics_model == "fem":
+        return CorotationalFEM(lattice.positions, tets, cfg.young_modulus, cfg.poisson_ratio, masses)
+    raise ValueError(f"physics_model={cfg.physics_model!r} 没有对应的力学模型")
+
+
+def relax(model, x0, colliders=(), gravity=0.0, steps=400, dt=0.01, damping=4.0, forces=None):
+    """
+    带阻尼的半隐式欧拉积分，每步把顶点投影出碰撞体（碰撞体拿到本步的起点坐标，可做扫掠检测），返回最终位置
+    forces: 可替换的内力计算函数（默认 model.forces）
+    """
+    forces = model.forces if forces is None else forces
+    x = np.array(x0, dtype=np.float64)
+    v = np.zeros_like(x)
+    inv_mass = 1.0 / model.masses[:, None]
+    g = np.array([0.0, 0.0, -gravity])
+    decay = np.exp(-damping * dt)
+    for _ in range(steps):
+        v += dt * (forces(x) * inv_mass + g)
+        v *= decay
+        predicted = x + dt * v
+        for collider in colliders:
+            collider.resolve(predicted, x)
+        v = (predicted - x) / dt
+        x = predicted
+    return x
+
+
+def simulate_stages(cfg, lattice, tets, bodies=()):
+    """
+    重力 → 挤压 → 松开 三个阶段的平衡形状（physics_model 为 springs / fem 时使用）
+    bodies：lattice 由多个晶格拼成时各自的 MeshGeometry（按顶点顺序），用于晶格之间的碰撞
+    """
+    model = build_model(cfg, lattice, tets)
+    with ParallelForces(model, cfg.sim_workers, cfg.sim_backend) as solver:
+        return _simulate_stages(cfg, lattice, solver, bodies)
+
+
+def _simulate_stages(cfg, lattice, solver, bodies=()):
+    ground = GroundPlane(cfg.ground_height)
+    # 晶格之间：顶点–表面三角形接触，带一半的切向摩擦，叠放的晶格不会在光滑接触面上滑落
+    others = [CollisionWorld(bodies, friction=0.5)] if len(bodies) > 1 else []
+    # 底面落在地面上，再在重力下沉降
+    start = lattice.positions + np.array([0.0, 0.0, cfg.ground_height])
+    kwargs = {"steps": cfg.sim_steps, "dt": cfg.sim_dt, "damping": cfg.sim_damping, "forces": solver.forces}
+    model = solver.model
+    gravity = relax(model, start, [ground, *others], cfg.gravity, **kwargs)
+
+    # 挤压墙分几步推进，避免一步穿透过深导致显式积分发散
+    compressed = gravity
+    half = float(np.abs(lattice.positions[:, 0]).max())  # 多个晶格时为整排的半宽
+    ramp = max(1, int(np.ceil(cfg.compression_shift / (0.125 * cfg.lattice_size / max(cfg.lattice_cells, 1)))))
+    for wall in np.linspace(half, half - cfg.compression_shift, ramp + 1)[1:]:
+        walls = Box((-wall, -np.inf, -np.inf), (wall, np.inf, np.inf))
+        compressed = relax(model, compressed, [walls, ground, *others], cfg.gravity,
+                           **{**kwargs, "steps": max(1, cfg.sim_steps // ramp)})
+    compressed = relax(model, compressed, [walls, ground, *others], cfg.gravity, **kwargs)
+    return gravity, compressed
@@ -0,0 +1,75 @@
+# strain_colors.py
+"""
+形变着色：应变 / 面积变化 → 颜色
+–––––––––––––––––––––––
+- 每条边的应变 (|d| - L0) / L0、每个面的面积变化 A / A0 - 1 对所有单元一次向量化算出
+- 颜色查预先生成的 matplotlib colormap 表（LUT），不逐个调用 colormap
+- 颜色通过 morph 的绑定（FaceBinding / PointBinding / SegmentBinding）整块写入 mobject 共享的颜色数组，
+  每帧只对整块数组写一次，不对每个 mobject 调用 set_fill / set_color
+
+    lut = ColorLUT("coolwarm", -0.5, 0.5)
+    binding.set_rgb(lut.rgb(face_area_change(positions, mesh.faces, rest_areas)))
+"""
+import numpy as np
+from matplotlib import colormaps
+
+from morph import FaceBinding, MorphAnimation, MorphChain
+
+
+class ColorLUT:
+    """把 [vmin, vmax] 线性映射到预先采样的 colormap 表"""
+
+    def __init__(self, cmap="coolwarm", vmin=-0.5, vmax=0.5, size=256):
+        if vmax <= vmin:
+            raise ValueError(f"vmax 必须大于 vmin（{vmin}, {vmax}）")
+        self.vmin, self.vmax = vmin, vmax
+        self.table = colormaps[cmap](np.linspace(0, 1, size))  # (size, 4) RGBA
+
+    def index(self, values):
+        t = (np.asarray(values, dtype=np.float64) - self.vmin) / (self.vmax - self.vmin)
+        return np.clip((t * (len(self.table) - 1) + 0.5).astype(np.int64), 0, len(self.table) - 1)
+
+    def rgba(self, values):
+        return self.table[self.index(values)]
+
+    def rgb(self, values):
+        return self.table[self.index(values), :3]
+
+
+def edge_strain(positions, edges, rest_lengths):
+    d = positions[edges[:, 1]] - positions[edges[:, 0]]
+    return np.sqrt(np.einsum("ij,ij->i", d, d)) / rest_lengths - 1.0
+
+
+def face_areas(positions, faces):
+    a, b, c = positions[faces[:, 0]], positions[faces[:, 1]], positions[faces[:, 2]]
+    return 0.5 * np.linalg.norm(np.cross(b - a, c - a), axis=1)
+
+
+def face_area_change(positions, faces, rest_areas):
+    return face_areas(positions, faces) / rest_areas - 1.0
+
+
+def vertex_strain(edges, strain, n):
+    """每个顶点取相连各边应变的平均值"""
+    total = np.bincount(edges.ravel(), weights=np.repeat(strain, 2), minlength=n)
+    count = np.bincount(edges.ravel(), minlength=n)
+    return total / np.maximum(count, 1)
+
+
+class StrainDeform(MorphAnimation):
+    """
+    网格从 start 变形到 end，同时按面积变化着色；每帧只有整块数组运算
+    binding 缺省时 group 的子对象须与 mesh 的面一一对应（FaceBinding）；
+    group 只用来取这些子对象，动画原地驱动它们，不把 group 本身加入场景
+    """
+
+    def __init__(self, group, mesh, start, end, lut, rest_areas=None, binding=None, **kwargs):
+        self.faces = mesh.faces
+        self.lut = lut
+        self.rest_areas = face_areas(mesh.positions, mesh.faces) if rest_areas is None else rest_areas
+        self.binding = FaceBinding(group.submobjects, mesh.faces) if binding is None else binding
+        super().__init__(MorphChain([start, end]), 0, [self.binding], on_frame=self.recolor, **kwargs)
+
+    def recolor(self, positions, t):
+        self.binding.set_rgb(self.lut.rgb(face_area_change(positions, self.faces, self.rest_areas)))
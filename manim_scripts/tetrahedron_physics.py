@@ -2,8 +2,79 @@
 from manim import *
 import numpy as np
 
+from chunked_mesh import ChunkedBinding, ChunkedMesh, ChunkedMeshCamera, uniform_rgba
+from collision import Box, GroundPlane
+from frame_pipeline import PipelinedWriterMixin
+from geometry import MeshGeometry, lattice_bodies, lattice_tetrahedra, scene_lattice
+from modal_recovery import ModalResponse
+from morph import MorphAnimation, MorphChain, PointBinding, SegmentBinding
+from scene_config import load_scene_config
+from soft_body import lumped_masses, simulate_stages, tetrahedra_edges
+from strain_colors import ColorLUT, edge_strain, vertex_strain
+
+
+# 单四面体顶点与弹簧边
+TETRA_NETWORK = MeshGeometry(
+    [[0, 0, 3], [3, 0, 0], [-2, 2, 0], [-2, -2, 0]],
+    edges=[(0, 1), (0, 2), (0, 3), (1, 2), (2, 3), (3, 1)],
+    names=["V1", "V2", "V3", "V4"],
+)
+
+
+def gravity_positions(positions, cfg):
+    """所有顶点都受重力影响，上层顶点下沉更多（按高度线性插值），不会穿过地面"""
+    sag_bottom, sag_top = cfg.gravity_sag_bottom, cfg.gravity_sag_top
+    result = np.array(positions, dtype=np.float64)
+    result[:, 2] -= sag_bottom + (sag_top - sag_bottom) * result[:, 2] / cfg.lattice_size
+    GroundPlane(cfg.ground_height).resolve(result)
+    return result
+
+
+def compression_positions(gravity_pos, cfg):
+    """两侧刚性挤压墙推进到 x = ±(lattice_size/2 - compression_shift)，墙外的顶点被推到墙面上"""
+    wall = cfg.lattice_size / 2 - cfg.compression_shift
+    result = np.array(gravity_pos, dtype=np.float64)
+    for collider in (
+        Box((-wall, -np.inf, -np.inf), (wall, np.inf, np.inf)),
+        GroundPlane(cfg.ground_height),
+    ):
+        collider.resolve(result)
+    return result
+
+
+def stage_positions(lattice, cfg):
+    """
+    重力、碰撞压缩两个阶段的目标形状：kinematic 用解析公式，springs / fem 由力学模型求平衡
+    lattice 为 scene_lattice(cfg)；多个晶格时力学模型额外处理晶格之间的碰撞
+    """
+    if cfg.physics_model == "kinematic":
+        gravity = gravity_positions(lattice.positions, cfg)
+        return gravity, compression_positions(gravity, cfg)
+    bodies = lattice_bodies(cfg) if cfg.lattice_count > 1 else ()
+    return simulate_stages(cfg, lattice, lattice_tetrahedra(cfg.lattice_cells, cfg.lattice_count), bodies)
+
+
+def recovery_response(rest, deformed, tets, cfg):
+    """从 deformed 松开后回到 rest 的阻尼模态响应：弹簧取四面体剖分的全部边，质量按体积集中到顶点"""
+    return ModalResponse.from_springs(
+        rest, tetrahedra_edges(tets), cfg.spring_stiffness, lumped_masses(rest, tets, cfg.density), deformed,
+        damping_ratio=cfg.recovery_damping_ratio, cycles=cfg.recovery_cycles, modes=cfg.recovery_modes,
+    )
+
+
+def strain_coloring(lattice, cfg):
+    """晶格的应变配色 positions → (顶点 rgb, 边 rgb)：全部边一次算出应变，顶点取相连边的平均后查表"""
+    lut = ColorLUT(cfg.strain_colormap, -cfg.strain_range, cfg.strain_range)
+    rest_lengths = lattice.edge_lengths()
+
+    def colors(positions):
+        strain = edge_strain(positions, lattice.edges, rest_lengths)
+        return lut.rgb(vertex_strain(lattice.edges, strain, len(lattice))), lut.rgb(strain)
+
+    return colors
+
 
-class TetrahedronPhysics(ThreeDScene):
+class TetrahedronPhysics(PipelinedWriterMixin, ThreeDScene):
     """
     四面体软体物理模拟演示
     –––––––––––––––––––––––
@@ -13,10 +84,18 @@ class TetrahedronPhysics(ThreeDScene):
     修复：弹性恢复时回到初始未变形状态（而不是停留在重力形变状态）
     """
 
+    def __init__(self, **kwargs):
+        # 只对 ChunkedMesh 生效，其余 mobject 与 ThreeDCamera 相同
+        kwargs.setdefault("camera_class", ChunkedMeshCamera)
+        super().__init__(**kwargs)
+
     # ----------------------------------------------------------
     # 场景主流程
     # ----------------------------------------------------------
     def construct(self):
+        self.cfg = load_scene_config("tetrahedron_physics")
+        self.renderer.camera.memory_budget_mb = self.cfg.memory_budget_mb
+
         # 1. 场景初始化
         self.set_camera_orientation(phi=70 * DEGREES, theta=-45 * DEGREES)
 
@@ -47,6 +126,8 @@ class TetrahedronPhysics(ThreeDScene):
         # 4. 清场
         self.play(*[FadeOut(obj) for obj in [title, axes, axis_labels]])
         self.wait(1)
+        if self.cfg.chunked_mesh:
+            logger.info(self.renderer.camera.memory_report())
 
     # ----------------------------------------------------------
     # 1. 单四面体弹簧系统
@@ -58,24 +139,19 @@ class TetrahedronPhysics(ThreeDScene):
         self.play(Write(intro_text))
 
         # 顶点
-        vertices = [
-            np.array([0, 0, 3]),
-            np.array([3, 0, 0]),
-            np.array([-2, 2, 0]),
-            np.array([-2, -2, 0]),
-        ]
+        network = TETRA_NETWORK
+        vertices = network.positions
         dots, labels = [], []
-        for i, v in enumerate(vertices):
+        for i, (v, name) in enumerate(zip(vertices, network.names)):
             dot = Dot3D(v, color=RED, radius=0.08)
-            label = Text(f"V{i+1}", font_size=16, color=RED).rotate(PI / 2, RIGHT)
+            label = Text(name, font_size=16, color=RED).rotate(PI / 2, RIGHT)
             label.next_to(v, UP if i == 0 else DOWN, buff=0.2)
             dots.append(dot)
             labels.append(label)
             self.play(Create(dot), Write(label), run_time=0.5)
 
         # 弹簧边
-        edges = [(0, 1), (0, 2), (0, 3), (1, 2), (2, 3), (3, 1)]
-        springs = [Line3D(vertices[s], vertices[e], color=BLUE, stroke_width=4) for s, e in edges]
+        springs = [Line3D(start, end, color=BLUE, stroke_width=4) for start, end in network.edge_points()]
         spring_text = Text("弹簧连接系统", font_size=16, color=BLUE)
         spring_text.to_corner(UR, buff=0.5)
         self.add_fixed_in_frame_mobjects(spring_text)
@@ -103,22 +179,21 @@ class TetrahedronPhysics(ThreeDScene):
         self.add_fixed_in_frame_mobjects(deform)
         self.play(Write(deform))
 
-        force_vec = np.array([0, 1.2, -0.5])
+        force_vec = np.array(self.cfg.force_vec)
         force_arrow = Arrow3D(vertices[0], vertices[0] + force_vec, color=RED, thickness=0.1)
         self.play(Create(force_arrow))
 
-        # 变形
+        # 变形：静止 → 受力 → 恢复 三个关键帧，弹簧与顶点直接跟随顶点坐标插值
         new_top = vertices[0] + force_vec
         new_verts = vertices.copy()
         new_verts[0] = new_top
-        new_springs = [Line3D(new_verts[s], new_verts[e], color=BLUE, stroke_width=4) for s, e in edges]
+        chain = MorphChain([vertices, new_verts, vertices])
+        # 模态恢复时所有顶点都会振动，因此四个顶点及其标签都绑定
+        indices = np.arange(len(vertices))
+        bindings = [PointBinding(dots + labels, np.concatenate([indices, indices])),
+                    SegmentBinding(springs, network.edges)]
 
-        self.play(
-            dots[0].animate.move_to(new_top),
-            labels[0].animate.next_to(new_top, UP, buff=0.2),
-            *[Transform(old, new) for old, new in zip(springs, new_springs)],
-            run_time=2
-        )
+        self.play(MorphAnimation(chain, 0, bindings), run_time=self.cfg.deform_run_time)
         self.wait(1)
 
         # 弹性恢复
@@ -127,13 +202,15 @@ class TetrahedronPhysics(ThreeDScene):
         self.add_fixed_in_frame_mobjects(recover_text)
         self.play(Write(recover_text))
 
-        orig_springs = [Line3D(vertices[s], vertices[e], color=BLUE, stroke_width=4) for s, e in edges]
+        if self.cfg.recovery_mode == "modal":
+            response = recovery_response(vertices, new_verts, np.array([[0, 1, 2, 3]]), self.cfg)
+            recovery = MorphAnimation(response, 0, bindings, rate_func=linear)
+        else:
+            recovery = MorphAnimation(chain, 1, bindings)
         self.play(
-            dots[0].animate.move_to(vertices[0]),
-            labels[0].animate.next_to(vertices[0], UP, buff=0.2),
+            recovery,
             FadeOut(force_arrow),
-            *[Transform(spring, orig) for spring, orig in zip(springs, orig_springs)],
-            run_time=2
+            run_time=self.cfg.deform_run_time
         )
         self.wait(1)
 
@@ -150,48 +227,24 @@ class TetrahedronPhysics(ThreeDScene):
         self.add_fixed_in_frame_mobjects(multi)
         self.play(Write(multi))
 
-        # 8 个顶点（2×2×2 网格）
-        positions = [
-            (-1.5, -1.5, 0), (1.5, -1.5, 0),
-            (-1.5, 1.5, 0), (1.5, 1.5, 0),
-            (-1.5, -1.5, 3), (1.5, -1.5, 3),
-            (-1.5, 1.5, 3), (1.5, 1.5, 3),
-        ]
-        
-        # 逐个创建顶点和标签
-        dots, labels = [], []
-        for i, p in enumerate(positions):
-            dot = Dot3D(np.array(p), color=YELLOW, radius=0.06)
-            label = Text(f"P{i+1}", font_size=14, color=YELLOW).rotate(PI / 2, RIGHT)
-            label.next_to(np.array(p), UP if p[2] > 1 else DOWN, buff=0.2)
-            dots.append(dot)
-            labels.append(label)
-            self.play(Create(dot), Write(label), run_time=0.3)
-
-        # 立方体所有边的连接关系（12条边 + 4条主对角线用于四面体分解）
-        conns = [
-            # 底面正方形 (z=0)
-            (0, 1), (1, 3), (3, 2), (2, 0),
-            # 顶面正方形 (z=3) 
-            (4, 5), (5, 7), (7, 6), (6, 4),
-            # 垂直边
-            (0, 4), (1, 5), (2, 6), (3, 7),
-            # 四面体分解的关键对角线
-            (0, 3), (0, 7), (1, 6), (2, 5)
-        ]
+        # 立方体晶格顶点（默认 2×2×2 网格）及连接关系
+        # （每个单元 12 条边 + 4 条主对角线用于四面体分解）
+        lattice = scene_lattice(self.cfg)
         
-        # 弹簧连接系统
+        # 顶点和边线：默认逐个创建（顶点可带标签）
         spring_text = Text("多四面体弹簧网络", font_size=16, color=TEAL)
         spring_text.to_corner(UR, buff=0.5)
-        self.add_fixed_in_frame_mobjects(spring_text)
-        self.play(Write(spring_text))
-        
-        # 逐个创建边线
-        edges = []
-        for s, e in conns:
-            line = Line3D(np.array(positions[s]), np.array(positions[e]), color=TEAL, stroke_width=2)
-            edges.append(line)
-            self.play(Create(line), run_time=0.2)
+        if self.cfg.chunked_mesh:
+            # 分块模式：整个晶格（顶点 + 边）是一个 mobject，一次淡入
+            lattice_mesh = ChunkedMesh(
+                lattice, edge_rgba=uniform_rgba(TEAL, lattice.num_edges), edge_width=2,
+                point_rgba=uniform_rgba(YELLOW, len(lattice)), point_radius=0.06,
+            )
+            dots, labels, edges = [lattice_mesh], [], []
+            self.add_fixed_in_frame_mobjects(spring_text)
+            self.play(Write(spring_text), FadeIn(lattice_mesh))
+        else:
+            dots, labels, edges = self.lattice_mobjects(lattice, spring_text)
         
         self.play(FadeOut(spring_text))
         self.wait(1)
@@ -203,16 +256,15 @@ class TetrahedronPhysics(ThreeDScene):
         self.play(Write(g_text))
 
         # 所有顶点都受重力影响，上层顶点下沉更多
-        gravity_pos = [
-            np.array(p) + np.array([0, 0, -0.8]) if p[2] > 1.5 else 
-            np.array(p) + np.array([0, 0, -0.4])
-            for p in positions
-        ]
-
-        anims = [dot.animate.move_to(np.array(gp)) for dot, gp in zip(dots, gravity_pos)]
-        for ln, (s, e) in zip(edges, conns):
-            anims.append(ln.animate.put_start_and_end_on(np.array(gravity_pos[s]), np.array(gravity_pos[e])))
-        self.play(*anims, run_time=3)
+        # 重力 → 挤压 → 恢复 串成一条关键帧链，顶点与边线每帧整块插值
+        gravity_pos, comp_pos = stage_positions(lattice, self.cfg)
+        chain = MorphChain([lattice.positions, gravity_pos, comp_pos, lattice.positions])
+        if self.cfg.chunked_mesh:
+            bindings = [ChunkedBinding(dots[0], "points"), ChunkedBinding(dots[0], "edges")]
+        else:
+            bindings = [PointBinding(dots, np.arange(len(lattice))), SegmentBinding(edges, lattice.edges)]
+
+        self.play(self.lattice_morph(lattice, chain, 0, bindings), run_time=self.cfg.gravity_run_time)
         self.wait(1.5)
 
         # 碰撞压缩
@@ -222,17 +274,7 @@ class TetrahedronPhysics(ThreeDScene):
         self.add_fixed_in_frame_mobjects(c_text)
         self.play(Write(c_text))
 
-        comp_pos = [
-            gp + np.array([-0.6, 0, 0]) if gp[0] > 0.5 else
-            gp + np.array([0.6, 0, 0]) if gp[0] < -0.5 else
-            gp
-            for gp in gravity_pos
-        ]
-
-        anims = [dot.animate.move_to(np.array(cp)) for dot, cp in zip(dots, comp_pos)]
-        for ln, (s, e) in zip(edges, conns):
-            anims.append(ln.animate.put_start_and_end_on(np.array(comp_pos[s]), np.array(comp_pos[e])))
-        self.play(*anims, run_time=2)
+        self.play(self.lattice_morph(lattice, chain, 1, bindings), run_time=self.cfg.compression_run_time)
         self.wait(1)
 
         # 弹性恢复（回到初始无外力状态）
@@ -243,10 +285,13 @@ class TetrahedronPhysics(ThreeDScene):
         self.play(Write(e_text))
 
         # 回到原始未变形状态
-        anims = [dot.animate.move_to(np.array(p)) for dot, p in zip(dots, positions)]
-        for ln, (s, e) in zip(edges, conns):
-            anims.append(ln.animate.put_start_and_end_on(np.array(positions[s]), np.array(positions[e])))
-        self.play(*anims, run_time=2.5)
+        if self.cfg.recovery_mode == "modal":
+            tets = lattice_tetrahedra(self.cfg.lattice_cells, self.cfg.lattice_count)
+            response = recovery_response(lattice.positions, comp_pos, tets, self.cfg)
+            recovery = self.lattice_morph(lattice, response, 0, bindings, fade_in=False, rate_func=linear)
+        else:
+            recovery = self.lattice_morph(lattice, chain, 2, bindings)
+        self.play(recovery, run_time=self.cfg.recovery_run_time)
         self.wait(1.5)
 
         # 清场
@@ -279,5 +324,52 @@ class TetrahedronPhysics(ThreeDScene):
         self.play(*[FadeOut(obj) for obj in (dots + labels + edges)])
         self.wait(1)
 
+    def lattice_mobjects(self, lattice, spring_text):
+        """逐个创建顶点（及标签）和边线，返回 (dots, labels, edges)"""
+        size = self.cfg.lattice_size
+        dots, labels = [], []
+        for p, name in zip(lattice.positions, lattice.names):
+            dot = Dot3D(p, color=YELLOW, radius=0.06)
+            dots.append(dot)
+            if not self.cfg.label_vertices:
+                self.play(Create(dot), run_time=self.cfg.vertex_run_time)
+                continue
+            label = Text(name, font_size=14, color=YELLOW).rotate(PI / 2, RIGHT)
+            label.next_to(p, UP if p[2] > size / 2 else DOWN, buff=0.2)
+            labels.append(label)
+            self.play(Create(dot), Write(label), run_time=self.cfg.vertex_run_time)
 
+        # 弹簧连接系统
+        self.add_fixed_in_frame_mobjects(spring_text)
+        self.play(Write(spring_text))
 
+        # 逐个创建边线
+        edges = []
+        for start, end in lattice.edge_points():
+            line = Line3D(start, end, color=TEAL, stroke_width=2)
+            edges.append(line)
+            self.play(Create(line), run_time=self.cfg.edge_run_time)
+        return dots, labels, edges
+
+    def lattice_morph(self, lattice, chain, segment, bindings, fade_in=None, fade_out=None, **kwargs):
+        """
+        晶格关键帧链的第 segment 段
+        strain_colors 开启时每帧按 strain_coloring 查表，整块写入顶点与边的颜色；
+        第一段从原来的配色渐变过来，最后一段（回到静止形状）再渐变回去（可用 fade_in / fade_out 指定）
+        """
+        if not self.cfg.strain_colors:
+            return MorphAnimation(chain, segment, bindings, **kwargs)
+        strain_rgb = strain_coloring(lattice, self.cfg)
+        counts = (len(lattice), lattice.num_edges)
+        base = [np.tile(color_to_rgb(color), (n, 1)) for n, color in zip(counts, (YELLOW, TEAL))]
+        # 与原配色的混合权重：第一段 1 → 0，最后一段 0 → 1，中间各段为 0
+        first = segment == 0 if fade_in is None else fade_in
+        last = segment == chain.num_segments - 1 if fade_out is None else fade_out
+
+        def recolor(positions, t):
+            colors = strain_rgb(positions)
+            w = (1 - t if first else 0.0) + (t if last else 0.0)
+            for binding, rgb, rest_rgb in zip(bindings, colors, base):
+                binding.set_rgb(rgb + w * (rest_rgb - rgb))
+
+        return MorphAnimation(chain, segment, bindings, on_frame=recolor, **kwargs)
@@ -1,8 +1,124 @@
 from manim import *
 import numpy as np
 
-class TriangleMesh3D(ThreeDScene):
+from chunked_mesh import ChunkedBinding, ChunkedMesh, ChunkedMeshCamera, palette_rgba
+from frame_pipeline import PipelinedWriterMixin
+from geometry import MeshGeometry
+from mesh_io import fit_to_radius, level_of_detail, load_mesh
+from morph import MorphAnimation, MorphChain
+from scene_config import load_scene_config
+from strain_colors import ColorLUT, StrainDeform
+
+# 四面体：4 个顶点、4 个三角形面（前、左、右、底）
+TETRA_MESH = MeshGeometry.from_faces(
+    [
+        [0, 0, 1.5],        # 顶点
+        [1.2, 0, -0.5],     # 底面1
+        [-0.6, 1.0, -0.5],  # 底面2
+        [-0.6, -1.0, -0.5], # 底面3
+    ],
+    [[0, 1, 2], [0, 2, 3], [0, 3, 1], [1, 2, 3]],
+    face_colors=[YELLOW, PINK, TEAL, PURPLE],
+)
+
+# 八面体：6 个顶点（上、下、前、后、右、左）、8 个三角形面
+OCTA_MESH = MeshGeometry.from_faces(
+    [
+        [0, 0, 1.5], [0, 0, -1.5],
+        [1.2, 0, 0], [-1.2, 0, 0],
+        [0, 1.2, 0], [0, -1.2, 0],
+    ],
+    [
+        [0, 2, 4], [0, 4, 3], [0, 3, 5], [0, 5, 2],  # 上半部分
+        [1, 4, 2], [1, 3, 4], [1, 5, 3], [1, 2, 5],  # 下半部分
+    ],
+    face_colors=[YELLOW, PINK, TEAL, PURPLE, ORANGE, GREEN, BLUE, RED],
+)
+
+
+SPHERE_PALETTE = (BLUE, TEAL)
+
+
+def sphere_mesh(u_segments=6, v_segments=4, radius=1.2, with_colors=True):
+    """
+    球面三角化：北极点 + (v_segments-1) 圈纬线 + 南极点
+    面的顺序：北极帽 → 中间带（每个四边形拆成两个三角形）→ 南极帽
+    with_colors=False 时不生成逐面的颜色表（大网格用 sphere_color_index 代替）
+    """
+    u = np.arange(u_segments) * 2 * np.pi / u_segments
+    v = np.arange(1, v_segments) * np.pi / v_segments
+    ring_v, ring_u = np.meshgrid(v, u, indexing="ij")
+    rings = radius * np.stack([
+        np.sin(ring_v) * np.cos(ring_u),
+        np.sin(ring_v) * np.sin(ring_u),
+        np.cos(ring_v),
+    ], axis=-1).reshape(-1, 3)
+    north = radius * np.array([[0.0, 0.0, 1.0]])
+    south = radius * np.array([[np.sin(np.pi), 0.0, np.cos(np.pi)]])
+    positions = np.vstack([north, rings, south])
+
+    j = np.arange(u_segments)
+    next_j = (j + 1) % u_segments
+    zeros = np.zeros(u_segments, dtype=np.int64)
+    # 北极帽：北极点、当前经度线上的点、下一条经度线上的点
+    north_cap = np.column_stack([zeros, 1 + j, 1 + next_j])
+
+    # 中间带：左上 -> 右上 -> 左下，右上 -> 右下 -> 左下
+    i = np.arange(1, v_segments - 1)[:, None]
+    top_left = 1 + (i - 1) * u_segments + j
+    top_right = 1 + (i - 1) * u_segments + next_j
+    bottom_left = 1 + i * u_segments + j
+    bottom_right = 1 + i * u_segments + next_j
+    band = np.stack([
+        np.stack([top_left, top_right, bottom_left], axis=-1),
+        np.stack([top_right, bottom_right, bottom_left], axis=-1),
+    ], axis=2).reshape(-1, 3)
+
+    # 南极帽
+    south_pole = len(positions) - 1
+    last_ring = 1 + (v_segments - 2) * u_segments
+    south_cap = np.column_stack([zeros + south_pole, last_ring + next_j, last_ring + j])
+
+    faces = np.vstack([north_cap, band, south_cap])
+    if not with_colors:
+        return MeshGeometry.from_faces(positions, faces)
+    colors = [SPHERE_PALETTE[c] for c in sphere_color_index(u_segments, v_segments)]
+    return MeshGeometry.from_faces(positions, faces, face_colors=colors)
+
+
+def sphere_color_index(u_segments, v_segments):
+    """每个面在 SPHERE_PALETTE 中的下标：两极帽为蓝色，中间带按棋盘格交替"""
+    i = np.arange(1, v_segments - 1)[:, None]
+    j = np.arange(u_segments)
+    band = np.repeat(np.where((i + j) % 2 == 0, 1, 0).ravel(), 2)
+    cap = np.zeros(u_segments, dtype=np.int64)
+    return np.concatenate([cap, band, cap])
+
+
+def mesh_levels(cfg):
+    """
+    阶段3 逐级显示的 [(网格, 配色下标)]，由粗到细，最后一级参与后面的变形：
+    配置了 model_path 时为外部模型缩放到 sphere_radius 后按 lod_faces 简化的各级，否则只有细分球体一级
+    """
+    if not cfg.model_path:
+        u, v = cfg.u_segments, cfg.v_segments
+        return [(sphere_mesh(u, v, cfg.sphere_radius, with_colors=False), sphere_color_index(u, v))]
+    model = fit_to_radius(load_mesh(cfg.model_path), cfg.sphere_radius)
+    levels = level_of_detail(model, cfg.lod_faces)
+    logger.info(f"{cfg.model_path}：{model.num_faces} 个面 → " + " / ".join(str(m.num_faces) for m in levels))
+    return [(mesh, np.arange(mesh.num_faces) % len(SPHERE_PALETTE)) for mesh in levels]
+
+
+class TriangleMesh3D(PipelinedWriterMixin, ThreeDScene):
+    def __init__(self, **kwargs):
+        # 只对 ChunkedMesh 生效，其余 mobject 与 ThreeDCamera 相同
+        kwargs.setdefault("camera_class", ChunkedMeshCamera)
+        super().__init__(**kwargs)
+
     def construct(self):
+        self.cfg = load_scene_config("triangle_mesh_3d")
+        self.renderer.camera.memory_budget_mb = self.cfg.memory_budget_mb
+
         # 设置3D场景
         self.set_camera_orientation(phi=60 * DEGREES, theta=-30 * DEGREES)
         
@@ -96,33 +212,11 @@ class TriangleMesh3D(ThreeDScene):
         self.add_fixed_in_frame_mobjects(stage1_text)
         self.play(Write(stage1_text))
         
-        # 四面体顶点
-        tetra_vertices = [
-            np.array([0, 0, 1.5]),      # 顶点
-            np.array([1.2, 0, -0.5]),   # 底面1
-            np.array([-0.6, 1.0, -0.5]), # 底面2
-            np.array([-0.6, -1.0, -0.5]) # 底面3
+        tetra_triangles = [
+            Polygon(*points, color=color, fill_opacity=0.5, stroke_width=2)
+            for points, color in zip(TETRA_MESH.face_points(), TETRA_MESH.face_colors)
         ]
         
-        # 四面体的4个三角形面
-        tetra_faces = [
-            [0, 1, 2],  # 前面
-            [0, 2, 3],  # 左面
-            [0, 3, 1],  # 右面
-            [1, 2, 3]   # 底面
-        ]
-        
-        tetra_triangles = []
-        colors = [YELLOW, PINK, TEAL, PURPLE]
-        
-        for i, face_indices in enumerate(tetra_faces):
-            vertices = [tetra_vertices[j] for j in face_indices]
-            triangle = Polygon(*vertices, 
-                              color=colors[i], 
-                              fill_opacity=0.5, 
-                              stroke_width=2)
-            tetra_triangles.append(triangle)
-        
         # 逐个显示四面体的4个面
         count_text = Text("三角形数量：4", font_size=16, color=WHITE)
         count_text.to_corner(DL, buff=0.5)
@@ -130,7 +224,7 @@ class TriangleMesh3D(ThreeDScene):
         self.play(Write(count_text))
         
         for triangle in tetra_triangles:
-            self.play(Create(triangle), run_time=0.6)
+            self.play(Create(triangle), run_time=self.cfg.tetra_face_run_time)
         
         self.wait(2)
         
@@ -144,33 +238,11 @@ class TriangleMesh3D(ThreeDScene):
         # 移除四面体
         self.play(*[FadeOut(triangle) for triangle in tetra_triangles], run_time=1)
         
-        # 八面体顶点（6个顶点）
-        octa_vertices = [
-            np.array([0, 0, 1.5]),    # 上顶点
-            np.array([0, 0, -1.5]),   # 下顶点
-            np.array([1.2, 0, 0]),    # 前顶点
-            np.array([-1.2, 0, 0]),   # 后顶点
-            np.array([0, 1.2, 0]),    # 右顶点
-            np.array([0, -1.2, 0])    # 左顶点
+        octa_triangles = [
+            Polygon(*points, color=color, fill_opacity=0.4, stroke_width=2)
+            for points, color in zip(OCTA_MESH.face_points(), OCTA_MESH.face_colors)
         ]
         
-        # 八面体的8个三角形面
-        octa_faces = [
-            [0, 2, 4], [0, 4, 3], [0, 3, 5], [0, 5, 2],  # 上半部分
-            [1, 4, 2], [1, 3, 4], [1, 5, 3], [1, 2, 5]   # 下半部分
-        ]
-        
-        octa_triangles = []
-        octa_colors = [YELLOW, PINK, TEAL, PURPLE, ORANGE, GREEN, BLUE, RED]
-        
-        for i, face_indices in enumerate(octa_faces):
-            vertices = [octa_vertices[j] for j in face_indices]
-            triangle = Polygon(*vertices, 
-                              color=octa_colors[i], 
-                              fill_opacity=0.4, 
-                              stroke_width=2)
-            octa_triangles.append(triangle)
-        
         # 更新计数
         new_count_text = Text("三角形数量：8", font_size=16, color=WHITE)
         new_count_text.to_corner(DL, buff=0.5)
@@ -178,13 +250,14 @@ class TriangleMesh3D(ThreeDScene):
         
         # 逐个显示八面体的8个面
         for triangle in octa_triangles:
-            self.play(Create(triangle), run_time=0.4)
+            self.play(Create(triangle), run_time=self.cfg.octa_face_run_time)
         
         self.wait(2)
         
-        # 阶段3：细分球体（更多三角形）
+        # 阶段3：细分球体（更多三角形）；配置了外部模型时改为模型由粗到细的各级 LOD
         self.play(FadeOut(stage2_text))
-        stage3_text = Text("阶段3：细分球体（更精细）", font_size=18, color=GREEN)
+        stage3_label = "阶段3：导入模型（逐级细化）" if self.cfg.model_path else "阶段3：细分球体（更精细）"
+        stage3_text = Text(stage3_label, font_size=18, color=GREEN)
         stage3_text.to_corner(UR, buff=0.5)
         self.add_fixed_in_frame_mobjects(stage3_text)
         self.play(Write(stage3_text))
@@ -193,104 +266,20 @@ class TriangleMesh3D(ThreeDScene):
         self.play(*[FadeOut(triangle) for triangle in octa_triangles], run_time=1)
         
         # 创建更精细的球体网格（使用正确的球面三角化）
-        def sphere_point(u, v, radius=1.2):
-            return radius * np.array([
-                np.sin(v) * np.cos(u),
-                np.sin(v) * np.sin(u),
-                np.cos(v)
-            ])
-        
-        # 生成球体网格顶点
-        u_segments = 6  # 经度方向6段  
-        v_segments = 4  # 纬度方向4段
-        
-        sphere_vertices = []
-        # 添加北极点
-        sphere_vertices.append(sphere_point(0, 0, 1.2))
-        
-        # 添加中间纬度圈的顶点
-        for i in range(1, v_segments):
-            v = i * np.pi / v_segments
-            for j in range(u_segments):
-                u = j * 2 * np.pi / u_segments
-                vertex = sphere_point(u, v)
-                sphere_vertices.append(vertex)
-        
-        # 添加南极点
-        sphere_vertices.append(sphere_point(0, np.pi, 1.2))
-        
-        # 生成三角形面
+        # 逐级显示；最后一级（最精细）参与后面的变形
         sphere_triangles = []
-        triangle_count = 0
-        
-        # 北极帽三角形
-        for j in range(u_segments):
-            next_j = (j + 1) % u_segments
-            triangle = Polygon(
-                sphere_vertices[0],  # 北极点
-                sphere_vertices[1 + j],  # 当前经度线上的点
-                sphere_vertices[1 + next_j],  # 下一个经度线上的点
-                color=BLUE, fill_opacity=0.4, stroke_width=1
-            )
-            sphere_triangles.append(triangle)
-            triangle_count += 1
-        
-        # 中间带的四边形（分成两个三角形）
-        for i in range(1, v_segments - 1):
-            for j in range(u_segments):
-                next_j = (j + 1) % u_segments
-                
-                # 当前四边形的四个顶点索引
-                top_left = 1 + (i - 1) * u_segments + j
-                top_right = 1 + (i - 1) * u_segments + next_j
-                bottom_left = 1 + i * u_segments + j
-                bottom_right = 1 + i * u_segments + next_j
-                
-                # 第一个三角形 (左上 -> 右上 -> 左下)
-                triangle1 = Polygon(
-                    sphere_vertices[top_left],
-                    sphere_vertices[top_right], 
-                    sphere_vertices[bottom_left],
-                    color=TEAL if (i + j) % 2 == 0 else BLUE, 
-                    fill_opacity=0.4, stroke_width=1
-                )
-                sphere_triangles.append(triangle1)
-                triangle_count += 1
-                
-                # 第二个三角形 (右上 -> 右下 -> 左下)
-                triangle2 = Polygon(
-                    sphere_vertices[top_right],
-                    sphere_vertices[bottom_right],
-                    sphere_vertices[bottom_left], 
-                    color=TEAL if (i + j) % 2 == 0 else BLUE,
-                    fill_opacity=0.4, stroke_width=1
-                )
-                sphere_triangles.append(triangle2)
-                triangle_count += 1
-        
-        # 南极帽三角形
-        south_pole_idx = len(sphere_vertices) - 1
-        for j in range(u_segments):
-            next_j = (j + 1) % u_segments
-            triangle = Polygon(
-                sphere_vertices[south_pole_idx],  # 南极点
-                sphere_vertices[1 + (v_segments - 2) * u_segments + next_j],  # 下一个经度线上的点
-                sphere_vertices[1 + (v_segments - 2) * u_segments + j],  # 当前经度线上的点
-                color=BLUE, fill_opacity=0.4, stroke_width=1
-            )
-            sphere_triangles.append(triangle)
-            triangle_count += 1
-        
-        # 更新计数
-        final_count_text = Text(f"三角形数量：{triangle_count}", font_size=16, color=WHITE)
-        final_count_text.to_corner(DL, buff=0.5)
-        self.play(Transform(count_text, final_count_text))
-        
-        # 快速显示所有三角形
-        for triangle in sphere_triangles:
-            self.add(triangle)
-        
-        self.wait(2)
+        for sphere, index in mesh_levels(self.cfg):
+            # 更新计数
+            final_count_text = Text(f"三角形数量：{sphere.num_faces}", font_size=16, color=WHITE)
+            final_count_text.to_corner(DL, buff=0.5)
+            self.play(Transform(count_text, final_count_text))
+            
+            # 快速显示所有三角形（替换上一级）
+            self.remove(*sphere_triangles)
+            sphere_triangles = self.mesh_triangles(sphere, index)
+            self.add(*sphere_triangles)
+            
+            self.wait(2)
         
         # 3. 实时变形演示
         self.play(FadeOut(stage3_text), FadeOut(mesh_text))
@@ -307,7 +296,11 @@ class TriangleMesh3D(ThreeDScene):
         self.add_fixed_in_frame_mobjects(matrix_text)
         self.play(Write(matrix_text))
         
-        all_mesh_objects = VGroup(*sphere_triangles)
+        all_mesh_objects = Group(*sphere_triangles) if self.cfg.chunked_mesh else VGroup(*sphere_triangles)
+        stretched = sphere.positions * self.cfg.stretch_scale
+        compressed = stretched * self.cfg.compress_scale
+        angle = self.cfg.rotate_degrees * DEGREES
+        rotated = compressed @ rotation_matrix(angle, OUT).T
         
         # 变形1：拉伸
         stretch_text = Text("拉伸变形", font_size=16, color=ORANGE)
@@ -315,11 +308,13 @@ class TriangleMesh3D(ThreeDScene):
         self.add_fixed_in_frame_mobjects(stretch_text)
         self.play(Write(stretch_text))
         
+        sx, sy, sz = self.cfg.stretch_scale
         self.play(
-            all_mesh_objects.animate.apply_function(
-                lambda p: [p[0], p[1], p[2] * 1.5]  # Z方向拉伸
+            self.deform_stage(
+                all_mesh_objects, sphere, sphere.positions, stretched,
+                lambda p: [p[0] * sx, p[1] * sy, p[2] * sz]  # 默认Z方向拉伸1.5倍
             ),
-            run_time=2
+            run_time=self.cfg.deform_run_time
         )
         self.wait(1)
         
@@ -330,11 +325,13 @@ class TriangleMesh3D(ThreeDScene):
         self.add_fixed_in_frame_mobjects(compress_text)
         self.play(Write(compress_text))
         
+        cx, cy, cz = self.cfg.compress_scale
         self.play(
-            all_mesh_objects.animate.apply_function(
-                lambda p: [p[0] * 0.8, p[1] * 0.8, p[2] * 0.7]  # 整体压缩
+            self.deform_stage(
+                all_mesh_objects, sphere, stretched, compressed,
+                lambda p: [p[0] * cx, p[1] * cy, p[2] * cz]  # 整体压缩
             ),
-            run_time=2
+            run_time=self.cfg.deform_run_time
         )
         self.wait(1)
         
@@ -345,16 +342,16 @@ class TriangleMesh3D(ThreeDScene):
         self.add_fixed_in_frame_mobjects(rotate_text)
         self.play(Write(rotate_text))
         
-        angle = PI/4
         self.play(
-            all_mesh_objects.animate.apply_function(
+            self.deform_stage(
+                all_mesh_objects, sphere, compressed, rotated,
                 lambda p: [
                     p[0] * np.cos(angle) - p[1] * np.sin(angle),
                     p[0] * np.sin(angle) + p[1] * np.cos(angle),
                     p[2]
                 ]
             ),
-            run_time=2
+            run_time=self.cfg.deform_run_time
         )
         self.wait(2)
         
@@ -384,4 +381,30 @@ class TriangleMesh3D(ThreeDScene):
         all_display_objects = ([title, axes, axis_labels, count_text, conclusion] + 
                              sphere_triangles)
         self.play(*[FadeOut(obj) for obj in all_display_objects])
-        self.wait(1)
\ No newline at end of file
+        self.wait(1)
+        if self.cfg.chunked_mesh:
+            logger.info(self.renderer.camera.memory_report())
+
+    def mesh_triangles(self, mesh, index):
+        """网格的三角形面（颜色取 SPHERE_PALETTE[index]）；分块模式下整张网格只是一个 mobject"""
+        if self.cfg.chunked_mesh:
+            return [ChunkedMesh(mesh, palette_rgba(SPHERE_PALETTE, index, 0.4),
+                                palette_rgba(SPHERE_PALETTE, index), face_width=1)]
+        return [
+            Polygon(*points, color=SPHERE_PALETTE[c], fill_opacity=0.4, stroke_width=1)
+            for points, c in zip(mesh.face_points(), index)
+        ]
+
+    def deform_stage(self, group, sphere, start, end, apply):
+        """
+        球面的一段变形：逐 Polygon 且不着色时沿用 apply_function；
+        应变着色或分块模式下走 morph 的整块插值（坐标 start → end）
+        """
+        binding = ChunkedBinding(group[0]) if self.cfg.chunked_mesh else None
+        if self.cfg.strain_colors:
+            # 面积变化着色：顶点与颜色整块更新，不经过逐对象的 Transform
+            lut = ColorLUT(self.cfg.strain_colormap, -self.cfg.strain_range, self.cfg.strain_range)
+            return StrainDeform(group, sphere, start, end, lut, binding=binding)
+        if binding is not None:
+            return MorphAnimation(MorphChain([start, end]), 0, [binding])
+        return group.animate.apply_function(apply)
\ No newline at end of file
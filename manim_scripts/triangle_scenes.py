@@ -1,8 +1,47 @@
 from manim import *
 import numpy as np
 
-class TriangleDecomposition(Scene):
+from dirty_rect_camera import DirtyRectCamera
+from frame_pipeline import PipelinedWriterMixin
+from geometry import MeshGeometry
+from morph import FaceBinding, MorphAnimation, MorphChain, PointBinding
+from scene_config import load_scene_config
+
+
+def lift_head(points):
+    """抬头：头部区域向后倾斜（负的剪切）并向上抬起，下巴区域只轻微剪切"""
+    x, y = points[:, 0], points[:, 1]
+    upper = y > 0
+    return np.column_stack([np.where(upper, x - y * 0.2, x - y * 0.1), np.where(upper, y + 0.3, y), points[:, 2]])
+
+
+def twist_head(points):
+    """扭头：上半部分向右偏移，模拟侧向转动；下巴区域保持稳定"""
+    x, y = points[:, 0], points[:, 1]
+    return np.column_stack([np.where(y > 0, x + y * 0.3, x), y, points[:, 2]])
+
+
+def turn_head(points):
+    """转头：右侧脸颊收缩并略微向下，左侧脸颊拉伸"""
+    x, y = points[:, 0], points[:, 1]
+    right = x > 0
+    return np.column_stack([np.where(right, x * 0.8, x * 1.1), np.where(right, y - x * 0.2, y - x * 0.15), points[:, 2]])
+
+
+def coordinate_labels(mesh):
+    """顶点标签：中心固定写 (0, 0)，其余为一位小数的坐标"""
+    return ["(0, 0)"] + [f"({x:.1f}, {y:.1f})" for x, y, _ in mesh.positions[1:]]
+
+
+class TriangleDecomposition(PipelinedWriterMixin, Scene):
+    def __init__(self, **kwargs):
+        # 画面大部分静止，只重绘变化区域
+        kwargs.setdefault("camera_class", DirtyRectCamera)
+        super().__init__(**kwargs)
+
     def construct(self):
+        self.cfg = load_scene_config("triangle_decomposition")
+
         # 标题
         title = Text("2D三角形分解", font_size=36, color=BLUE)
         title.to_edge(UP, buff=0.3)
@@ -27,21 +66,8 @@ class TriangleDecomposition(Scene):
         self.wait(0.5)
         
         # 1. 绘制平滑的人脸轮廓 - 通过关键点的样条曲线
-        # 定义人脸关键点（整数坐标，便于后续采样）
-        face_key_points = [
-            [0, 2.5],      # 头顶
-            [1, 2.3],      # 右上额头
-            [1.8, 1.5],    # 右太阳穴
-            [2.0, 0.5],    # 右脸颊上
-            [1.8, -0.5],   # 右脸颊下
-            [1.2, -1.2],   # 右下颌
-            [0, -1.5],     # 下巴
-            [-1.2, -1.2],  # 左下颌
-            [-1.8, -0.5],  # 左脸颊下
-            [-2.0, 0.5],   # 左脸颊上
-            [-1.8, 1.5],   # 左太阳穴
-            [-1, 2.3],     # 左上额头
-        ]
+        # 人脸关键点（默认：头顶、额头、太阳穴、脸颊、下颌、下巴，顺时针一圈）
+        face_key_points = [list(p) for p in self.cfg.face_key_points]
         
         # 使用这些点创建平滑的人脸轮廓
         face_points_3d = [[p[0], p[1], 0] for p in face_key_points]
@@ -62,28 +88,20 @@ class TriangleDecomposition(Scene):
         # 2. 粗糙拟合对比 - 从人脸关键点采样
         self.play(FadeOut(head_label))
         
-        rough_text = Text("拟合1: 6个三角形", font_size=18, color=BLUE)
+        # 从人脸关键点中采样（粗糙拟合，默认每隔2个点采样）
+        rough_indices = list(self.cfg.rough_indices)
+        rough_text = Text(f"拟合1: {len(rough_indices)}个三角形", font_size=18, color=BLUE)
         rough_text.to_corner(UL, buff=0.5)
         self.play(Write(rough_text))
         
         center = [0, 0, 0]
-        # 从人脸关键点中采样6个点（粗糙拟合）
-        rough_indices = [0, 2, 4, 6, 8, 10]  # 每隔2个点采样
-        rough_points = [face_key_points[i] for i in rough_indices]
-        rough_points_3d = [[p[0], p[1], 0] for p in rough_points]
-        
-        triangles_rough = []
+        rough_mesh = MeshGeometry.fan(center, [face_key_points[i] for i in rough_indices])
         colors = [RED, GREEN, ORANGE, PURPLE, PINK, TEAL]
-        
-        for i in range(len(rough_points_3d)):
-            next_i = (i + 1) % len(rough_points_3d)
-            triangle = Polygon(center, rough_points_3d[i], rough_points_3d[next_i],
-                             color=colors[i], fill_opacity=0.5, stroke_width=2)
-            triangles_rough.append(triangle)
+        triangles_rough = self.fan_triangles(rough_mesh, colors, fill_opacity=0.5)
         
         # 保留原图形，显示拟合对比
         for triangle in triangles_rough:
-            self.play(Create(triangle), run_time=0.3)
+            self.play(Create(triangle), run_time=self.cfg.rough_run_time)
         
         error_text = Text("误差较大", font_size=16, color=RED)
         error_text.to_corner(UR, buff=0.5)
@@ -94,26 +112,18 @@ class TriangleDecomposition(Scene):
         self.play(FadeOut(rough_text), FadeOut(error_text), 
                   *[FadeOut(tri) for tri in triangles_rough])
         
-        fine_text = Text("拟合2: 12个三角形", font_size=18, color=BLUE)
+        fine_text = Text(f"拟合2: {len(face_key_points)}个三角形", font_size=18, color=BLUE)
         fine_text.to_corner(UL, buff=0.5)
         self.play(Write(fine_text))
         
-        # 使用所有人脸关键点（精细拟合）
-        fine_points = face_key_points.copy()
-        fine_points_3d = [[p[0], p[1], 0] for p in fine_points]
-        
-        triangles = []
+        # 使用所有人脸关键点（精细拟合）；顶点 0 为中心，顶点 i+1 为第 i 个关键点
+        face_mesh = MeshGeometry.fan(center, face_key_points)
+        face_mesh = face_mesh.with_labels(coordinate_labels(face_mesh))
         colors_extended = colors + [MAROON, GOLD, BLUE_A, YELLOW_A, LIGHT_PINK, LIGHT_BROWN]
-        
-        for i in range(len(fine_points_3d)):
-            next_i = (i + 1) % len(fine_points_3d)
-            triangle = Polygon(center, fine_points_3d[i], fine_points_3d[next_i],
-                             color=colors_extended[i % len(colors_extended)], 
-                             fill_opacity=0.6, stroke_width=2)
-            triangles.append(triangle)
+        triangles = self.fan_triangles(face_mesh, colors_extended, fill_opacity=0.6)
         
         for triangle in triangles:
-            self.play(Create(triangle), run_time=0.2)
+            self.play(Create(triangle), run_time=self.cfg.fine_run_time)
         
         better_text = Text("精度提升", font_size=16, color=GREEN)
         better_text.to_corner(UR, buff=0.5)
@@ -134,26 +144,9 @@ class TriangleDecomposition(Scene):
         coord_text.to_corner(UL, buff=0.5)
         self.play(Write(coord_text))
         
-        # 选择更有代表性的关键点：中心、右脸颊上、左下颌
-        key_points = [center, fine_points_3d[3], fine_points_3d[7]]  # 中心、右脸颊上、左下颌
-        key_coords = ["(0, 0)", "(2.0, 0.5)", "(-1.2, -1.2)"]
-        
-        dots = []
-        labels = []
-        
-        for point, coord_label in zip(key_points, key_coords):
-            dot = Dot(point, color=WHITE, radius=0.05)
-            label = Text(coord_label, font_size=14, color=WHITE)
-            
-            if point[0] < -1:
-                label.next_to(dot, LEFT, buff=0.1)
-            elif point[0] > 1:
-                label.next_to(dot, RIGHT, buff=0.1)
-            else:
-                label.next_to(dot, DOWN, buff=0.1)
-            
-            dots.append(dot)
-            labels.append(label)
+        # 选择更有代表性的关键点：中心 + 配置中的顶点（默认右脸颊上、左下颌）
+        key_vertices = [0] + [1 + i for i in self.cfg.key_point_indices]
+        dots, labels = self.key_markers(face_mesh, key_vertices)
         
         for dot, label in zip(dots, labels):
             self.play(Create(dot), Write(label), run_time=0.4)
@@ -163,191 +156,44 @@ class TriangleDecomposition(Scene):
         # 6. 多种线性变换演示
         self.play(FadeOut(coord_text))
         
-        # 第一种变换：抬头效果（实际的旋转变换）
-        transform_text1 = Text("变换1: 抬头（旋转）", font_size=20, color=ORANGE)
-        transform_text1.to_corner(UL, buff=0.5)
-        
+        # 第一种变换：抬头（rotation）；第二种：扭头（侧转）；第三种：转头（水平旋转）
         # 抬头是绕X轴的旋转，在2D中表现为头部向上倾斜
-        matrix_text1 = MathTex(r"\begin{bmatrix} 1 & -0.2 \\ 0 & 1 \end{bmatrix}", font_size=24, color=BLUE)
-        matrix_text1.to_corner(DR, buff=0.5)
-        
-        self.play(Write(transform_text1), Write(matrix_text1))
-        
-        # 创建抬头变形：实际的旋转+平移效果
-        lift_points = []
-        for p in fine_points:
-            x, y = p[0], p[1]
-            # 抬头变换：头部区域向后倾斜（负的剪切）+ 上部区域向上平移
-            if y > 0:
-                # 头部向后倾斜
-                new_x = x - y * 0.2  # 剪切变换，头部向后倾
-                new_y = y + 0.3      # 头部向上抬起
-            else:
-                # 下巴区域保持相对稳定
-                new_x = x - y * 0.1  # 轻微剪切
-                new_y = y
-            lift_points.append([new_x, new_y, 0])
-        
-        lift_key_points = [center, lift_points[3], lift_points[7]]  # 对应右脸颊上、左下颌
-        lift_coords = ["(0, 0)", f"({lift_points[3][0]:.1f}, {lift_points[3][1]:.1f})", f"({lift_points[7][0]:.1f}, {lift_points[7][1]:.1f})"]
-        
-        new_triangles1 = []
-        for i in range(len(lift_points)):
-            next_i = (i + 1) % len(lift_points)
-            triangle = Polygon(center, lift_points[i], lift_points[next_i],
-                             color=colors_extended[i % len(colors_extended)], 
-                             fill_opacity=0.6, stroke_width=2)
-            new_triangles1.append(triangle)
-        
-        new_dots1 = []
-        new_labels1 = []
-        for point, coord_label in zip(lift_key_points, lift_coords):
-            dot = Dot(point, color=WHITE, radius=0.05)
-            label = Text(coord_label, font_size=14, color=WHITE)
-            
-            if point[0] < -1:
-                label.next_to(dot, LEFT, buff=0.1)
-            elif point[0] > 1:
-                label.next_to(dot, RIGHT, buff=0.1)
-            else:
-                label.next_to(dot, DOWN, buff=0.1)
-            
-            new_dots1.append(dot)
-            new_labels1.append(label)
-        
-        # 执行抬头变形
-        transforms1 = [Transform(old, new) for old, new in zip(triangles, new_triangles1)]
-        dot_transforms1 = [Transform(old, new) for old, new in zip(dots, new_dots1)]
-        label_transforms1 = [Transform(old, new) for old, new in zip(labels, new_labels1)]
-        
-        self.play(*transforms1, *dot_transforms1, *label_transforms1, run_time=2)
-        self.wait(1.5)
-        
-        # 第二种变换：扭头（侧向旋转）
-        self.play(FadeOut(transform_text1), FadeOut(matrix_text1))
-        
-        transform_text2 = Text("变换2: 扭头（侧转）", font_size=20, color=ORANGE)
-        transform_text2.to_corner(UL, buff=0.5)
-        
-        matrix_text2 = MathTex(r"\begin{bmatrix} 1 & 0.3 \\ 0 & 1 \end{bmatrix}", font_size=24, color=BLUE)
-        matrix_text2.to_corner(DR, buff=0.5)
-        
-        self.play(Write(transform_text2), Write(matrix_text2))
-        
-        # 创建扭头变形：头部向右转动
-        twist_points = []
-        for p in lift_points:
-            x, y = p[0], p[1]
-            # 扭头效果：头部区域向右偏移，模拟侧向转动
-            if y > 0:
-                # 头部区域向右扭转
-                new_x = x + y * 0.3  # 上半部分向右移动
-                new_y = y
-            else:
-                # 下巴区域保持稳定
-                new_x = x
-                new_y = y
-            twist_points.append([new_x, new_y, p[2]])
-        
-        compress_points = twist_points
-        compress_key_points = [center, compress_points[3], compress_points[7]]
-        compress_coords = ["(0, 0)", f"({compress_points[3][0]:.1f}, {compress_points[3][1]:.1f})", f"({compress_points[7][0]:.1f}, {compress_points[7][1]:.1f})"]
-        
-        new_triangles2 = []
-        for i in range(len(compress_points)):
-            next_i = (i + 1) % len(compress_points)
-            triangle = Polygon(center, compress_points[i], compress_points[next_i],
-                             color=colors_extended[i % len(colors_extended)], 
-                             fill_opacity=0.6, stroke_width=2)
-            new_triangles2.append(triangle)
-        
-        new_dots2 = []
-        new_labels2 = []
-        for point, coord_label in zip(compress_key_points, compress_coords):
-            dot = Dot(point, color=WHITE, radius=0.05)
-            label = Text(coord_label, font_size=14, color=WHITE)
-            
-            if point[0] < -1:
-                label.next_to(dot, LEFT, buff=0.1)
-            elif point[0] > 1:
-                label.next_to(dot, RIGHT, buff=0.1)
-            else:
-                label.next_to(dot, DOWN, buff=0.1)
-            
-            new_dots2.append(dot)
-            new_labels2.append(label)
-        
-        transforms2 = [Transform(tri, new_tri) for tri, new_tri in zip(triangles, new_triangles2)]
-        dot_transforms2 = [Transform(dot, new_dot) for dot, new_dot in zip(dots, new_dots2)]
-        label_transforms2 = [Transform(label, new_label) for label, new_label in zip(labels, new_labels2)]
-        
-        self.play(*transforms2, *dot_transforms2, *label_transforms2, run_time=2)
-        self.wait(1.5)
-        
-        # 第三种变换：转头（水平旋转）
-        self.play(FadeOut(transform_text2), FadeOut(matrix_text2))
-        
-        transform_text3 = Text("变换3: 转头（水平旋转）", font_size=20, color=ORANGE)
-        transform_text3.to_corner(UL, buff=0.5)
-        
-        matrix_text3 = MathTex(r"\begin{bmatrix} 0.8 & 0 \\ -0.2 & 1 \end{bmatrix}", font_size=24, color=BLUE)
-        matrix_text3.to_corner(DR, buff=0.5)
-        
-        self.play(Write(transform_text3), Write(matrix_text3))
-        
-        # 创建转头变形：头部水平旋转效果
-        turn_points = []
-        for p in compress_points:
-            x, y = p[0], p[1]
-            # 转头效果：模拟头部向右水平转动，右侧收缩，左侧拉伸
-            if x > 0:
-                # 右侧脸颊收缩
-                new_x = x * 0.8
-                new_y = y - x * 0.2  # 右侧略微向下
-            else:
-                # 左侧脸颊拉伸
-                new_x = x * 1.1
-                new_y = y - x * 0.15  # 左侧略微向上（x为负，所以实际是向下）
-            turn_points.append([new_x, new_y, p[2]])
-        
-        shear_points = turn_points
-        
-        shear_key_points = [center, shear_points[3], shear_points[7]]
-        shear_coords = ["(0, 0)", f"({shear_points[3][0]:.1f}, {shear_points[3][1]:.1f})", f"({shear_points[7][0]:.1f}, {shear_points[7][1]:.1f})"]
-        
-        new_triangles3 = []
-        for i in range(len(shear_points)):
-            next_i = (i + 1) % len(shear_points)
-            triangle = Polygon(center, shear_points[i], shear_points[next_i],
-                             color=colors_extended[i % len(colors_extended)], 
-                             fill_opacity=0.6, stroke_width=2)
-            new_triangles3.append(triangle)
-        
-        new_dots3 = []
-        new_labels3 = []
-        for point, coord_label in zip(shear_key_points, shear_coords):
-            dot = Dot(point, color=WHITE, radius=0.05)
-            label = Text(coord_label, font_size=14, color=WHITE)
+        stages = [
+            ("变换1: 抬头（旋转）", r"\begin{bmatrix} 1 & -0.2 \\ 0 & 1 \end{bmatrix}", lift_head, 1.5),
+            ("变换2: 扭头（侧转）", r"\begin{bmatrix} 1 & 0.3 \\ 0 & 1 \end{bmatrix}", twist_head, 1.5),
+            ("变换3: 转头（水平旋转）", r"\begin{bmatrix} 0.8 & 0 \\ -0.2 & 1 \end{bmatrix}", turn_head, 2),
+        ]
+        # 三次变换的顶点坐标一次算好，串成关键帧链；三角形与圆点每帧直接插值，不再新建 mobject
+        keyframes = [face_mesh.positions]
+        for _, _, deform, _ in stages:
+            keyframes.append(deform(keyframes[-1]))
+        chain = MorphChain(keyframes)
+        bindings = [FaceBinding(triangles, face_mesh.faces), PointBinding(dots, key_vertices)]
+        previous = None
+        for segment, (caption, matrix, _, hold) in enumerate(stages):
+            if previous is not None:
+                self.play(*[FadeOut(obj) for obj in previous])
+            transform_text = Text(caption, font_size=20, color=ORANGE)
+            transform_text.to_corner(UL, buff=0.5)
+            matrix_text = MathTex(matrix, font_size=24, color=BLUE)
+            matrix_text.to_corner(DR, buff=0.5)
+            self.play(Write(transform_text), Write(matrix_text))
             
-            if point[0] < -1:
-                label.next_to(dot, LEFT, buff=0.1)
-            elif point[0] > 1:
-                label.next_to(dot, RIGHT, buff=0.1)
-            else:
-                label.next_to(dot, DOWN, buff=0.1)
+            # 坐标标签的文字会变，仍按新坐标重新生成
+            mesh = face_mesh.with_positions(chain.keyframes[segment + 1])
+            mesh = mesh.with_labels(coordinate_labels(mesh))
+            _, new_labels = self.key_markers(mesh, key_vertices)
             
-            new_dots3.append(dot)
-            new_labels3.append(label)
-        
-        transforms3 = [Transform(tri, new_tri) for tri, new_tri in zip(triangles, new_triangles3)]
-        dot_transforms3 = [Transform(dot, new_dot) for dot, new_dot in zip(dots, new_dots3)]
-        label_transforms3 = [Transform(label, new_label) for label, new_label in zip(labels, new_labels3)]
-        
-        self.play(*transforms3, *dot_transforms3, *label_transforms3, run_time=2)
-        self.wait(2)
+            self.play(
+                MorphAnimation(chain, segment, bindings),
+                *[Transform(old, new) for old, new in zip(labels, new_labels)],
+                run_time=self.cfg.transform_run_time
+            )
+            self.wait(hold)
+            previous = (transform_text, matrix_text)
         
         # 清理变换标签
-        self.play(FadeOut(transform_text3), FadeOut(matrix_text3))
+        self.play(*[FadeOut(obj) for obj in previous])
         
         # 7. 总结
         conclusion = VGroup(
@@ -366,4 +212,34 @@ class TriangleDecomposition(Scene):
         # 清场
         all_objects = [title, axes, x_label, y_label, conclusion] + triangles + dots + labels
         self.play(*[FadeOut(obj) for obj in all_objects])
-        self.wait(1)
\ No newline at end of file
+        self.wait(1)
+
+    # ----------------------------------------------------------
+    # 由几何生成 mobject
+    # ----------------------------------------------------------
+    @staticmethod
+    def fan_triangles(mesh, colors, fill_opacity):
+        return [
+            Polygon(*points, color=colors[i % len(colors)], fill_opacity=fill_opacity, stroke_width=2)
+            for i, points in enumerate(mesh.face_points())
+        ]
+
+    @staticmethod
+    def key_markers(mesh, key_vertices):
+        """关键顶点的圆点与坐标标签；标签放在远离中心的一侧"""
+        dots, labels = [], []
+        for i in key_vertices:
+            point = mesh.vertex(i)
+            dot = Dot(point, color=WHITE, radius=0.05)
+            label = Text(mesh.labels[i], font_size=14, color=WHITE)
+            
+            if point[0] < -1:
+                label.next_to(dot, LEFT, buff=0.1)
+            elif point[0] > 1:
+                label.next_to(dot, RIGHT, buff=0.1)
+            else:
+                label.next_to(dot, DOWN, buff=0.1)
+            
+            dots.append(dot)
+            labels.append(label)
+        return dots, labels
@@ -0,0 +1,242 @@
+# web_export.py
+"""
+交互演示数据导出
+–––––––––––––––––––––––
+把 TriangleMesh3D 的网格和 TetrahedronPhysics 的弹簧网络 / 逐帧顶点轨迹
+写成小端序二进制 + JSON 索引，供 interactive/ 里的网页直接 fetch：
+
+    interactive/data/index.json                 数组目录（偏移、字节数、类型、形状、反量化参数）
+    interactive/data/triangle_mesh_3d.bin       各数组首尾相接，偏移按 8 字节对齐
+    interactive/data/tetrahedron_physics.bin
+
+网页端读取方式：
+    const buf = await (await fetch(url)).arrayBuffer();
+    const q = new Int16Array(buf, a.offset, a.length / 2);   // a = index.scenes[..].arrays[..]
+    x = a.quant.offset[axis] + (q[i] + 32768) * a.quant.scale[axis]
+轨迹数组 (帧, 顶点, 3) 每帧连续存放，可以用 Range: bytes=offset+f*frame_bytes- 按需流式读取。
+只导出部分场景（--section）时，index.json 中其他场景的条目保留不变。
+轨迹的恢复段与场景一致：recovery_mode="modal" 时取模态响应，否则线性插值回静止形状。
+BinaryWriter / sample_stages / sample_response 只依赖 numpy；manim 与场景模块在导出对应场景时才导入。
+
+用法：
+    python manim_scripts/web_export.py                      # 默认 int16 量化
+    python manim_scripts/web_export.py --precision float32 --fps 24
+"""
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+
+from geometry import lattice_tetrahedra, scene_lattice
+from scene_config import load_scene_config
+
+FORMAT_VERSION = 1
+ALIGNMENT = 8
+PRECISIONS = ("float32", "float16", "int16")
+
+
+class BinaryWriter:
+    """把若干数组依次写入一个 .bin，记录每个数组在 JSON 索引中的描述"""
+
+    def __init__(self, precision="int16"):
+        if precision not in PRECISIONS:
+            raise ValueError(f"未知精度：{precision}（可选 {', '.join(PRECISIONS)}）")
+        self.precision = precision
+        self.chunks = []
+        self.size = 0
+        self.arrays = {}
+
+    def _append(self, name, data, meta):
+        if name in self.arrays:
+            raise ValueError(f"数组重名：{name}")
+        pad = -self.size % ALIGNMENT
+        if pad:
+            self.chunks.append(b"\0" * pad)
+            self.size += pad
+        raw = np.ascontiguousarray(data).astype(data.dtype.newbyteorder("<"), copy=False).tobytes()
+        self.arrays[name] = {"offset": self.size, "length": len(raw), "dtype": data.dtype.name,
+                             "shape": list(data.shape), **meta}
+        self.chunks.append(raw)
+        self.size += len(raw)
+        return self.arrays[name]
+
+    def add_positions(self, name, positions):
+        """坐标数组 (..., 3)：按精度设置存为 float32 / float16 / 按轴量化的 int16"""
+        positions = np.asarray(positions, dtype=np.float64)
+        if self.precision == "float32":
+            return self._append(name, positions.astype(np.float32), {})
+        if self.precision == "float16":
+            return self._append(name, positions.astype(np.float16), {})
+        flat = positions.reshape(-1, positions.shape[-1])
+        lo, hi = flat.min(axis=0), flat.max(axis=0)
+        scale = np.where(hi > lo, (hi - lo) / 65535.0, 1.0)
+        q = np.rint((positions - lo) / scale) - 32768
+        meta = {"quant": {"offset": lo.tolist(), "scale": scale.tolist()}}
+        return self._append(name, np.clip(q, -32768, 32767).astype(np.int16), meta)
+
+    def add_indices(self, name, indices):
+        """面 / 边的顶点下标：顶点少于 65536 时用 uint16"""
+        indices = np.asarray(indices, dtype=np.int64)
+        dtype = np.uint16 if indices.size == 0 or indices.max() < 65536 else np.uint32
+        return self._append(name, indices.astype(dtype), {})
+
+    def add_colors(self, name, colors):
+        from manim import ManimColor
+
+        rgb = np.array([ManimColor(c).to_rgb() for c in colors])
+        return self._append(name, np.rint(rgb * 255).astype(np.uint8), {})
+
+    def add_trajectory(self, name, frames, fps):
+        entry = self.add_positions(name, frames)
+        entry["fps"] = fps
+        entry["frame_bytes"] = entry["length"] // max(len(frames), 1)
+        return entry
+
+    def write(self, path):
+        with open(path, "wb") as f:
+            for chunk in self.chunks:
+                f.write(chunk)
+        return self.size
+
+
+def sample_stages(keyframes, durations, fps, rate_func=None):
+    """关键帧之间按 rate_func（默认 manim 的 smooth）缓动插值，返回 (帧, 顶点, 3)；首帧为 keyframes[0]"""
+    if rate_func is None:
+        from manim.utils.rate_functions import smooth as rate_func
+    keyframes = [np.asarray(k, dtype=np.float64) for k in keyframes]
+    frames = [keyframes[0][None]]
+    for a, b, duration in zip(keyframes, keyframes[1:], durations):
+        count = max(1, int(round(duration * fps)))
+        alphas = np.array([rate_func(k / count) for k in range(1, count + 1)])
+        frames.append(a[None] + (b - a)[None] * alphas[:, None, None])
+    return np.concatenate(frames)
+
+
+def sample_response(response, duration, fps):
+    """ModalResponse 之类的响应按线性归一化时间逐帧求值，返回 (帧, 顶点, 3)；与 sample_stages 一样不含 t = 0"""
+    count = max(1, int(round(duration * fps)))
+    return np.stack([np.array(response.at(0, k / count)) for k in range(1, count + 1)])
+
+
+def export_triangle_mesh_3d(cfg, writer, fps):
+    from triangle_mesh_3d import OCTA_MESH, TETRA_MESH, sphere_mesh
+
+    meshes = {
+        "tetrahedron": TETRA_MESH,
+        "octahedron": OCTA_MESH,
+        "sphere": sphere_mesh(cfg.u_segments, cfg.v_segments, cfg.sphere_radius),
+    }
+    for name, mesh in meshes.items():
+        writer.add_positions(f"{name}.vertices", mesh.positions)
+        writer.add_indices(f"{name}.faces", mesh.faces)
+        writer.add_colors(f"{name}.colors", mesh.face_colors)
+
+    # 球面的拉伸 → 压缩 → 旋转
+    rest = meshes["sphere"].positions
+    angle = np.deg2rad(cfg.rotate_degrees)
+    rotate = np.array([[np.cos(angle), -np.sin(angle), 0], [np.sin(angle), np.cos(angle), 0], [0, 0, 1]])
+    stretched = rest * np.array(cfg.stretch_scale)
+    compressed = stretched * np.array(cfg.compress_scale)
+    rotated = compressed @ rotate.T
+    writer.add_trajectory("sphere.deform", sample_stages(
+        [rest, stretched, compressed, rotated], [cfg.deform_run_time] * 3, fps), fps)
+    return {"meshes": list(meshes), "trajectories": ["sphere.deform"]}
+
+
+def export_tetrahedron_physics(cfg, writer, fps):
+    from tetrahedron_physics import TETRA_NETWORK, recovery_response, stage_positions
+
+    modal = cfg.recovery_mode == "modal"
+    rest = TETRA_NETWORK.positions
+    pushed = rest.copy()
+    pushed[0] += np.array(cfg.force_vec)
+    writer.add_indices("tetra.edges", TETRA_NETWORK.edges)
+    if modal:
+        response = recovery_response(rest, pushed, np.array([[0, 1, 2, 3]]), cfg)
+        tetra = np.concatenate([sample_stages([rest, pushed], [cfg.deform_run_time], fps),
+                                sample_response(response, cfg.deform_run_time, fps)])
+    else:
+        tetra = sample_stages([rest, pushed, rest], [cfg.deform_run_time] * 2, fps)
+    writer.add_trajectory("tetra.deform", tetra, fps)
+
+    lattice = scene_lattice(cfg)
+    gravity, compressed = stage_positions(lattice, cfg)
+    writer.add_indices("lattice.edges", lattice.edges)
+    if modal:
+        response = recovery_response(lattice.positions, compressed,
+                                     lattice_tetrahedra(cfg.lattice_cells, cfg.lattice_count), cfg)
+        frames = np.concatenate([
+            sample_stages([lattice.positions, gravity, compressed],
+                          [cfg.gravity_run_time, cfg.compression_run_time], fps),
+            sample_response(response, cfg.recovery_run_time, fps),
+        ])
+    else:
+        frames = sample_stages([lattice.positions, gravity, compressed, lattice.positions],
+                               [cfg.gravity_run_time, cfg.compression_run_time, cfg.recovery_run_time], fps)
+    writer.add_trajectory("lattice.simulation", frames, fps)
+    return {"networks": ["tetra", "lattice"], "trajectories": ["tetra.deform", "lattice.simulation"]}
+
+
+EXPORTERS = {
+    "triangle_mesh_3d": export_triangle_mesh_3d,
+    "tetrahedron_physics": export_tetrahedron_physics,
+}
+
+
+def load_index(index_path):
+    """已有的 index.json：版本一致时保留 .bin 仍在的场景条目，否则从空目录开始"""
+    index_path = Path(index_path)
+    index = {"version": FORMAT_VERSION, "endian": "little", "scenes": {}}
+    if not index_path.exists():
+        return index
+    try:
+        existing = json.loads(index_path.read_text(encoding="utf-8"))
+    except ValueError:
+        return index
+    if existing.get("version") != FORMAT_VERSION:
+        return index
+    index["scenes"] = {
+        section: scene for section, scene in existing.get("scenes", {}).items()
+        if (index_path.parent / scene.get("file", "")).is_file()
+    }
+    return index
+
+
+def export(output_dir, precision="int16", fps=30, sections=None, **config_kwargs):
+    """导出 sections（默认全部）并更新 index.json 中对应的场景条目；每个场景自带 precision"""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    index_path = output_dir / "index.json"
+    index = load_index(index_path)
+    index["precision"] = precision
+    for section in sections or EXPORTERS:
+        writer = BinaryWriter(precision)
+        summary = EXPORTERS[section](load_scene_config(section, **config_kwargs), writer, fps)
+        filename = f"{section}.bin"
+        size = writer.write(output_dir / filename)
+        index["scenes"][section] = {"file": filename, "bytes": size, "precision": precision, **summary,
+                                    "arrays": writer.arrays}
+    index_path.write_text(json.dumps(index, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    return index_path, index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="导出交互演示用的网格 / 轨迹二进制数据")
+    parser.add_argument("--output-dir", type=Path, default=Path("interactive") / "data")
+    parser.add_argument("--precision", choices=PRECISIONS, default="int16")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--section", action="append", choices=sorted(EXPORTERS), help="只导出指定场景，可重复")
+    parser.add_argument("--config", help="场景配置 TOML 文件（LESSON_CONFIG）")
+    parser.add_argument("--preset", help="场景配置预设（LESSON_PRESET）")
+    args = parser.parse_args(argv)
+
+    index_path, index = export(args.output_dir, args.precision, args.fps, args.section,
+                               path=args.config, preset=args.preset)
+    for section, scene in index["scenes"].items():
+        print(f"{section}: {scene['bytes'] / 1024:.1f} KiB（{len(scene['arrays'])} 个数组）")
+    print(index_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+# conftest.py
+"""
+测试共用的几何构造
+–––––––––––––––––––––––
+manim_scripts 里的模块按同目录导入（from geometry import ...），这里把目录加到 sys.path；
+晶格直接用场景的 geometry.cube_lattice / lattice_tetrahedra，封闭球面用斐波那契点的凸包。
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from scipy.spatial import ConvexHull
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "manim_scripts"))
+
+from geometry import MeshGeometry, cube_lattice, lattice_tetrahedra  # noqa: E402
+
+
+def block(cells=2, size=1.0, offset=(0.0, 0.0, 0.0)):
+    """场景用的立方体晶格（底面中心平移到 offset）和它的四面体剖分"""
+    lattice = cube_lattice(cells, size)
+    return lattice.with_positions(lattice.positions + np.asarray(offset)), lattice_tetrahedra(cells)
+
+
+def sphere(points=400, radius=1.0):
+    """斐波那契球面点的凸包：封闭、每条边恰好被两个面共享，法线朝外"""
+    k = np.arange(points) + 0.5
+    z = 1 - 2 * k / points
+    theta = np.pi * (1 + 5 ** 0.5) * k
+    r = np.sqrt(1 - z * z)
+    positions = radius * np.column_stack([r * np.cos(theta), r * np.sin(theta), z])
+    faces = ConvexHull(positions).simplices.copy()
+    a, b, c = (positions[faces[:, m]] for m in range(3))
+    inward = np.einsum("ij,ij->i", np.cross(b - a, c - a), a) < 0
+    faces[inward, 1:] = faces[inward, :0:-1]
+    return MeshGeometry.from_faces(positions, faces)
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(0)
@@ -0,0 +1,72 @@
+import numpy as np
+
+from collision import Box, CollisionWorld, GroundPlane, SpatialHash
+from geometry import MeshGeometry
+
+
+def test_spatial_hash_matches_brute_force(rng):
+    lo = rng.uniform(-2, 2, size=(40, 3))
+    hi = lo + rng.uniform(0, 0.8, size=(40, 3))
+    points = rng.uniform(-2.5, 2.5, size=(300, 3))
+    grid = SpatialHash(0.5).build(lo, hi)
+    found = set(zip(*(a.tolist() for a in grid.query(points))))
+
+    cell = lambda p: np.floor(p / 0.5)  # noqa: E731
+    pc, lc, hc = cell(points)[:, None], cell(lo)[None], cell(hi)[None]
+    expected = np.argwhere(np.all((pc >= lc) & (pc <= hc), axis=2))
+    assert found == set(map(tuple, expected.tolist()))
+
+
+def test_ground_and_boxes():
+    x = np.array([[0.0, 0.0, -1.0], [0.0, 0.0, 1.0]])
+    assert GroundPlane(0.0).resolve(x).tolist() == [True, False]
+    assert x[:, 2].tolist() == [0.0, 1.0]
+
+    x = np.array([[2.0, 0.0, 0.0], [0.5, 0.0, 0.0]])
+    assert Box((-1, -1, -1), (1, 1, 1)).resolve(x).tolist() == [True, False]
+    assert x[0].tolist() == [1.0, 0.0, 0.0]
+
+    x = np.array([[0.8, 0.1, 0.0], [3.0, 0.0, 0.0]])
+    assert Box((-1, -1, -1), (1, 1, 1), inside=False).resolve(x).tolist() == [True, False]
+    assert x[0].tolist() == [1.0, 0.1, 0.0]
+
+
+def _triangle_and_points(points):
+    triangle = MeshGeometry.from_faces([(0, 0, 0), (1, 0, 0), (0, 1, 0)], [(0, 1, 2)])
+    return [triangle, MeshGeometry(points)]
+
+
+def test_contact_splits_correction_between_vertex_and_triangle():
+    world = CollisionWorld(_triangle_and_points([(0.2, 0.3, -0.1)]), thickness=0.05, cell_size=0.5)
+    x = world.positions()
+    before = x.copy()
+    assert world.resolve_self(x).tolist() == [False, False, False, True]
+    # 约束 (p − Σbᵢxᵢ)·n = thickness 恰好满足，等质量下总位移为 0
+    bary = np.array([0.5, 0.2, 0.3])
+    assert np.isclose(x[3, 2] - bary @ x[:3, 2], 0.05)
+    assert np.allclose((x - before).sum(axis=0), 0)
+    assert np.allclose(x[:, :2], before[:, :2])
+
+
+def test_contacts_on_one_triangle_are_averaged():
+    points = [(0.1, 0.1, -0.2), (0.5, 0.1, -0.2), (0.1, 0.5, -0.2), (0.3, 0.3, -0.2)]
+    world = CollisionWorld(_triangle_and_points(points), thickness=0.01, cell_size=0.5)
+    x = world.positions()
+    world.resolve_self(x)
+    # 四个顶点压在同一个三角形上，三角形的退让不超过单个接触的修正量
+    assert x[:3, 2].min() >= -0.21
+    assert np.all(x[3:, 2] > -0.2)
+
+
+def test_swept_contact_catches_deep_penetration():
+    world = CollisionWorld(_triangle_and_points([(0.2, 0.3, 0.05)]), thickness=0.01, cell_size=0.3)
+    previous = world.positions()
+    current = previous.copy()
+    current[3, 2] = -0.9  # 一步穿到表面以下 0.9，远超一个格子
+
+    stale = current.copy()
+    assert not world.resolve_self(stale).any()
+    assert np.array_equal(stale, current)
+
+    assert world.resolve_self(current, previous)[3]
+    assert np.isclose(current[3, 2] - np.array([0.5, 0.2, 0.3]) @ current[:3, 2], 0.01)
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from frame_regression import block_resize, compare, hamming, phash, pixel_stats, sample_indices
+
+
+def _frame(shift=0, color=(230, 80, 40), height=108, width=192):
+    """深色背景上的渐变条和一个实心圆，圆心可以水平平移 shift 个像素"""
+    y, x = np.mgrid[:height, :width]
+    frame = np.zeros((height, width, 4), dtype=np.uint8)
+    frame[..., 3] = 255
+    frame[..., 2] = (x * 200 // width).astype(np.uint8)
+    disk = (x - 70 - shift) ** 2 + (y - 54) ** 2 < 30 ** 2
+    frame[disk, :3] = color
+    frame[80:95, 120:180, :3] = 255
+    return frame
+
+
+def _meta(count, frame_count=100):
+    return {"times": [float(t) for t in range(count)], "frame_count": frame_count}
+
+
+def test_block_resize_averages_blocks():
+    images = np.arange(16, dtype=np.float64).reshape(1, 4, 4)
+    assert block_resize(images, 2)[0].tolist() == [[2.5, 4.5], [10.5, 12.5]]
+
+
+def test_identical_frames_match_exactly():
+    frames = np.stack([_frame(), _frame(shift=20)])
+    hashes = phash(frames)
+    assert hashes.shape == (2, 8) and hashes.dtype == np.uint8
+    assert hamming(hashes, phash(frames.copy())).tolist() == [0, 0]
+    stats = pixel_stats(frames, frames)
+    assert stats["max"].tolist() == [0, 0] and np.all(np.isinf(stats["psnr"]))
+    assert compare(frames, 100, frames[..., :3], hashes, _meta(2))[0]
+
+
+def test_one_pixel_shift_stays_under_the_threshold():
+    golden = _frame()[None]
+    shifted = _frame(shift=1)[None]
+    assert hamming(phash(shifted), phash(golden))[0] <= 6
+    passed, rows = compare(shifted, 100, golden[..., :3], phash(golden), _meta(1))
+    assert passed and rows[0]["max"] > 0
+
+
+def test_changed_colour_is_flagged():
+    golden = _frame()[None]
+    recoloured = _frame(color=(40, 200, 240))[None]
+    passed, rows = compare(recoloured, 100, golden[..., :3], phash(golden), _meta(1))
+    assert not passed and not rows[0]["ok"]
+    assert rows[0]["changed"] > 0.05
+
+
+def test_frame_count_change_fails_even_when_frames_match():
+    golden = _frame()[None]
+    passed, rows = compare(golden, 99, golden[..., :3], phash(golden), _meta(1))
+    assert not passed and rows[0]["ok"]
+
+
+def test_sample_indices_round_to_frames():
+    assert sample_indices([0.0, 1.04, 2.5], 10) == [0, 10, 25]
+
+
+@pytest.mark.parametrize("threshold, expected", [(0, 1.0), (255, 0.0)])
+def test_changed_fraction_uses_threshold(threshold, expected):
+    golden = np.zeros((1, 4, 4, 3), dtype=np.uint8)
+    frames = np.full((1, 4, 4, 3), 40, dtype=np.uint8)
+    assert pixel_stats(frames, golden, threshold)["changed"][0] == expected
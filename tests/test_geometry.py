@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from geometry import MeshGeometry, cube_lattice, face_edges, lattice_tetrahedra
+
+
+def test_face_edges_unique_in_first_occurrence_order():
+    faces = [(0, 1, 2), (2, 1, 3)]
+    assert face_edges(faces).tolist() == [[0, 1], [1, 2], [2, 0], [1, 3], [3, 2]]
+
+
+def test_fan_closes_the_ring():
+    ring = [(np.cos(a), np.sin(a)) for a in np.linspace(0, 2 * np.pi, 6, endpoint=False)]
+    mesh = MeshGeometry.fan((0, 0, 0), ring)
+    assert mesh.positions.shape == (7, 3)
+    assert mesh.num_faces == 6 and mesh.num_edges == 12
+    assert mesh.faces[-1].tolist() == [0, 6, 1]
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"edges": [(0, 3)]},
+    {"faces": [(0, 1, -1)]},
+    {"names": ["A", "B"]},
+    {"faces": [(0, 1, 2)], "face_colors": []},
+])
+def test_invalid_tables_raise(kwargs):
+    with pytest.raises(ValueError):
+        MeshGeometry(np.zeros((3, 3)), **kwargs)
+
+
+def test_with_positions_shares_topology():
+    mesh = MeshGeometry.from_faces(np.eye(3), [(0, 1, 2)], names=["A", "B", "C"])
+    moved = mesh.with_positions(mesh.positions + 1)
+    assert moved.faces is mesh.faces and moved.names is mesh.names
+    assert np.array_equal(moved.positions, np.eye(3) + 1)
+    with pytest.raises(ValueError):
+        mesh.with_positions(np.zeros((4, 3)))
+
+
+def test_transformed_applies_matrix_then_offset():
+    mesh = MeshGeometry(np.eye(3))
+    rotate = np.array([[0, -1, 0], [1, 0, 0], [0, 0, 1]])
+    out = mesh.transformed(rotate, offset=(0, 0, 1))
+    assert np.allclose(out.positions, [[0, 1, 1], [-1, 0, 1], [0, 0, 2]])
+    assert np.array_equal(mesh.positions, np.eye(3))
+
+
+def test_concatenate_offsets_indices_and_drops_partial_tables():
+    a = MeshGeometry.from_faces(np.eye(3), [(0, 1, 2)], names=["A", "B", "C"], face_colors=["red"])
+    b = MeshGeometry.from_faces(np.eye(3) * 2, [(2, 1, 0)], face_colors=["blue"])
+    mesh = MeshGeometry.concatenate([a, b])
+    assert len(mesh) == 6
+    assert mesh.faces.tolist() == [[0, 1, 2], [5, 4, 3]]
+    assert mesh.edges.max() == 5 and mesh.num_edges == 6
+    assert mesh.names is None
+    assert mesh.face_colors == ("red", "blue")
+    named = MeshGeometry.concatenate([a, b], names=[f"P{k}" for k in range(6)])
+    assert named.index("P4") == 4
+
+
+def test_cube_lattice_single_cell_matches_the_original_network():
+    lattice = cube_lattice(1, 3.0)
+    assert len(lattice) == 8 and lattice.num_edges == 16
+    assert lattice.names[0] == "P1"
+    assert np.allclose(lattice.positions.min(axis=0), [-1.5, -1.5, 0])
+
+
+@pytest.mark.parametrize("cells", [1, 2, 3])
+def test_lattice_tetrahedra_fill_the_cube(cells):
+    lattice = cube_lattice(cells, 2.0)
+    tets = lattice_tetrahedra(cells)
+    corners = lattice.positions[tets]
+    volumes = np.linalg.det(corners[:, 1:] - corners[:, :1]) / 6
+    assert len(tets) == 6 * cells ** 3
+    assert np.all(np.abs(volumes) > 0) and np.isclose(np.abs(volumes).sum(), 8.0)
+    doubled = lattice_tetrahedra(cells, count=2)
+    assert np.array_equal(doubled[len(tets):], tets + (cells + 1) ** 3)
+
+
+@pytest.mark.parametrize("cells", [1, 2])
+def test_lattice_surface_is_closed_and_outward(cells):
+    lattice = cube_lattice(cells, 2.0)
+    directed = lattice.faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)
+    _, counts = np.unique(directed, axis=0, return_counts=True)
+    assert len(lattice.faces) == 12 * cells ** 2 and np.all(counts == 1)
+    tri = lattice.face_points()
+    normals = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+    center = np.array([0.0, 0.0, 1.0])
+    assert np.all(np.einsum("ij,ij->i", normals, tri.mean(axis=1) - center) > 0)
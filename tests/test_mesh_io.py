@@ -0,0 +1,151 @@
+import numpy as np
+import pytest
+from scipy.spatial import cKDTree
+
+from conftest import sphere
+from mesh_io import decimate, fan_triangulate, level_of_detail, load_mesh, save_mesh, weld
+
+
+def _same_triangles(loaded, mesh):
+    """两个网格的三角形相同：顶点按最近点对应回原网格，面按下标轮换后比较（与编号、面的顺序无关）"""
+    distance, match = cKDTree(mesh.positions).query(loaded.positions)
+    if distance.max() > 1e-6:
+        return False
+
+    def key(faces):
+        start = np.argmin(faces, axis=1)[:, None]
+        return sorted(map(tuple, np.take_along_axis(faces, (start + np.arange(3)) % 3, axis=1).tolist()))
+    return key(match[loaded.faces]) == key(mesh.faces)
+
+
+def _write_ply(path, header, body):
+    path.write_bytes(("ply\n" + header + "end_header\n").encode("ascii") + body)
+    return path
+
+
+@pytest.mark.parametrize("suffix", [".ply", ".stl", ".obj"])
+def test_round_trip(tmp_path, suffix):
+    mesh = sphere(120)
+    save_mesh(tmp_path / f"mesh{suffix}", mesh)
+    loaded = load_mesh(tmp_path / f"mesh{suffix}")
+    assert len(loaded) == len(mesh) and loaded.num_faces == mesh.num_faces
+    assert _same_triangles(loaded, mesh)
+    if suffix != ".stl":  # STL 焊接后顶点重新编号
+        assert np.array_equal(loaded.faces, mesh.faces)
+        assert np.allclose(loaded.positions, mesh.positions, atol=1e-6)
+
+
+def test_unknown_suffix(tmp_path):
+    with pytest.raises(ValueError):
+        save_mesh(tmp_path / "mesh.off", sphere(20))
+    with pytest.raises(ValueError):
+        load_mesh(tmp_path / "mesh.off")
+
+
+def test_obj_comments_slashes_quads_and_negative_indices(tmp_path):
+    path = tmp_path / "quad.obj"
+    path.write_text(
+        "# header comment\n"
+        "v 0 0 0  # origin\n"
+        "v 1 0 0\n"
+        "v 1 1 0\n"
+        "v 0 1 0\n"
+        "vn 0 0 1\n"
+        "f 1/1/1 2/2/1 3/3/1 4/4/1  # quad\n"
+        "f -4 -2 -1\n",
+        encoding="utf-8",
+    )
+    mesh = load_mesh(path)
+    assert mesh.positions.shape == (4, 3)
+    assert mesh.faces.tolist() == [[0, 1, 2], [0, 2, 3], [0, 2, 3]]
+
+
+def test_fan_triangulate_keeps_polygon_order():
+    faces = fan_triangulate([0, 1, 2, 3, 4, 5, 6, 7, 8], [4, 5])
+    assert faces.tolist() == [[0, 1, 2], [0, 2, 3], [4, 5, 6], [4, 6, 7], [4, 7, 8]]
+    with pytest.raises(ValueError):
+        fan_triangulate([0, 1], [2])
+
+
+@pytest.mark.parametrize("endian", ["<", ">"])
+def test_binary_ply_mixed_arity_and_extra_properties(tmp_path, endian, rng):
+    positions = rng.normal(size=(40, 3))
+    # 先是一长串三角形（读取窗口逐步放大），再是随机混合的多边形
+    arity = np.concatenate([np.full(200, 3), rng.choice([3, 4, 5], size=100, p=[0.6, 0.3, 0.1])])
+    polygons = [rng.choice(40, size=k, replace=False) for k in arity]
+    vertices = np.zeros(40, dtype=[("p", f"{endian}f4", 3), ("q", f"{endian}f4")])
+    vertices["p"] = positions
+    body = vertices.tobytes()
+    for polygon in polygons:
+        record = np.zeros(1, dtype=[("n", "u1"), ("v", f"{endian}i4", len(polygon)), ("flag", "u1")])
+        record["n"], record["v"] = len(polygon), polygon
+        body += record.tobytes()
+    name = "little" if endian == "<" else "big"
+    header = (f"format binary_{name}_endian 1.0\ncomment test\n"
+              "element vertex 40\nproperty float x\nproperty float y\nproperty float z\nproperty float quality\n"
+              "element face 300\nproperty list uchar int vertex_indices\nproperty uchar flag\n")
+    mesh = load_mesh(_write_ply(tmp_path / "mixed.ply", header, body))
+    assert np.allclose(mesh.positions, positions.astype(np.float32))
+    assert np.array_equal(mesh.faces, fan_triangulate(np.concatenate(polygons), arity))
+
+
+def test_truncated_binary_ply_raises(tmp_path):
+    header = ("format binary_little_endian 1.0\nelement vertex 3\nproperty float x\nproperty float y\n"
+              "property float z\nelement face 2\nproperty list uchar int vertex_indices\n")
+    body = np.zeros(9, dtype="<f4").tobytes() + bytes([3]) + np.arange(3, dtype="<i4").tobytes()
+    with pytest.raises(ValueError):
+        load_mesh(_write_ply(tmp_path / "short.ply", header, body))
+
+
+def test_ascii_ply(tmp_path):
+    header = ("format ascii 1.0\nelement vertex 4\nproperty float x\nproperty float y\nproperty float z\n"
+              "element face 1\nproperty list uchar int vertex_indices\n")
+    body = b"0 0 0\n1 0 0\n1 1 0\n0 1 0\n4 0 1 2 3\n"
+    mesh = load_mesh(_write_ply(tmp_path / "quad.ply", header, body))
+    assert mesh.faces.tolist() == [[0, 1, 2], [0, 2, 3]]
+
+
+def test_weld_merges_identical_corners():
+    corners = np.array([[0, 0, 0], [1, 0, 0], [0, 0, 0], [1, 0, 0]], dtype=np.float32)
+    positions, inverse = weld(corners)
+    assert len(positions) == 2
+    assert np.array_equal(positions[inverse], corners)
+
+
+def _edge_use(faces):
+    directed = faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)
+    _, undirected = np.unique(np.sort(directed, axis=1), axis=0, return_counts=True)
+    _, oriented = np.unique(directed, axis=0, return_counts=True)
+    return undirected, oriented
+
+
+@pytest.mark.parametrize("target", [400, 120, 30])
+def test_decimate_meets_budget_and_stays_manifold(target):
+    mesh = sphere(800)
+    out = decimate(mesh, target)
+    assert 0 < out.num_faces <= target
+    faces = out.faces
+    assert np.all((faces[:, 0] != faces[:, 1]) & (faces[:, 1] != faces[:, 2]) & (faces[:, 2] != faces[:, 0]))
+    undirected, oriented = _edge_use(faces)
+    # 封闭网格简化后仍封闭：每条边恰好两个面，且两个面方向一致（有向边各出现一次）
+    assert np.all(undirected == 2)
+    assert np.all(oriented == 1)
+    # 球面形状保留：顶点仍在单位球附近，法线朝外
+    used = out.positions[np.unique(faces)]
+    assert np.allclose(np.linalg.norm(used, axis=1), 1.0, atol=0.2)
+    tri = out.face_points()
+    normals = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+    assert np.all(np.einsum("ij,ij->i", normals, tri.mean(axis=1)) > 0)
+
+
+def test_decimate_is_deterministic_and_noop_under_budget():
+    mesh = sphere(300)
+    assert decimate(mesh, mesh.num_faces) is mesh
+    a, b = decimate(mesh, 150), decimate(mesh, 150)
+    assert np.array_equal(a.faces, b.faces) and np.array_equal(a.positions, b.positions)
+
+
+def test_level_of_detail_orders_budgets():
+    levels = level_of_detail(sphere(600), (300, 80, 1000))
+    assert [m.num_faces <= b for m, b in zip(levels, (80, 300, 1000))] == [True] * 3
+    assert levels[0].num_faces <= levels[1].num_faces <= levels[2].num_faces
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from conftest import block
+from modal_recovery import ModalResponse, modal_basis, spring_stiffness_matrix
+from soft_body import lumped_masses, tetrahedra_edges
+
+# 2×2×2 晶格共 81 个自由度；第 14、15 阶频率不同，截断在这里不会切开简并的模态
+TRUNCATED = 14
+
+
+def _lattice():
+    lattice, tets = block(2, 1.0)
+    rest = lattice.positions
+    return rest, tetrahedra_edges(tets), lumped_masses(rest, tets)
+
+
+def _response(rng, modes=0):
+    rest, edges, masses = _lattice()
+    deformed = rest + rng.normal(scale=0.1, size=rest.shape)
+    return ModalResponse.from_springs(rest, edges, 50.0, masses, deformed, modes=modes), deformed
+
+
+def test_stiffness_matrix_is_symmetric_and_annihilates_rigid_motion(rng):
+    rest, edges, _ = _lattice()
+    K = spring_stiffness_matrix(rest, edges, 50.0)
+    assert abs(K - K.T).max() < 1e-12
+    translation = np.tile(rng.normal(size=3), len(rest))
+    rotation = np.cross(rng.normal(size=3), rest).ravel()  # 线性化的无穷小转动
+    assert np.allclose(K @ translation, 0, atol=1e-10)
+    assert np.allclose(K @ rotation, 0, atol=1e-10)
+
+
+@pytest.mark.parametrize("modes", [0, TRUNCATED])
+def test_response_starts_deformed_and_ends_at_rest(rng, modes):
+    response, deformed = _response(rng, modes)
+    assert np.allclose(response.at(0, 0.0), deformed)
+    assert np.allclose(response.at(0, 1.0), response.rest)
+    assert np.allclose(response.at(0, 1 - 1e-9), response.rest, atol=1e-6)
+
+
+def test_truncated_basis_reproduces_initial_displacement(rng):
+    response, deformed = _response(rng, TRUNCATED)
+    mass_diag = np.repeat(_lattice()[2], 3)
+    assert response.num_modes == TRUNCATED
+    assert np.allclose(response.phi @ response.q0 + response.remainder, (deformed - response.rest).ravel())
+    # 余量与保留的模态 M 正交，没有被重复计入
+    assert np.linalg.norm(response.remainder) > 0
+    assert np.allclose(response.phi.T @ (mass_diag * response.remainder), 0, atol=1e-10)
+
+
+def test_shift_invert_matches_dense_basis():
+    rest, edges, masses = _lattice()
+    K = spring_stiffness_matrix(rest, edges, 50.0)
+    mass_diag = np.repeat(masses, 3)
+    dense_omega2, dense_phi = modal_basis(K, mass_diag, modes=len(mass_diag))
+    omega2, phi = modal_basis(K, mass_diag, modes=TRUNCATED)
+    scale = dense_omega2.max()
+    assert np.allclose(omega2, dense_omega2[:TRUNCATED], atol=1e-8 * scale)
+    assert np.allclose(phi.T @ (mass_diag[:, None] * phi), np.eye(TRUNCATED), atol=1e-8)
+    assert np.allclose(K @ phi, mass_diag[:, None] * phi * omega2, atol=1e-8 * scale)
+    # 6 个刚体模态之上的弹性模态与稠密分解张成相同的子空间（简并模态的基可以不同）
+    elastic = dense_phi[:, 6:TRUNCATED]
+    assert np.allclose(phi @ (phi.T @ (mass_diag[:, None] * elastic)), elastic, atol=1e-6)
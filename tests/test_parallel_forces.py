@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from conftest import block
+from parallel_forces import ParallelForces, morton_order
+from soft_body import CorotationalFEM, SpringNetwork, lumped_masses, tetrahedra_edges
+
+
+def _model(kind, cells=4):
+    lattice, tets = block(cells, 1.0)
+    masses = lumped_masses(lattice.positions, tets)
+    if kind == "springs":
+        return SpringNetwork(lattice.positions, tetrahedra_edges(tets), 50.0, masses)
+    return CorotationalFEM(lattice.positions, tets, 40.0, 0.3, masses)
+
+
+def _deformed(rng, cells=4):
+    lattice, _ = block(cells, 1.0)
+    return lattice.positions + rng.normal(scale=0.05, size=lattice.positions.shape)
+
+
+def test_morton_order_is_a_permutation(rng):
+    points = rng.uniform(size=(100, 3))
+    assert sorted(morton_order(points).tolist()) == list(range(100))
+
+
+@pytest.mark.parametrize("kind", ["springs", "fem"])
+def test_forces_are_identical_for_any_worker_count(kind, rng):
+    x = _deformed(rng)
+    reference = _model(kind).forces(x)
+    results = []
+    for workers in (1, 2, 4):
+        with ParallelForces(_model(kind), workers, "thread", chunk_elements=37) as solver:
+            results.append(solver.forces(x))
+            assert len(solver.chunks) > 1
+            # 同一个 solver 重复调用结果不变（输出缓冲被复用）
+            assert np.array_equal(solver.forces(x), results[-1])
+    for other in results[1:]:
+        assert np.array_equal(other, results[0])
+    assert np.allclose(results[0], reference, atol=1e-12)
+
+
+def test_process_backend_matches_threads(rng):
+    x = _deformed(rng)
+    with ParallelForces(_model("fem"), 2, "thread", chunk_elements=64) as threads:
+        expected = threads.forces(x)
+    with ParallelForces(_model("fem"), 1, chunk_elements=64) as serial:
+        later = serial.forces(x + 0.01)
+    with ParallelForces(_model("fem"), 2, "process", chunk_elements=64) as processes:
+        assert np.array_equal(processes.forces(x), expected)
+        # 共享内存中的坐标每次调用都会刷新
+        assert np.array_equal(processes.forces(x + 0.01), later)
+
+
+@pytest.mark.parametrize("kwargs", [{"backend": "gpu"}, {"chunk_elements": 0}])
+def test_invalid_arguments(kwargs):
+    with pytest.raises(ValueError):
+        ParallelForces(_model("springs", cells=1), **kwargs)
+
+
+def test_callers_model_keeps_its_element_order():
+    model = _model("fem")
+    tets, dm_inv = model.tets.copy(), model.dm_inv.copy()
+    with ParallelForces(model, 2, chunk_elements=37) as solver:
+        assert not np.array_equal(solver.model.tets, tets)
+        assert solver.model.masses is model.masses
+    assert np.array_equal(model.tets, tets) and np.array_equal(model.dm_inv, dm_inv)
@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from collision import GroundPlane
+from conftest import block
+from geometry import lattice_bodies, lattice_tetrahedra, scene_lattice
+from scene_config import TetrahedronPhysicsConfig
+from soft_body import (CorotationalFEM, SpringNetwork, lumped_masses, relax, scatter_add,
+                       simulate_stages, tetrahedra_edges)
+
+
+def _models(cells=2):
+    lattice, tets = block(cells, 1.0)
+    masses = lumped_masses(lattice.positions, tets)
+    return lattice, tets, [
+        SpringNetwork(lattice.positions, tetrahedra_edges(tets), 50.0, masses),
+        CorotationalFEM(lattice.positions, tets, 40.0, 0.3, masses),
+    ]
+
+
+def _rotation(angle):
+    c, s = np.cos(angle), np.sin(angle)
+    return np.array([[c, 0, s], [0, 1, 0], [-s, 0, c]]) @ np.array([[c, -s, 0], [s, c, 0], [0, 0, 1]])
+
+
+def test_scatter_add_and_masses():
+    out = scatter_add(np.array([0, 2, 0]), np.arange(9.0).reshape(3, 3), 3)
+    assert out.tolist() == [[6, 8, 10], [0, 0, 0], [3, 4, 5]]
+    lattice, tets = block(2, 2.0)
+    assert np.isclose(lumped_masses(lattice.positions, tets, density=0.5).sum(), 0.5 * 8.0)
+
+
+def test_tetrahedra_edges_are_unique():
+    _, tets = block(2)
+    edges = tetrahedra_edges(tets)
+    assert np.all(edges[:, 0] < edges[:, 1])
+    assert len(np.unique(edges, axis=0)) == len(edges)
+
+
+def test_rest_state_is_force_free_and_forces_balance(rng):
+    lattice, _, models = _models()
+    deformed = lattice.positions + rng.normal(scale=0.05, size=lattice.positions.shape)
+    for model in models:
+        assert np.allclose(model.forces(lattice.positions), 0, atol=1e-10)
+        assert np.allclose(model.forces(deformed).sum(axis=0), 0, atol=1e-10)
+
+
+def test_forces_follow_rigid_motion(rng):
+    lattice, _, models = _models()
+    deformed = lattice.positions + rng.normal(scale=0.05, size=lattice.positions.shape)
+    rotation = _rotation(0.7)
+    for model in models:
+        moved = deformed @ rotation.T + np.array([1.0, -2.0, 0.5])
+        assert np.allclose(model.forces(moved), model.forces(deformed) @ rotation.T, atol=1e-9)
+        assert np.allclose(model.forces(lattice.positions @ rotation.T), 0, atol=1e-10)
+
+
+def test_degenerate_tetrahedron_is_rejected():
+    rest = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [1, 1, 0]], dtype=float)
+    with pytest.raises(ValueError):
+        CorotationalFEM(rest, [(0, 1, 2, 3)], 40.0, 0.3, np.ones(4))
+
+
+def test_relax_settles_on_the_ground():
+    lattice, _, models = _models()
+    start = lattice.positions + np.array([0.0, 0.0, 0.3])
+    for model in models:
+        x = relax(model, start, [GroundPlane(0.0)], gravity=9.8, steps=600)
+        assert x[:, 2].min() >= 0.0
+        assert np.isclose(x[:, 2].min(), 0.0, atol=1e-6)
+        # 落地后保持形状：高度被压缩但没有塌掉
+        assert 0.5 < np.ptp(x[:, 2]) <= 1.0 + 1e-9
+
+
+def _inside_tetrahedra(points, positions, tets, tol=1e-6):
+    corners = positions[tets]
+    dm = np.swapaxes(corners[:, 1:] - corners[:, :1], 1, 2)
+    local = np.einsum("tij,ptj->pti", np.linalg.inv(dm), points[:, None] - corners[None, :, 0])
+    bary = np.concatenate([1 - local.sum(axis=2, keepdims=True), local], axis=2)
+    return np.any(np.all(bary > tol, axis=2), axis=1)
+
+
+@pytest.mark.parametrize("physics_model", ["springs", "fem"])
+def test_stages_keep_neighbouring_lattices_apart(physics_model):
+    cfg = TetrahedronPhysicsConfig(physics_model=physics_model, lattice_cells=2, lattice_count=2,
+                                   compression_shift=0.6, sim_steps=200)
+    big, small = lattice_bodies(cfg)
+    lattice = scene_lattice(cfg)
+    tets = lattice_tetrahedra(cfg.lattice_cells)
+    gravity, compressed = simulate_stages(cfg, lattice, lattice_tetrahedra(cfg.lattice_cells, 2), [big, small])
+
+    n = len(big)
+    for x in (gravity, compressed):
+        # 晶格之间的双向修正会让贴地的三角形顶点略微下沉，不超过接触厚度
+        assert x[:, 2].min() >= cfg.ground_height - 0.05
+        assert not _inside_tetrahedra(x[n:], x[:n], tets).any()
+        assert not _inside_tetrahedra(x[:n], x[n:], tets).any()
+    half = np.abs(lattice.positions[:, 0]).max()
+    assert np.abs(compressed[:, 0]).max() <= half - cfg.compression_shift + 1e-9
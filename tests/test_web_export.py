@@ -0,0 +1,92 @@
+import json
+
+import numpy as np
+import pytest
+
+import web_export
+from web_export import ALIGNMENT, BinaryWriter, export, sample_stages
+
+
+def test_int16_positions_dequantise_within_half_a_step(tmp_path, rng):
+    positions = rng.uniform(-3, 5, size=(500, 3))
+    positions[:, 2] = 1.0  # 退化轴
+    writer = BinaryWriter("int16")
+    writer.add_indices("faces", [(0, 1, 2)])
+    entry = writer.add_positions("vertices", positions)
+    size = writer.write(tmp_path / "data.bin")
+
+    assert entry["offset"] % ALIGNMENT == 0
+    assert entry["offset"] + entry["length"] <= size == (tmp_path / "data.bin").stat().st_size
+    raw = (tmp_path / "data.bin").read_bytes()[entry["offset"]:entry["offset"] + entry["length"]]
+    q = np.frombuffer(raw, dtype="<i2").reshape(entry["shape"])
+    quant = entry["quant"]
+    restored = np.asarray(quant["offset"]) + (q + 32768.0) * np.asarray(quant["scale"])
+    assert np.all(np.abs(restored - positions) <= np.asarray(quant["scale"]) / 2 + 1e-12)
+
+
+def test_writer_rejects_duplicates_and_unknown_precision():
+    writer = BinaryWriter("float32")
+    writer.add_indices("edges", [(0, 1)])
+    with pytest.raises(ValueError):
+        writer.add_indices("edges", [(1, 2)])
+    with pytest.raises(ValueError):
+        BinaryWriter("float64")
+
+
+def test_indices_widen_past_uint16():
+    writer = BinaryWriter()
+    assert writer.add_indices("small", [(0, 65535)])["dtype"] == "uint16"
+    assert writer.add_indices("large", [(0, 65536)])["dtype"] == "uint32"
+
+
+def test_trajectory_frames_are_contiguous():
+    writer = BinaryWriter("float16")
+    entry = writer.add_trajectory("traj", np.zeros((7, 5, 3)), fps=12)
+    assert entry["fps"] == 12 and entry["frame_bytes"] == 5 * 3 * 2
+    assert entry["frame_bytes"] * 7 == entry["length"]
+
+
+def test_sample_stages_hits_every_keyframe():
+    keyframes = [np.zeros((2, 3)), np.ones((2, 3)), np.full((2, 3), 3.0)]
+    frames = sample_stages(keyframes, [1.0, 0.5], fps=10, rate_func=lambda t: t)
+    assert frames.shape == (1 + 10 + 5, 2, 3)
+    assert np.array_equal(frames[0], keyframes[0])
+    assert np.allclose(frames[10], keyframes[1]) and np.allclose(frames[-1], keyframes[2])
+    assert np.allclose(frames[5], 0.5)
+
+
+def _fake_exporter(name):
+    def exporter(cfg, writer, fps):
+        writer.add_indices(f"{name}.edges", [(0, 1)])
+        return {"networks": [name]}
+    return exporter
+
+
+def test_partial_export_keeps_other_scenes(tmp_path, monkeypatch):
+    for section in web_export.EXPORTERS:
+        monkeypatch.setitem(web_export.EXPORTERS, section, _fake_exporter(section))
+    export(tmp_path, "int16", 10)
+    _, index = export(tmp_path, "float32", 10, ["tetrahedron_physics"])
+
+    assert set(index["scenes"]) == set(web_export.EXPORTERS)
+    assert index["scenes"]["triangle_mesh_3d"]["precision"] == "int16"
+    assert index["scenes"]["tetrahedron_physics"]["precision"] == "float32"
+    assert json.loads((tmp_path / "index.json").read_text(encoding="utf-8")) == index
+
+    # .bin 已被删除的场景不再保留在目录里
+    (tmp_path / "triangle_mesh_3d.bin").unlink()
+    _, index = export(tmp_path, "int16", 10, ["tetrahedron_physics"])
+    assert list(index["scenes"]) == ["tetrahedron_physics"]
+
+
+def test_export_index_describes_the_binary(tmp_path):
+    pytest.importorskip("manim")
+    index_path, index = export(tmp_path, "int16", 6, ["tetrahedron_physics"])
+    assert json.loads(index_path.read_text(encoding="utf-8")) == index
+    scene = index["scenes"]["tetrahedron_physics"]
+    assert (tmp_path / scene["file"]).stat().st_size == scene["bytes"]
+    for entry in scene["arrays"].values():
+        assert entry["offset"] % ALIGNMENT == 0
+        assert entry["offset"] + entry["length"] <= scene["bytes"]
+    trajectory = scene["arrays"]["lattice.simulation"]
+    assert trajectory["frame_bytes"] * trajectory["shape"][0] == trajectory["length"]